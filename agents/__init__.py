@@ -0,0 +1,7 @@
+"""Agents package for Constellate.
+
+Contains the interface of the LLM engines used to summarize and embed
+articles, the registry selecting one by name (``CONSTELLATE_DEFAULT_AGENT``),
+a deterministic fake agent, and the batching and response caching layers
+placed in front of the selected agent.
+"""
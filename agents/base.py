@@ -0,0 +1,107 @@
+"""Agent interface and registry.
+
+An agent wraps one LLM engine and answers both requests the app makes of
+it, summarizing and embedding article texts, always for a whole batch of
+texts. Agents register themselves under a name with ``register_agent``; an
+agent defined in ``agents/<name>.py`` is imported the first time that name
+is requested, so adding an engine needs no change outside its module.
+"""
+
+import importlib
+import re
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Agent names double as module names below the agents package
+_NAME_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+
+
+class Agent(ABC):
+    """Interface for LLM engines.
+
+    Attributes:
+        name: Registry name of the agent
+        model: Identifier of the underlying model; cached responses are keyed by it
+        dim: Dimensionality of produced embeddings
+        max_batch_size: Largest number of texts sent to the engine in one call
+        summary_prompt: Instructions given with every text to summarize
+
+    """
+
+    name: str
+    model: str
+    dim: int
+    max_batch_size: int = 32
+    summary_prompt: str = (
+        "Summarize the following research article in at most three sentences."
+    )
+
+    @abstractmethod
+    def summarize(self, texts: list[str]) -> list[str]:
+        """Summarize a batch of texts.
+
+        Args:
+            texts: Full article texts
+
+        Returns:
+            list: One summary per text
+
+        """
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape ``(len(texts), dim)``
+
+        """
+
+
+# Registry of available agents by name
+AGENTS: dict[str, type[Agent]] = {}
+
+
+def register_agent(cls: type[Agent]) -> type[Agent]:
+    """Register an agent class under its ``name`` (class decorator).
+
+    Args:
+        cls: Agent class
+
+    Returns:
+        type: The class, unchanged
+
+    """
+    AGENTS[cls.name] = cls
+    return cls
+
+
+def get_agent(name: str, **options: object) -> Agent:
+    """Instantiate a registered agent, importing ``agents.<name>`` if needed.
+
+    Args:
+        name: Registered agent name
+        **options: Keyword arguments of the agent's constructor
+
+    Returns:
+        Agent: New agent instance
+
+    Raises:
+        KeyError: If no agent is registered under ``name``
+
+    """
+    if name not in AGENTS and _NAME_RE.match(name):
+        try:
+            importlib.import_module(f"{__package__}.{name}")
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__package__}.{name}":
+                raise
+    cls = AGENTS.get(name)
+    if cls is None:
+        msg = f"Unknown agent {name!r}; available: {', '.join(sorted(AGENTS)) or 'none'}"
+        raise KeyError(msg)
+    return cls(**options)
@@ -0,0 +1,163 @@
+"""Coalescing of concurrent agent calls.
+
+Engines answer a batch of texts for about the cost of a single one, but the
+app asks for summaries and embeddings from several threads at once, a few
+texts at a time. ``BatchingAgent`` queues the texts of concurrent calls and
+sends them to the wrapped agent together: the first caller of a batch makes
+one call for everybody, and texts arriving while that call runs form the
+next batch. Identical texts in a batch are sent once.
+
+The first caller only waits for others to join (up to ``max_wait`` seconds,
+or until ``max_batch_size`` texts are queued) while other calls are in
+flight. A process handling one request or job at a time (sync server
+workers, the job worker) therefore never waits and gets one engine call per
+call, as without the wrapper; batching pays off with threaded server workers
+and other concurrent callers, and batch call sites (``summarize``) batch
+their own texts either way.
+"""
+
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+import numpy as np
+
+from agents.base import Agent
+
+T = TypeVar("T")
+
+
+class _Coalescer(Generic[T]):
+    """Queue of texts waiting for one kind of engine call."""
+
+    def __init__(
+        self, call: Callable[[list[str]], Sequence[T]], max_batch_size: int, max_wait: float,
+    ) -> None:
+        """Create an empty queue.
+
+        Args:
+            call: Engine call answering a list of texts
+            max_batch_size: Largest number of texts per call
+            max_wait: Seconds the first caller waits for others to join
+
+        """
+        self.call = call
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self._pending: list[tuple[str, Future]] = []
+        # Calls in ``submit`` (queued, waiting for their batch or running it)
+        self._callers = 0
+        self._queued = threading.Condition()
+        # One call in flight at a time; texts queued meanwhile go together next
+        self._busy = threading.Lock()
+
+    def submit(self, texts: list[str]) -> list[T]:
+        """Queue texts, wait for their batch to be answered and return the results.
+
+        Raises:
+            Exception: Whatever the engine call raised for the batch
+
+        """
+        futures = [Future() for _ in texts]
+        with self._queued:
+            leader = not self._pending
+            self._callers += 1
+            self._pending.extend(zip(texts, futures, strict=True))
+            if len(self._pending) >= self.max_batch_size:
+                self._queued.notify_all()
+        try:
+            if leader:
+                with self._busy:
+                    with self._queued:
+                        # Alone, there is nobody to wait for
+                        if self._callers > 1:
+                            self._queued.wait_for(
+                                lambda: len(self._pending) >= self.max_batch_size,
+                                timeout=self.max_wait,
+                            )
+                        batch, self._pending = self._pending, []
+                    self._run(batch)
+            return [future.result() for future in futures]
+        finally:
+            with self._queued:
+                self._callers -= 1
+
+    def _run(self, batch: list[tuple[str, Future]]) -> None:
+        """Answer a batch with as few engine calls as its size allows."""
+        unique = list(dict.fromkeys(text for text, _future in batch))
+        results: dict[str, T] = {}
+        try:
+            for start in range(0, len(unique), self.max_batch_size):
+                chunk = unique[start : start + self.max_batch_size]
+                self.batches += 1
+                results.update(zip(chunk, self.call(chunk), strict=True))
+        except Exception as exc:
+            # Every caller waiting for the batch gets the error
+            for _text, future in batch:
+                future.set_exception(exc)
+            return
+        for text, future in batch:
+            future.set_result(results[text])
+
+
+class BatchingAgent(Agent):
+    """Agent coalescing the concurrent calls made to another agent.
+
+    Attributes:
+        agent: Wrapped agent receiving the batches
+
+    """
+
+    def __init__(
+        self, agent: Agent, max_batch_size: int | None = None, max_wait: float = 0.01,
+    ) -> None:
+        """Wrap an agent.
+
+        Args:
+            agent: Agent receiving the batches
+            max_batch_size: Largest batch sent (default: the agent's ``max_batch_size``)
+            max_wait: Seconds the first caller of a batch waits for others to join
+                (only while other calls are in flight)
+
+        """
+        self.agent = agent
+        self.name = agent.name
+        self.model = agent.model
+        self.dim = agent.dim
+        self.max_batch_size = max_batch_size or agent.max_batch_size
+        self.summary_prompt = agent.summary_prompt
+        self._summaries = _Coalescer(agent.summarize, self.max_batch_size, max_wait)
+        self._vectors = _Coalescer(agent.embed, self.max_batch_size, max_wait)
+
+    @property
+    def batches(self) -> int:
+        """Number of calls made to the wrapped agent."""
+        return self._summaries.batches + self._vectors.batches
+
+    def summarize(self, texts: list[str]) -> list[str]:
+        """Summarize texts in a batch shared with concurrent callers.
+
+        Args:
+            texts: Full article texts
+
+        Returns:
+            list: One summary per text
+
+        """
+        return self._summaries.submit(texts) if texts else []
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts in a batch shared with concurrent callers.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape ``(len(texts), dim)``
+
+        """
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(self._vectors.submit(texts)).astype(np.float32, copy=False)
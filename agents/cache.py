@@ -0,0 +1,236 @@
+"""Persistent cache of agent responses.
+
+``ResponseCache`` keeps engine responses in a SQLite file, keyed by the
+SHA-256 of the request kind, the model and the full prompt, and evicts the
+least recently used entries beyond ``max_entries``. ``CachedAgent`` answers
+from it and only sends the texts it has never seen to the wrapped agent, so
+re-summarizing unchanged articles costs no engine call; changing the model
+or the summary prompt changes the keys. The file is shared by every worker
+process.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from agents.base import Agent
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_responses_used_at ON responses (used_at);
+"""
+
+
+class ResponseCache:
+    """SQLite file of responses with least recently used eviction.
+
+    Attributes:
+        path: Database file (created on first use)
+        max_entries: Maximum number of responses kept
+        hits: Number of lookups answered
+        misses: Number of lookups without a stored response
+
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000) -> None:
+        """Open a cache.
+
+        Args:
+            path: Database file
+            max_entries: Maximum number of responses kept
+
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid = 0
+
+    @staticmethod
+    def key(kind: str, model: str, prompt: str) -> str:
+        """Return the key of a request (hex SHA-256 of its kind, model and prompt)."""
+        return hashlib.sha256(f"{kind}\0{model}\0{prompt}".encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection, opening it on first use (and after a fork)."""
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=wal")
+            connection.executescript(_SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        """Look up responses, marking the ones found as recently used.
+
+        Args:
+            keys: Request keys
+
+        Returns:
+            dict: Stored responses by key (missing keys are left out)
+
+        """
+        with self._lock:
+            connection = self._connect()
+            found = {}
+            for key in dict.fromkeys(keys):
+                row = connection.execute(
+                    "SELECT value FROM responses WHERE key = ?", (key,),
+                ).fetchone()
+                if row is not None:
+                    found[key] = row[0]
+            if found:
+                now = time.time()
+                with connection:
+                    connection.executemany(
+                        "UPDATE responses SET used_at = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+            self.hits += sum(key in found for key in keys)
+            self.misses += sum(key not in found for key in keys)
+            return found
+
+    def put_many(self, responses: dict[str, bytes]) -> None:
+        """Store responses, evicting the least recently used beyond ``max_entries``.
+
+        Args:
+            responses: Responses by request key
+
+        """
+        if not responses:
+            return
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO responses (key, value, used_at) VALUES (?, ?, ?)",
+                    [(key, value, now) for key, value in responses.items()],
+                )
+                (count,) = connection.execute("SELECT count(*) FROM responses").fetchone()
+                if count > self.max_entries:
+                    connection.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY used_at LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+
+    def __len__(self) -> int:
+        """Number of stored responses."""
+        with self._lock:
+            return self._connect().execute("SELECT count(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the connection of this process."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+class CachedAgent(Agent):
+    """Agent answering from a response cache before calling another agent.
+
+    Attributes:
+        agent: Wrapped agent answering cache misses
+        cache: Response cache
+
+    """
+
+    def __init__(self, agent: Agent, cache: ResponseCache) -> None:
+        """Wrap an agent.
+
+        Args:
+            agent: Agent answering cache misses
+            cache: Response cache
+
+        """
+        self.agent = agent
+        self.cache = cache
+        self.name = agent.name
+        self.model = agent.model
+        self.dim = agent.dim
+        self.max_batch_size = agent.max_batch_size
+        self.summary_prompt = agent.summary_prompt
+
+    def _answer(
+        self,
+        kind: str,
+        prompts: list[str],
+        texts: list[str],
+        call: Callable[[list[str]], list[bytes]],
+    ) -> tuple[list[str], dict[str, bytes]]:
+        """Look up requests, calling the agent for the missing ones.
+
+        Args:
+            kind: Request kind, part of the keys
+            prompts: Full prompt of each text, keyed with the model
+            texts: Texts sent to the agent on a miss
+            call: Function encoding the agent's answers to a list of texts as bytes
+
+        Returns:
+            tuple: Key of every text, and the responses by key
+
+        """
+        keys = [self.cache.key(kind, self.model, prompt) for prompt in prompts]
+        responses = self.cache.get_many(keys)
+        missing = {key: text for key, text in zip(keys, texts, strict=True) if key not in responses}
+        if missing:
+            fresh = dict(zip(missing, call(list(missing.values())), strict=True))
+            self.cache.put_many(fresh)
+            responses.update(fresh)
+        return keys, responses
+
+    def summarize(self, texts: list[str]) -> list[str]:
+        """Summarize texts, only sending the ones never summarized by this model and prompt.
+
+        Args:
+            texts: Full article texts
+
+        Returns:
+            list: One summary per text
+
+        """
+        keys, responses = self._answer(
+            "summarize",
+            [f"{self.summary_prompt}\n\n{text}" for text in texts],
+            texts,
+            lambda batch: [summary.encode() for summary in self.agent.summarize(batch)],
+        )
+        return [responses[key].decode() for key in keys]
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts, only sending the ones never embedded by this model.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape ``(len(texts), dim)``
+
+        """
+        keys, responses = self._answer(
+            "embed",
+            texts,
+            texts,
+            lambda batch: [
+                row.tobytes() for row in np.asarray(self.agent.embed(batch), dtype=np.float32)
+            ],
+        )
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, key in enumerate(keys):
+            vectors[row] = np.frombuffer(responses[key], dtype=np.float32)
+        return vectors
@@ -0,0 +1,78 @@
+"""Deterministic local agent.
+
+``FakeAgent`` needs no model: it summarizes with the leading sentences of
+the text and embeds by feature hashing, so the same input always gives the
+same output. It is used for tests and benchmarks, and optionally simulates
+the latency of a remote engine.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from agents.base import Agent, register_agent
+from jobs.summarizers import FakeSummarizer
+from similarity.embedders import HashingEmbedder
+
+
+@register_agent
+class FakeAgent(Agent):
+    """Agent built from the fake summarizer and the hashing embedder.
+
+    Attributes:
+        latency: Seconds each call sleeps, simulating a remote engine
+        calls: Kind and size of every batch received, in order
+
+    """
+
+    name = "fake"
+    model = "fake"
+
+    def __init__(self, dim: int = 256, latency: float = 0.0) -> None:
+        """Create a fake agent.
+
+        Args:
+            dim: Dimensionality of the embeddings
+            latency: Seconds each call sleeps
+
+        """
+        self.dim = dim
+        self.latency = latency
+        self.calls: list[tuple[str, int]] = []
+        self._summarizer = FakeSummarizer()
+        self._embedder = HashingEmbedder(dim)
+        self._lock = threading.Lock()
+
+    def _call(self, kind: str, size: int) -> None:
+        """Record a call and wait for the simulated latency."""
+        with self._lock:
+            self.calls.append((kind, size))
+        if self.latency:
+            time.sleep(self.latency)
+
+    def summarize(self, texts: list[str]) -> list[str]:
+        """Return the first sentences of each text.
+
+        Args:
+            texts: Full article texts
+
+        Returns:
+            list: One summary per text
+
+        """
+        self._call("summarize", len(texts))
+        return [self._summarizer.summarize(text) for text in texts]
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts as L2-normalized hashed token counts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape ``(len(texts), dim)``
+
+        """
+        self._call("embed", len(texts))
+        return self._embedder.embed(texts)
@@ -0,0 +1,65 @@
+"""Application-level access to the configured agent.
+
+The agent named by ``DEFAULT_AGENT`` is created once per Flask app, wrapped
+in the response cache (``AGENT_CACHE_PATH``) and the batching front-end, and
+kept in ``app.extensions["agent"]``. Summarizers and embedders named
+``"agent"`` delegate to it.
+"""
+
+from pathlib import Path
+
+from flask import current_app
+
+from agents.base import Agent, get_agent
+from agents.batching import BatchingAgent
+from agents.cache import CachedAgent, ResponseCache
+
+
+def build_agent(
+    name: str,
+    *,
+    cache_path: str | Path | None = None,
+    cache_size: int = 100_000,
+    max_batch_size: int | None = None,
+    max_wait: float = 0.01,
+) -> Agent:
+    """Create an agent with its cache and batching layers.
+
+    Cached responses are looked up first; only the misses of concurrent
+    calls are coalesced into batches for the engine.
+
+    Args:
+        name: Registered agent name
+        cache_path: Response cache file (None disables caching)
+        cache_size: Maximum number of cached responses
+        max_batch_size: Largest batch sent to the engine (default: the agent's)
+        max_wait: Seconds the first caller of a batch waits for others to join
+            (only while other calls are in flight)
+
+    Returns:
+        Agent: Agent stack
+
+    Raises:
+        KeyError: If no agent is registered under ``name``
+
+    """
+    agent: Agent = BatchingAgent(get_agent(name), max_batch_size, max_wait)
+    if cache_path is not None:
+        agent = CachedAgent(agent, ResponseCache(cache_path, cache_size))
+    return agent
+
+
+def get_app_agent() -> Agent:
+    """Return the app's agent, creating it on first use."""
+    agent = current_app.extensions.get("agent")
+    if agent is None:
+        config = current_app.config
+        agent = build_agent(
+            config["DEFAULT_AGENT"],
+            cache_path=config["AGENT_CACHE_PATH"],
+            cache_size=config["AGENT_CACHE_SIZE"],
+            max_batch_size=config["AGENT_BATCH_SIZE"],
+            max_wait=config["AGENT_BATCH_WAIT"],
+        )
+        current_app.extensions["agent"] = agent
+    return agent
@@ -4,32 +4,146 @@ Main application entry point for the Constellate web application.
 Handles initialization of Flask app, database, and routes.
 """
 
+import os
+from typing import TYPE_CHECKING, BinaryIO
+
 import click
-from flask import Flask, Response, abort, redirect, url_for
+from flask import Flask, Response, abort, redirect, render_template, url_for
 from flask_login import LoginManager, current_user
 
+from cache import TTLCache
 from config import Config
-from database import db, init_db
-from models.article import Article  # noqa: F401 - needed for SQLAlchemy relationship
-from models.user import User
+from database import (
+    configure_engines,
+    create_missing_indexes,
+    db,
+    engine_options,
+    replica_binds,
+)
+from events.bus import SubscriberLimitError
+from events.service import EventChannel
+from hashing import HashingBusyError, PasswordHasher
+from lazy import lazy_import
+from migrations.runner import (
+    SchemaMismatchError,
+    current_version,
+    ensure_schema,
+    head,
+    pending,
+    upgrade,
+)
+from migrations.runner import (
+    check_schema as check_schema_version,
+)
+from models.article import Article, backfill_tags
+from models.blob import collect_blobs, store_blob
+from models.edge import rebuild_edges
+from models.embedding import ArticleEmbedding  # noqa: F401 - registers the embedding mapper
+from models.extraction import extraction_stats
+from models.job import Job  # noqa: F401 - registers the article job hook
+from models.search import rebuild_search_index
+from models.user import User, load_cached_user, resolved_hash_method, time_password_hash
+from models.vote import reconcile_scores, refresh_trending
+from profiling import by_module, by_package, profile_startup
+from routes.articles import articles_bp
 from routes.auth import auth_bp
+from routes.graph import graph_bp
+from storage.blobs import BlobStore
+from storage.texts import TextCache
+
+if TYPE_CHECKING:
+    from importers.pipeline import ImportStats
+
+# Subsystems used by a few commands only, imported on first use (NumPy, gunicorn)
+similarity_service = lazy_import("similarity.service")
+jobs_worker = lazy_import("jobs.worker")
+jobs_handlers = lazy_import("jobs.handlers")
+server = lazy_import("server")
+importers_pipeline = lazy_import("importers.pipeline")
+
 
+def init_services(app: Flask) -> None:
+    """Create the optional in-process services configured for the app.
 
-def create_app(config_class: type[Config] = Config) -> Flask:
+    Args:
+        app: Flask application whose ``extensions`` receive the services
+
+    """
+    # Identity cache for the per-request user lookup
+    if app.config["USER_CACHE_ENABLED"]:
+        app.extensions["user_cache"] = TTLCache(
+            maxsize=app.config["USER_CACHE_SIZE"], ttl=app.config["USER_CACHE_TTL"],
+        )
+
+    # Optional pool keeping CPU-bound password hashing off the request workers
+    if app.config["PASSWORD_HASH_EXECUTOR"]:
+        app.extensions["password_hasher"] = PasswordHasher(
+            app.config["PASSWORD_HASH_EXECUTOR"],
+            workers=app.config["PASSWORD_HASH_WORKERS"],
+            queue_size=app.config["PASSWORD_HASH_QUEUE_SIZE"],
+            timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+        )
+
+    # Pub/sub channel of the live graph updates
+    app.extensions["events"] = EventChannel(app)
+
+    # Content-addressed store of the uploaded PDFs
+    app.extensions["blobs"] = BlobStore(
+        app.config["BLOB_DIR"], chunk_size=app.config["BLOB_CHUNK_SIZE"],
+    )
+
+    # Text extracted from the PDFs, shared by summarization and embedding
+    app.extensions["texts"] = TextCache(
+        app.config["TEXT_CACHE_DIR"], level=app.config["TEXT_CACHE_COMPRESSION"],
+    )
+
+
+def create_app(config_class: type[Config] = Config, *, check_schema: bool = True) -> Flask:
     """Application factory pattern for creating Flask app instances.
 
     Args:
         config_class: Configuration class to use for the application
+        check_schema: Create the schema of an empty database and refuse to
+            start on an outdated one (disabled by the upgrade command; see
+            also ``SCHEMA_CHECK_ON_STARTUP``)
 
     Returns:
         Flask: Configured Flask application instance
 
+    Raises:
+        SchemaMismatchError: If the database schema version differs from the code's
+
     """
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    # Initialize database
+    # Initialize database with the backend's pool sizing and SQLite pragmas
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
+    app.config["SQLALCHEMY_BINDS"] = replica_binds(app.config)
     db.init_app(app)
+    configure_engines(app)
+
+    init_services(app)
+
+    @app.errorhandler(HashingBusyError)
+    def hashing_busy(_error: HashingBusyError) -> tuple[str, int, dict[str, str]]:
+        """Reject authentication requests while the hashing pool is full.
+
+        Returns:
+            tuple: Message, 503 status and a Retry-After header
+
+        """
+        return "Authentication is busy, please retry in a moment.", 503, {"Retry-After": "1"}
+
+    @app.errorhandler(SubscriberLimitError)
+    def events_busy(_error: SubscriberLimitError) -> tuple[str, int, dict[str, str]]:
+        """Reject event streams while the subscriber cap is reached.
+
+        Returns:
+            tuple: Message, 503 status and a Retry-After header
+
+        """
+        return "Too many live update streams, please retry later.", 503, {"Retry-After": "10"}
 
     # Initialize Flask-Login
     login_manager = LoginManager()
@@ -49,14 +163,19 @@ def create_app(config_class: type[Config] = Config) -> Flask:
             User: User object or None if not found
 
         """
-        return User.query.get(int(user_id))
+        return load_cached_user(int(user_id))
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix="/")
+    app.register_blueprint(graph_bp, url_prefix="/api")
+    app.register_blueprint(articles_bp, url_prefix="/api")
 
-    # Initialize database tables
+    # Create the schema of a new database; refuse to serve an outdated one
     with app.app_context():
-        init_db()
+        if check_schema and app.config["SCHEMA_CHECK_ON_STARTUP"]:
+            ensure_schema()
+        if app.config["SIMILARITY_PRELOAD"]:
+            similarity_service.get_index()
 
     @app.route("/")
     def index() -> Response:
@@ -74,35 +193,464 @@ def create_app(config_class: type[Config] = Config) -> Flask:
 
     @app.route("/graph")
     def graph() -> str:
-        """Graph visualization route (placeholder for future implementation).
+        """Graph visualization route.
 
-        Requires authentication.
+        Requires authentication. The page loads nodes and edges progressively
+        from the streaming ``/api/graph`` endpoint.
 
         Returns:
-            str: Simple placeholder message
+            str: Rendered graph template
 
         """
         if not current_user.is_authenticated:
             abort(401)
 
-        return f"<h1>Welcome, {current_user.username}!</h1><p>Graph view coming soon...</p>"
+        return render_template("graph.html")
 
     return app
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option("--debug", is_flag=True, help="Enable debug mode")
-def main(*, debug: bool = False) -> None:
+@click.pass_context
+def main(ctx: click.Context, *, debug: bool = False) -> None:
     """Main entry point for the Constellate Flask application.
 
+    Without a subcommand, runs the development server.
+
     Args:
+        ctx: Click context
         debug: Enable Flask debug mode
 
     """
+    if ctx.invoked_subcommand is not None:
+        return
     app = create_app()
     # Binding to 0.0.0.0 is intentional for development
     app.run(debug=debug, host="0.0.0.0", port=5000)  # noqa: S104
 
 
+@main.command("serve")
+@click.option("--bind", default="0.0.0.0:8000", show_default=True, help="Address to listen on")
+@click.option("--workers", default=2, show_default=True, help="Number of worker processes")
+@click.option(
+    "--threads", default=16, show_default=True,
+    help="Threads per worker (event streams use those beyond EVENTS_RESERVED_THREADS)",
+)
+@click.option("--timeout", default=30, show_default=True, help="Worker timeout in seconds")
+@click.option(
+    "--graceful-timeout", default=30, show_default=True,
+    help="Seconds workers get to finish requests on reload (SIGHUP) or stop",
+)
+@click.option(
+    "--max-requests", default=0, show_default=True,
+    help="Recycle workers after this many requests (0 disables)",
+)
+@click.option(
+    "--preload/--no-preload", default=True, show_default=True,
+    help="Build the app once in the master before forking workers",
+)
+def serve_command(  # noqa: PLR0913, PLR0917 - one argument per server option
+    bind: str,
+    workers: int,
+    threads: int,
+    timeout: int,
+    graceful_timeout: int,
+    max_requests: int,
+    *,
+    preload: bool,
+) -> None:
+    """Serve the app with a production multi-worker server (gunicorn).
+
+    Args:
+        bind: Address to listen on
+        workers: Number of worker processes
+        threads: Threads per worker
+        timeout: Worker timeout in seconds
+        graceful_timeout: Seconds workers get to finish requests on reload or stop
+        max_requests: Recycle workers after this many requests
+        preload: Build the app in the master before forking
+
+    """
+    options = server.build_options(
+        bind, workers, threads, timeout, graceful_timeout, max_requests, preload=preload,
+    )
+    try:
+        server.serve(create_app, options)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+
+@main.command("profile-startup")
+@click.option("--limit", default=20, show_default=True, help="Number of entries shown")
+@click.option(
+    "--by", "group", type=click.Choice(["package", "module"]), default="package",
+    show_default=True, help="Aggregate import time per top-level package or per module",
+)
+def profile_startup_command(limit: int, group: str) -> None:
+    """Report the cold-start time of create_app and where its imports spend it.
+
+    Args:
+        limit: Number of packages or modules listed
+        group: ``package`` or ``module``
+
+    """
+    try:
+        seconds, rows = profile_startup()
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc)) from exc
+    entries = by_package(rows) if group == "package" else by_module(rows)
+    click.echo(f"Cold start (imports + create_app): {seconds * 1000:.1f} ms")
+    click.echo(f"Imports: {sum(own for _, own, _ in rows) / 1000:.1f} ms in {len(rows)} modules")
+    for name, micros in entries[:limit]:
+        click.echo(f"{micros / 1000:9.1f} ms  {name}")
+
+
+@main.command("backfill-tags")
+@click.option("--batch-size", default=500, show_default=True, help="Articles per transaction")
+def backfill_tags_command(batch_size: int) -> None:
+    """Populate the normalized tag index from the legacy tags column.
+
+    Args:
+        batch_size: Number of articles processed per transaction
+
+    """
+    app = create_app()
+    with app.app_context():
+        processed = backfill_tags(batch_size=batch_size)
+    click.echo(f"Backfilled tags for {processed} articles.")
+
+
+@main.command("upgrade")
+@click.option("--to", "target", type=int, default=None, help="Stop at this schema version")
+@click.option("--dry-run", is_flag=True, help="List pending migrations without applying them")
+def upgrade_command(target: int | None, *, dry_run: bool = False) -> None:
+    """Apply pending schema migrations to the database.
+
+    Args:
+        target: Schema version to stop at (default: the latest)
+        dry_run: Only list the pending migrations
+
+    """
+    app = create_app(check_schema=False)
+    with app.app_context():
+        if dry_run:
+            for item in pending(target):
+                click.echo(f"Pending {item.version}: {item.description}")
+        else:
+            upgrade(
+                target,
+                on_apply=lambda item: click.echo(f"Applying {item.version}: {item.description}"),
+            )
+        click.echo(f"Database is at schema version {current_version()} (latest {head()}).")
+
+
+@main.command("check-schema")
+def check_schema_command() -> None:
+    """Exit with an error if the database schema does not match the code."""
+    app = create_app(check_schema=False)
+    with app.app_context():
+        try:
+            check_schema_version()
+        except SchemaMismatchError as exc:
+            raise click.ClickException(str(exc)) from exc
+        click.echo(f"Database schema is at version {current_version()}.")
+
+
+@main.command("create-indexes")
+def create_indexes_command() -> None:
+    """Add indexes declared on the models that existing tables are missing."""
+    app = create_app()
+    with app.app_context():
+        created = create_missing_indexes()
+    for name in created:
+        click.echo(f"Created index {name}.")
+    click.echo(f"Created {len(created)} indexes.")
+
+
+@main.command("rebuild-edges")
+def rebuild_edges_command() -> None:
+    """Recompute the shared-tag edge table from scratch."""
+    app = create_app()
+    with app.app_context():
+        count = rebuild_edges()
+    click.echo(f"Rebuilt {count} edges.")
+
+
+@main.command("rebuild-search")
+def rebuild_search_command() -> None:
+    """Create the full-text search index if missing and re-index all articles."""
+    app = create_app()
+    with app.app_context():
+        count = rebuild_search_index()
+    click.echo(f"Indexed {count} articles for search.")
+
+
+@main.command("import")
+@click.argument(
+    "paths", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--format", "fmt", type=click.Choice(["arxiv", "bibtex", "csv"]), default=None,
+    help="Input format (default: from the file extension: .json/.jsonl, .bib, .csv)",
+)
+@click.option("--user", "username", required=True, help="Username recorded as the submitter")
+@click.option(
+    "--chunk-size", type=click.IntRange(min=1), default=1000,
+    show_default=True, help="Records per parse task and per INSERT transaction",
+)
+@click.option(
+    "--processes", type=click.IntRange(min=0), default=None,
+    help="Parser processes (default: CPU count; 0 parses in this process)",
+)
+@click.option("--enqueue", is_flag=True, help="Queue summarization and embedding jobs")
+def import_command(  # noqa: PLR0913 - one argument per import option
+    paths: tuple[str, ...],
+    fmt: str | None,
+    username: str,
+    chunk_size: int,
+    processes: int | None,
+    *,
+    enqueue: bool = False,
+) -> None:
+    """Bulk-import articles from arXiv metadata, BibTeX or CSV files.
+
+    Articles whose normalized URL is already stored (or appears earlier in
+    the input) are skipped.
+
+    Args:
+        paths: Input files
+        fmt: Input format (default: detected per file)
+        username: Submitter of the imported articles
+        chunk_size: Records per parse task and per INSERT transaction
+        processes: Parser processes
+        enqueue: Queue a processing job for every imported article
+
+    """
+    last_report = 0.0
+
+    def report(stats: "ImportStats") -> None:
+        nonlocal last_report
+        if stats.seconds - last_report >= 1.0:
+            last_report = stats.seconds
+            click.echo(
+                f"{stats.read} read, {stats.inserted} imported, {stats.duplicates} duplicates, "
+                f"{stats.invalid} invalid ({stats.rate:.0f} records/s)",
+                err=True,
+            )
+
+    app = create_app()
+    with app.app_context():
+        user = db.session.execute(db.select(User).filter_by(username=username)).scalar()
+        if user is None:
+            msg = f"No user named {username!r}"
+            raise click.ClickException(msg)
+        try:
+            stats = importers_pipeline.import_articles(
+                paths,
+                user.id,
+                fmt=fmt,
+                chunk_size=chunk_size,
+                processes=(os.cpu_count() or 1) if processes is None else processes,
+                enqueue=enqueue,
+                progress=report,
+            )
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+    click.echo(
+        f"Imported {stats.inserted} articles ({stats.duplicates} duplicates, "
+        f"{stats.invalid} invalid) with {stats.tag_links} tag links and {stats.edges} edges "
+        f"in {stats.seconds:.1f} s ({stats.rate:.0f} records/s).",
+    )
+
+
+@main.command("reconcile-votes")
+@click.option("--batch-size", default=1000, show_default=True, help="Articles per transaction")
+def reconcile_votes_command(batch_size: int) -> None:
+    """Recompute article scores that drifted from their votes.
+
+    Args:
+        batch_size: Number of articles checked per transaction
+
+    """
+    app = create_app()
+    with app.app_context():
+        repaired = reconcile_scores(batch_size=batch_size)
+    click.echo(f"Repaired the score of {repaired} articles.")
+
+
+@main.command("refresh-trending")
+def refresh_trending_command() -> None:
+    """Recompute the time-decayed trending scores of all articles."""
+    app = create_app()
+    with app.app_context():
+        count = refresh_trending(app.config["TRENDING_HALF_LIFE_HOURS"])
+    click.echo(f"Refreshed the trending score of {count} articles.")
+
+
+@main.command("attach-pdf")
+@click.argument("article_id", type=int)
+@click.argument("pdf", type=click.File("rb"))
+def attach_pdf_command(article_id: int, pdf: BinaryIO) -> None:
+    """Store a PDF file in the blob store and attach it to an article.
+
+    Args:
+        article_id: Article receiving the PDF
+        pdf: PDF file
+
+    """
+    app = create_app()
+    with app.app_context():
+        article = db.session.get(Article, article_id)
+        if article is None:
+            msg = f"No article with id {article_id}"
+            raise click.ClickException(msg)
+        key = store_blob(app.extensions["blobs"], pdf)
+        article.pdf_hash = key
+        db.session.commit()
+    click.echo(f"Attached blob {key} to article {article_id}.")
+
+
+@main.command("collect-blobs")
+@click.option(
+    "--grace", type=float, default=None,
+    help="Minimum age in seconds of a deleted blob (default: BLOB_GC_GRACE_SECONDS)",
+)
+def collect_blobs_command(grace: float | None) -> None:
+    """Delete stored PDFs that no article references any more.
+
+    Args:
+        grace: Minimum age of a deleted blob
+
+    """
+    app = create_app()
+    with app.app_context():
+        removed = collect_blobs(
+            app.extensions["blobs"],
+            app.config["BLOB_GC_GRACE_SECONDS"] if grace is None else grace,
+            texts=app.extensions["texts"],
+        )
+    click.echo(f"Removed {removed} unreferenced blob files.")
+
+
+@main.command("text-cache-stats")
+def text_cache_stats_command() -> None:
+    """Show the PDF text cache hit ratio and extraction time of each stage."""
+    app = create_app()
+    with app.app_context():
+        stats = extraction_stats()
+        if not stats:
+            click.echo("No PDF text lookups recorded yet.")
+        for stat in stats:
+            average = stat.extract_seconds / stat.misses if stat.misses else 0.0
+            click.echo(
+                f"{stat.stage}: {stat.hits} hits, {stat.misses} misses "
+                f"({stat.hit_ratio:.1%} hit ratio), {stat.extract_seconds:.2f} s extracting "
+                f"({average * 1000:.1f} ms per PDF)",
+            )
+
+
+@main.command("embed")
+@click.option("--batch-size", default=256, show_default=True, help="Articles per batch")
+@click.option(
+    "--rebuild", is_flag=True, help="Rebuild the on-disk index (and retrain IVF lists)",
+)
+def embed_command(batch_size: int, *, rebuild: bool = False) -> None:
+    """Embed articles that have no vector yet and update the similarity index.
+
+    Args:
+        batch_size: Number of articles embedded per batch
+        rebuild: Rewrite the index file from the database afterwards
+
+    """
+    app = create_app()
+    with app.app_context():
+        embedded = similarity_service.embed_missing(batch_size=batch_size)
+        click.echo(f"Embedded {embedded} articles.")
+        if rebuild:
+            click.echo(f"Indexed {similarity_service.rebuild_index()} vectors.")
+
+
+@main.command("summarize")
+@click.option("--batch-size", default=64, show_default=True, help="Articles per batch")
+@click.option(
+    "--all", "resummarize", is_flag=True,
+    help="Also re-summarize articles whose summary was generated",
+)
+def summarize_command(batch_size: int, *, resummarize: bool = False) -> None:
+    """Summarize articles without a summary with the configured summarizer.
+
+    With the "agent" summarizer, each batch is one agent call and articles
+    whose text was already summarized by the same model come from the
+    response cache. Submitted and imported summaries are never replaced, and
+    articles whose summary changed are embedded again.
+
+    Args:
+        batch_size: Number of articles summarized per batch (and per transaction)
+        resummarize: Replace generated summaries as well
+
+    """
+    app = create_app()
+    total = changed = 0
+    with app.app_context():
+        last_id = 0
+        while True:
+            missing = Article.summary.is_(None) | (Article.summary == "")
+            if resummarize:
+                missing |= Article.summary_generated
+            batch = db.session.execute(
+                db.select(Article)
+                .where(Article.id > last_id, missing)
+                .order_by(Article.id)
+                .limit(batch_size),
+            ).scalars().all()
+            if not batch:
+                break
+            updated = jobs_handlers.summarize_articles(batch)
+            # embed_articles commits the new summaries together with their embeddings
+            similarity_service.embed_articles(updated)
+            db.session.commit()
+            total += len(batch)
+            changed += len(updated)
+            last_id = batch[-1].id
+    click.echo(f"Summarized {total} articles ({changed} changed and embedded again).")
+
+
+@main.command("bench-hash")
+@click.option(
+    "--method", "methods", multiple=True,
+    help="Hash method to time (repeatable); defaults to PASSWORD_HASH_METHOD",
+)
+@click.option("--rounds", default=5, show_default=True, help="Hashes timed per method")
+def bench_hash_command(methods: tuple[str, ...], rounds: int) -> None:
+    """Report per-hash password hashing latency on this host.
+
+    Args:
+        methods: Hash methods to time
+        rounds: Number of hashes timed per method
+
+    """
+    for method in methods or (Config.PASSWORD_HASH_METHOD,):
+        seconds = time_password_hash(method, Config.PASSWORD_SALT_LENGTH, rounds)
+        click.echo(f"{resolved_hash_method(method):<28} {seconds * 1000:9.2f} ms/hash")
+
+
+@main.command("worker")
+@click.option(
+    "--processes", type=int, default=Config.WORKER_PROCESSES, show_default=True,
+    help="Number of worker processes",
+)
+@click.option("--burst", is_flag=True, help="Exit once no job is due")
+def worker_command(processes: int, *, burst: bool = False) -> None:
+    """Run background workers processing the job queue.
+
+    Args:
+        processes: Number of worker processes
+        burst: Exit once no job is due instead of polling
+
+    """
+    jobs_worker.run_pool(create_app, processes, burst=burst)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,4 @@
+"""Benchmarks package for Constellate.
+
+Contains standalone performance benchmarks, run as ``python -m benchmarks.<name>``.
+"""
@@ -0,0 +1,64 @@
+"""Benchmark of the agent batching and response cache layers.
+
+Summarizes synthetic articles from many threads at once with the fake agent
+simulating a remote engine (a fixed latency per call, whatever the batch
+size): directly, through the batching front-end, and through the response
+cache in front of it, cold and then warm.
+
+Usage::
+
+    python -m benchmarks.bench_agents --threads 32 --texts 512 --latency 0.05
+"""
+
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import click
+
+from agents.base import Agent
+from agents.batching import BatchingAgent
+from agents.cache import CachedAgent, ResponseCache
+from agents.fake import FakeAgent
+
+
+def run(agent: Agent, texts: list[str], threads: int) -> float:
+    """Summarize each text with its own call from a thread pool; return the wall time."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda text: agent.summarize([text]), texts))
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--threads", default=32, show_default=True, help="Concurrent callers")
+@click.option("--texts", default=512, show_default=True, help="Texts summarized")
+@click.option("--latency", default=0.05, show_default=True, help="Seconds per engine call")
+@click.option("--batch-size", default=32, show_default=True, help="Largest batch per call")
+@click.option("--wait", default=0.01, show_default=True, help="Seconds a batch waits to fill")
+def main(threads: int, texts: int, latency: float, batch_size: int, wait: float) -> None:
+    """Time concurrent summaries with and without batching and caching."""
+    corpus = [f"Article {number} on graphs. It has findings. And more." for number in range(texts)]
+
+    engine = FakeAgent(latency=latency)
+    seconds = run(engine, corpus, threads)
+    click.echo(f"direct        {seconds:6.2f} s  {len(engine.calls):5d} engine calls")
+
+    engine = FakeAgent(latency=latency)
+    seconds = run(BatchingAgent(engine, batch_size, wait), corpus, threads)
+    click.echo(f"batched       {seconds:6.2f} s  {len(engine.calls):5d} engine calls")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = FakeAgent(latency=latency)
+        cache = ResponseCache(Path(tmp) / "responses.db")
+        agent = CachedAgent(BatchingAgent(engine, batch_size, wait), cache)
+        for label in ("cached, cold", "cached, warm"):
+            calls = len(engine.calls)
+            seconds = run(agent, corpus, threads)
+            click.echo(f"{label}  {seconds:6.2f} s  {len(engine.calls) - calls:5d} engine calls")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Recall-vs-latency benchmark of the IVF index against exact search.
+
+Generates clustered random unit vectors, builds both indexes in a temporary
+directory and reports per-query latency and recall@k for several ``nprobe``.
+
+Usage::
+
+    python -m benchmarks.bench_ann --vectors 100000 --dim 128
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+
+from similarity.ann import IVFIndex
+from similarity.index import SimilarityIndex, normalize
+
+
+def clustered_vectors(count: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """Generate unit vectors scattered around random cluster centres."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    labels = rng.integers(clusters, size=count)
+    return normalize(centres[labels] + rng.normal(scale=0.6, size=(count, dim)))
+
+
+def timed_search(index: SimilarityIndex, queries: np.ndarray, k: int) -> tuple[list, float]:
+    """Run queries one by one and return results and mean latency in ms."""
+    start = time.perf_counter()
+    results = [index.search(query, k)[0] for query in queries]
+    return results, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+@click.command()
+@click.option("--vectors", default=100_000, show_default=True, help="Number of indexed vectors")
+@click.option("--dim", default=128, show_default=True, help="Vector dimensionality")
+@click.option("--queries", default=200, show_default=True, help="Number of queries")
+@click.option("--k", default=10, show_default=True, help="Neighbours per query")
+@click.option("--nlist", default=0, show_default=True, help="IVF lists (0 = sqrt(n))")
+def main(vectors: int, dim: int, queries: int, k: int, nlist: int) -> None:
+    """Compare exact and IVF search on synthetic data."""
+    data = clustered_vectors(vectors + queries, dim, clusters=max(1, vectors // 1000))
+    base, probe = data[:vectors], data[vectors:]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exact = SimilarityIndex(Path(tmp) / "exact", dim)
+        exact.add(range(1, vectors + 1), base)
+        truth, exact_ms = timed_search(exact, probe, k)
+        click.echo(f"exact        {exact_ms:8.3f} ms/query  recall@{k} 1.000")
+
+        ivf = IVFIndex(Path(tmp) / "ivf", dim, nlist=nlist)
+        ivf.add(range(1, vectors + 1), base)
+        start = time.perf_counter()
+        ivf.train()
+        lists = nlist or int(np.sqrt(vectors))
+        click.echo(f"ivf train    {time.perf_counter() - start:8.3f} s  ({lists} lists)")
+
+        for nprobe in (1, 2, 4, 8, 16, 32):
+            ivf.nprobe = nprobe
+            found, ivf_ms = timed_search(ivf, probe, k)
+            hits = sum(
+                len({i for i, _ in got} & {i for i, _ in want})
+                for got, want in zip(found, truth, strict=True)
+            )
+            recall = hits / (k * len(probe))
+            click.echo(f"ivf nprobe={nprobe:<3}{ivf_ms:8.3f} ms/query  recall@{k} {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark of the bulk article import.
+
+Writes a synthetic arXiv metadata snapshot (a share of the records repeat
+an earlier id, to exercise deduplication), then times ``import_articles``
+with parsing in this process and in a process pool, and for comparison a
+sample of the same records added one ORM object and one commit at a time.
+
+Usage::
+
+    python -m benchmarks.bench_import --records 100000 --processes 4
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+
+from app import create_app
+from config import Config
+from database import db
+from importers.parsers import parse_arxiv
+from importers.pipeline import import_articles
+from models.article import Article
+from models.user import User
+
+WORDS = [
+    "learning", "neural", "graph", "attention", "sparse", "robust", "efficient", "deep",
+    "model", "networks", "transformer", "optimization", "bayesian", "inference", "retrieval",
+]
+# Articles per tag; edges grow with its square, so tags scale with the records
+ARTICLES_PER_TAG = 20
+
+
+def write_snapshot(path: Path, records: int, duplicates: float) -> None:
+    """Write an arXiv JSON-lines snapshot of synthetic records."""
+    rng = np.random.default_rng(0)
+    unique = max(1, int(records * (1 - duplicates)))
+    ids = np.concatenate([np.arange(unique), rng.integers(0, unique, size=records - unique)])
+    rng.shuffle(ids)
+    tags = max(2, records * 2 // ARTICLES_PER_TAG)
+    with path.open("w", encoding="utf-8") as stream:
+        for arxiv_id in ids:
+            words = rng.choice(WORDS, size=8)
+            stream.write(
+                json.dumps({
+                    "id": f"{2000 + arxiv_id // 100_000}.{arxiv_id % 100_000:05d}",
+                    "title": " ".join(words[:6]).capitalize(),
+                    "abstract": " ".join(words) + ".",
+                    "categories": f"t{arxiv_id % tags} t{arxiv_id * 7919 % tags}",
+                })
+                + "\n",
+            )
+
+
+def make_app(directory: str, name: str):  # noqa: ANN201 - Flask app
+    """Create an app with an empty database and one user."""
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(directory) / name}"
+        USER_CACHE_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        user = User(username="bench", email="bench@example.com", password_hash="-")  # noqa: S106
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+def close(app) -> None:  # noqa: ANN001 - Flask app
+    """Release the app's database connections."""
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@click.command()
+@click.option("--records", default=100_000, show_default=True, help="Records in the snapshot")
+@click.option("--duplicates", default=0.1, show_default=True, help="Share of repeated records")
+@click.option("--processes", default=4, show_default=True, help="Parser processes")
+@click.option("--chunk-size", default=1000, show_default=True, help="Records per chunk")
+@click.option("--orm-sample", default=2000, show_default=True, help="Records added one by one")
+def main(records: int, duplicates: float, processes: int, chunk_size: int, orm_sample: int) -> None:
+    """Time the bulk import against per-row ORM inserts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = Path(tmp) / "snapshot.jsonl"
+        write_snapshot(snapshot, records, duplicates)
+
+        for workers in sorted({0, processes}):
+            app = make_app(tmp, f"bulk{workers}.db")
+            with app.app_context():
+                stats = import_articles(
+                    [snapshot], 1, chunk_size=chunk_size, processes=workers,
+                )
+                click.echo(
+                    f"bulk, {workers} processes: {stats.inserted} inserted, "
+                    f"{stats.duplicates} duplicates, {stats.tag_links} tag links, "
+                    f"{stats.edges} edges in {stats.seconds:.1f} s ({stats.rate:,.0f} records/s)",
+                )
+            close(app)
+
+        app = make_app(tmp, "orm.db")
+        with app.app_context(), snapshot.open(encoding="utf-8") as stream:
+            lines = [line for _, line in zip(range(orm_sample), stream, strict=False)]
+            start = time.perf_counter()
+            for row in parse_arxiv(lines):
+                if row is not None:
+                    db.session.add(Article(**row, user_id=1))
+                    db.session.commit()
+            seconds = time.perf_counter() - start
+            click.echo(
+                f"ORM, one commit per row: {len(lines)} records in {seconds:.1f} s "
+                f"({len(lines) / seconds:,.0f} records/s)",
+            )
+        close(app)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Latency benchmark of full-text article search.
+
+Fills a temporary database with synthetic articles (Zipf-distributed words,
+so common and rare terms behave like real text), then times ``search_articles``
+for one- and two-word queries, with and without a tag filter. Queries skip
+the most frequent words, which occur in nearly every synthetic article like
+stopwords do; a separate scenario reports that worst case.
+
+Usage::
+
+    python -m benchmarks.bench_search --articles 100000
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+
+from app import create_app
+from config import Config
+from database import db
+from models.article import Article
+from models.search import search_articles
+from models.tag import Tag, article_tags
+from models.user import User
+
+
+def make_words(count: int, seed: int = 0) -> list[str]:
+    """Generate distinct pronounceable pseudo-words."""
+    rng = np.random.default_rng(seed)
+    syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+    words: set[str] = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(syllables, size=rng.integers(2, 5))))
+    return sorted(words)
+
+
+def populate(articles: int, vocabulary: list[str], tags: int, batch_size: int = 5000) -> None:
+    """Insert synthetic articles (the search triggers index them on insert)."""
+    rng = np.random.default_rng(1)
+    user = User(username="bench", email="bench@example.com", password_hash="-")  # noqa: S106 - never logs in
+    db.session.add(user)
+    db.session.add_all(Tag(name=f"tag{i}") for i in range(tags))
+    db.session.commit()
+    for start in range(0, articles, batch_size):
+        count = min(batch_size, articles - start)
+        words = rng.zipf(1.3, size=(count, 80)) % len(vocabulary)
+        rows = [
+            {
+                "id": start + i + 1,
+                "title": " ".join(vocabulary[w] for w in words[i, :8]),
+                "summary": " ".join(vocabulary[w] for w in words[i, 8:]),
+                "user_id": user.id,
+            }
+            for i in range(count)
+        ]
+        db.session.execute(Article.__table__.insert(), rows)
+        db.session.execute(
+            article_tags.insert(),
+            [{"article_id": row["id"], "tag_id": int(rng.integers(tags)) + 1} for row in rows],
+        )
+        db.session.commit()
+
+
+def timed(queries: list[tuple[str, str | None]]) -> np.ndarray:
+    """Run the queries and return their latencies in ms."""
+    latencies = []
+    for query, tag in queries:
+        start = time.perf_counter()
+        search_articles(query, tag=tag)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.asarray(latencies)
+
+
+@click.command()
+@click.option("--articles", default=100_000, show_default=True, help="Number of articles")
+@click.option("--queries", default=500, show_default=True, help="Queries per scenario")
+@click.option("--vocabulary", default=50_000, show_default=True, help="Distinct words")
+@click.option("--tags", default=200, show_default=True, help="Distinct tags")
+@click.option(
+    "--stopwords", default=100, show_default=True, help="Most frequent words left out of queries",
+)
+def main(
+    articles: int, queries: int, vocabulary: int, tags: int, stopwords: int,
+) -> None:
+    """Time search queries against a synthetic article table."""
+    words = make_words(vocabulary)
+    rng = np.random.default_rng(2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmp) / 'bench.db'}"
+            JOBS_ENQUEUE_ON_INSERT = False
+            USER_CACHE_ENABLED = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            start = time.perf_counter()
+            populate(articles, words, tags)
+            click.echo(f"indexed {articles} articles in {time.perf_counter() - start:.1f} s")
+
+            def pick() -> str:
+                # Mix frequent and rare words (past the stopwords), like real queries
+                while True:
+                    rank = int(rng.zipf(1.3))
+                    if rank > stopwords:
+                        return words[rank % len(words)]
+
+            scenarios = {
+                "one word": [(pick(), None) for _ in range(queries)],
+                "two words": [(f"{pick()} {pick()}", None) for _ in range(queries)],
+                "prefix": [(pick()[:-1], None) for _ in range(queries)],
+                "word + tag": [
+                    (pick(), f"tag{int(rng.integers(tags))}") for _ in range(queries)
+                ],
+                "stopword": [
+                    (words[int(rng.integers(1, stopwords + 1))], None) for _ in range(queries)
+                ],
+            }
+            for name, batch in scenarios.items():
+                latencies = timed(batch)
+                click.echo(
+                    f"{name:11} p50 {np.percentile(latencies, 50):7.2f} ms  "
+                    f"p95 {np.percentile(latencies, 95):7.2f} ms  "
+                    f"p99 {np.percentile(latencies, 99):7.2f} ms",
+                )
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Write-contention benchmark of the SQLite engine profile.
+
+Starts several processes that each commit many small write transactions to
+the same database file while reader processes scan it, once with SQLAlchemy's
+default SQLite settings and once with the configured pragma profile (WAL,
+busy timeout, ...), and reports throughput, latency and lock errors.
+
+Usage::
+
+    python -m benchmarks.bench_sqlite --writers 4 --readers 2 --transactions 500
+"""
+
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import click
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from database import apply_sqlite_pragmas
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, worker INTEGER, body TEXT)"
+
+
+def _engine(url: str, pragmas: dict[str, Any]) -> Any:  # noqa: ANN401 - sqlalchemy Engine
+    engine = create_engine(url)
+    apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def _wait_until(start_at: float) -> None:
+    """Sleep until the shared start time, so process start-up is not measured."""
+    time.sleep(max(0.0, start_at - time.time()))
+
+
+def writer(
+    url: str, pragmas: dict[str, Any], worker: int, transactions: int, start_at: float,
+) -> tuple:
+    """Commit ``transactions`` single-row inserts; return latencies, errors and duration."""
+    engine = _engine(url, pragmas)
+    latencies, errors = [], 0
+    _wait_until(start_at)
+    started = time.perf_counter()
+    for i in range(transactions):
+        start = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    text("INSERT INTO events (worker, body) VALUES (:worker, :body)"),
+                    {"worker": worker, "body": f"event {i}" * 8},
+                )
+        except OperationalError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return latencies, errors, elapsed
+
+
+def reader(url: str, pragmas: dict[str, Any], start_at: float, stop: Any) -> tuple:  # noqa: ANN401
+    """Scan the table until ``stop`` is set; return the number of scans and errors."""
+    engine = _engine(url, pragmas)
+    scans, errors = 0, 0
+    _wait_until(start_at)
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT count(*), max(length(body)) FROM events")).one()
+            scans += 1
+        except OperationalError:  # noqa: PERF203 - counting lock errors is the point
+            errors += 1
+    engine.dispose()
+    return scans, errors
+
+
+def run_profile(
+    path: Path, pragmas: dict[str, Any], writers: int, readers: int, transactions: int,
+) -> None:
+    """Run one contention round against a fresh database and print its results."""
+    url = f"sqlite:///{path}"
+    engine = _engine(url, pragmas)
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+    engine.dispose()
+
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager, context.Pool(writers + readers) as pool:
+        stop = manager.Event()
+        # Leave time for the spawned processes to import before the clock starts
+        start_at = time.time() + 3
+        read_results = [
+            pool.apply_async(reader, (url, pragmas, start_at, stop)) for _ in range(readers)
+        ]
+        write_results = pool.starmap(
+            writer,
+            [(url, pragmas, worker, transactions, start_at) for worker in range(writers)],
+        )
+        stop.set()
+        scans = [result.get() for result in read_results]
+
+    latencies = np.concatenate([np.asarray(result[0]) for result in write_results]) * 1000
+    write_errors = sum(result[1] for result in write_results)
+    elapsed = max(result[2] for result in write_results)
+    commits = len(latencies) - write_errors
+    label = "tuned" if pragmas else "default"
+    click.echo(
+        f"{label:8} {commits / elapsed:9.1f} commits/s  "
+        f"p50 {np.percentile(latencies, 50):7.2f} ms  p99 {np.percentile(latencies, 99):8.2f} ms  "
+        f"write errors {write_errors}  reads {sum(s for s, _ in scans)} "
+        f"(errors {sum(e for _, e in scans)})",
+    )
+
+
+@click.command()
+@click.option("--writers", default=4, show_default=True, help="Concurrent writer processes")
+@click.option("--readers", default=2, show_default=True, help="Concurrent reader processes")
+@click.option("--transactions", default=500, show_default=True, help="Commits per writer")
+def main(writers: int, readers: int, transactions: int) -> None:
+    """Compare default SQLite settings with the configured pragma profile."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, pragmas in (("default", {}), ("tuned", Config.SQLITE_PRAGMAS)):
+            run_profile(Path(tmp) / f"{name}.db", pragmas, writers, readers, transactions)
+
+
+if __name__ == "__main__":
+    main()
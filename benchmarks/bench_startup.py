@@ -0,0 +1,111 @@
+"""Cold-start benchmark of the app factory.
+
+Every run starts a fresh interpreter (so imports are really cold) that times
+the phases of ``create_app`` one by one: importing the app module, creating
+the Flask app, database initialization, blueprint registration, the first
+database connection and the startup schema check (cached header read vs. full
+table inspection), then a complete ``create_app``. The median of each phase is reported.
+
+Usage::
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure_phases(database: str) -> dict[str, float]:
+    """Time the startup phases in the current (fresh) interpreter, in ms."""
+    timings: dict[str, float] = {}
+    start = time.perf_counter()
+
+    def lap(name: str) -> None:
+        nonlocal start
+        now = time.perf_counter()
+        timings[name] = (now - start) * 1000
+        start = now
+
+    import app  # noqa: PLC0415 - timing the import is the point
+    from config import Config  # noqa: PLC0415
+    from database import configure_engines, db, engine_options, replica_binds  # noqa: PLC0415
+    from migrations.runner import check_schema, ensure_schema  # noqa: PLC0415
+    from routes.articles import articles_bp  # noqa: PLC0415
+    from routes.auth import auth_bp  # noqa: PLC0415
+    from routes.graph import graph_bp  # noqa: PLC0415
+
+    lap("import")
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database
+
+    flask_app = app.Flask(app.__name__)
+    flask_app.config.from_object(BenchConfig)
+    lap("flask app")
+
+    flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(flask_app.config)
+    flask_app.config["SQLALCHEMY_BINDS"] = replica_binds(flask_app.config)
+    db.init_app(flask_app)
+    configure_engines(flask_app)
+    lap("db init")
+
+    flask_app.register_blueprint(auth_bp, url_prefix="/")
+    flask_app.register_blueprint(graph_bp, url_prefix="/api")
+    flask_app.register_blueprint(articles_bp, url_prefix="/api")
+    lap("blueprints")
+
+    with flask_app.app_context():
+        with db.engine.connect():
+            pass
+        lap("first connection")
+        ensure_schema()
+        lap("schema (cached)")
+        check_schema()
+        lap("schema (inspect)")
+
+    app.create_app(BenchConfig)
+    lap("create_app total")
+    return timings
+
+
+@click.command()
+@click.option("--runs", default=10, show_default=True, help="Fresh interpreters to start")
+@click.option("--child", default=None, hidden=True, help="Database URI (internal)")
+def main(runs: int, child: str | None) -> None:
+    """Report median cold-start time per create_app phase."""
+    if child is not None:
+        click.echo(json.dumps(measure_phases(child)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        command = [sys.executable, "-m", "benchmarks.bench_startup", "--child", database]
+        # First start creates the schema; it is not a cold start of a deployed app
+        subprocess.run(command, cwd=ROOT, check=True, capture_output=True)  # noqa: S603
+        results = [
+            json.loads(
+                subprocess.run(  # noqa: S603
+                    command, cwd=ROOT, check=True, capture_output=True, text=True,
+                ).stdout,
+            )
+            for _ in range(runs)
+        ]
+
+    for phase in results[0]:
+        values = np.asarray([result[phase] for result in results])
+        click.echo(
+            f"{phase:17} median {np.median(values):8.2f} ms  max {values.max():8.2f} ms",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Benchmark of the precomputed trending ranking.
+
+Fills a temporary database with synthetic votes (Zipf-distributed article
+popularity, vote times spread over the last weeks), then times the
+background ``refresh_trending`` recomputation, the indexed
+``ORDER BY trending DESC LIMIT k`` listing, and for comparison the same
+ranking computed from the votes on every request.
+
+Usage::
+
+    python -m benchmarks.bench_trending --votes 1000000
+"""
+
+import math
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import click
+import numpy as np
+
+from app import create_app
+from config import Config
+from database import db
+from models.article import Article, trending_articles
+from models.user import User
+from models.vote import Vote, refresh_trending
+
+
+def populate(
+    articles: int, users: int, votes: int, days: float, batch_size: int = 50_000,
+) -> int:
+    """Insert users, articles and unique (user, article) votes; return the vote count."""
+    rng = np.random.default_rng(0)
+    db.session.execute(
+        User.__table__.insert(),
+        [
+            {"id": i + 1, "username": f"u{i}", "email": f"u{i}@example.com", "password_hash": "-"}
+            for i in range(users)
+        ],
+    )
+    db.session.execute(
+        Article.__table__.insert(),
+        [{"id": i + 1, "title": f"Article {i}", "user_id": i % users + 1} for i in range(articles)],
+    )
+    db.session.commit()
+
+    # Popular articles get most votes; duplicates of a (user, article) pair are dropped
+    pairs = np.empty(0, dtype=np.int64)
+    while pairs.size < min(votes, articles * users):
+        article_ids = rng.zipf(1.2, size=votes) % articles + 1
+        user_ids = rng.integers(1, users + 1, size=votes, dtype=np.int64)
+        pairs = np.unique(np.concatenate([pairs, user_ids * (articles + 1) + article_ids]))
+    pairs = pairs[:votes]
+    rng.shuffle(pairs)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    ages = rng.uniform(0, days * 86400, size=pairs.size)
+    values = rng.choice([1, 1, 1, -1], size=pairs.size)
+    for start in range(0, pairs.size, batch_size):
+        chunk = slice(start, start + batch_size)
+        db.session.execute(
+            Vote.__table__.insert(),
+            [
+                {
+                    "user_id": int(pair // (articles + 1)),
+                    "article_id": int(pair % (articles + 1)),
+                    "value": int(value),
+                    "updated_at": now - timedelta(seconds=float(age)),
+                }
+                for pair, value, age in zip(pairs[chunk], values[chunk], ages[chunk], strict=True)
+            ],
+        )
+        db.session.commit()
+    return int(pairs.size)
+
+
+def on_the_fly(half_life_hours: float, limit: int) -> list:
+    """Rank articles by decayed vote sum straight from the votes table."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    per_day = math.log(2) * 24 / half_life_hours
+    trending = db.func.sum(
+        Vote.value
+        * db.func.exp(per_day * (db.func.julianday(Vote.updated_at) - db.func.julianday(now))),
+    )
+    return db.session.execute(
+        db.select(Vote.article_id, trending)
+        .group_by(Vote.article_id)
+        .order_by(trending.desc())
+        .limit(limit),
+    ).all()
+
+
+def percentiles(latencies: list[float]) -> str:
+    """Format p50/p95/p99 of latencies given in seconds."""
+    ms = np.asarray(latencies) * 1000
+    return (
+        f"p50 {np.percentile(ms, 50):8.2f} ms  "
+        f"p95 {np.percentile(ms, 95):8.2f} ms  "
+        f"p99 {np.percentile(ms, 99):8.2f} ms"
+    )
+
+
+@click.command()
+@click.option("--votes", default=1_000_000, show_default=True, help="Number of votes")
+@click.option("--articles", default=100_000, show_default=True, help="Number of articles")
+@click.option("--users", default=50_000, show_default=True, help="Number of users")
+@click.option("--days", default=30.0, show_default=True, help="Age of the oldest vote")
+@click.option("--half-life", default=24.0, show_default=True, help="Trending half-life in hours")
+@click.option("--limit", default=20, show_default=True, help="Size of the trending listing")
+@click.option("--queries", default=200, show_default=True, help="Listing queries timed")
+def main(  # noqa: PLR0913, PLR0917 - one argument per benchmark option
+    votes: int, articles: int, users: int, days: float, half_life: float, limit: int, queries: int,
+) -> None:
+    """Time the trending refresh and listing against synthetic votes."""
+    with tempfile.TemporaryDirectory() as tmp:
+
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmp) / 'bench.db'}"
+            JOBS_ENQUEUE_ON_INSERT = False
+            USER_CACHE_ENABLED = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            start = time.perf_counter()
+            inserted = populate(articles, users, votes, days)
+            click.echo(f"inserted {inserted} votes in {time.perf_counter() - start:.1f} s")
+
+            start = time.perf_counter()
+            ranked = refresh_trending(half_life)
+            click.echo(
+                f"refresh_trending: {ranked} articles in {time.perf_counter() - start:.2f} s",
+            )
+
+            latencies = []
+            for _ in range(queries):
+                start = time.perf_counter()
+                top = trending_articles().limit(limit).all()
+                latencies.append(time.perf_counter() - start)
+                db.session.expunge_all()
+            click.echo(f"indexed listing   {percentiles(latencies)}")
+
+            latencies = []
+            for _ in range(max(1, queries // 20)):
+                start = time.perf_counter()
+                fly = on_the_fly(half_life, limit)
+                latencies.append(time.perf_counter() - start)
+            click.echo(f"on the fly        {percentiles(latencies)}")
+
+            same = [article.id for article in trending_articles().limit(limit)] == [
+                row.article_id for row in fly
+            ]
+            click.echo(f"same top {limit}: {same} ({len(top)} listed)")
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
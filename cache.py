@@ -0,0 +1,110 @@
+"""In-process caching utilities.
+
+Provides a thread-safe, size-bounded LRU cache with per-entry expiry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time.
+
+    Attributes:
+        maxsize: Maximum number of entries kept (least recently used evicted first)
+        ttl: Seconds an entry stays valid
+        hits: Number of successful lookups
+        misses: Number of lookups that found no valid entry
+
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid
+            clock: Monotonic time source (injectable for tests)
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:  # noqa: ANN401 - values are arbitrary
+        """Return a cached value, or None if absent or expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Any: Cached value or None
+
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:  # noqa: ANN401 - values are arbitrary
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+
+        """
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present.
+
+        Args:
+            key: Cache key
+
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Number of stored entries (including not yet evicted expired ones)."""
+        return len(self._data)
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and the hit ratio.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``size`` and ``hit_ratio``
+
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -14,7 +14,74 @@ class Config:
         SECRET_KEY: Secret key for session management and CSRF protection
         SQLALCHEMY_DATABASE_URI: Database connection URI
         SQLALCHEMY_TRACK_MODIFICATIONS: Disable SQLAlchemy event system
+        SQLALCHEMY_READ_REPLICA_URI: Optional read-only database serving reads of GET
+            requests and read-only query helpers (e.g. "sqlite:///file:site.db?mode=ro&uri=true")
+        SCHEMA_CHECK_ON_STARTUP: Check (and for an empty database, create) the schema in
+            create_app; disable when deployments run `constellate upgrade` themselves
+        MIGRATION_BATCH_SIZE: Rows changed per transaction by data migrations
+        SQLITE_PRAGMAS: Pragmas run on every new SQLite connection (empty disables)
+        DB_POOL_SIZE: Connections kept open per process (match the threads per worker)
+        DB_MAX_OVERFLOW: Extra connections opened temporarily under load
+        DB_POOL_RECYCLE: Seconds before a pooled connection is replaced (server backends)
         WTF_CSRF_ENABLED: Enable CSRF protection for Flask-WTF forms
+        PASSWORD_HASH_METHOD: Werkzeug hash method and cost, e.g. "scrypt:32768:8:1"
+            or "pbkdf2:sha256:600000"; outdated hashes are upgraded on login
+        PASSWORD_SALT_LENGTH: Salt length of new password hashes
+        PASSWORD_HASH_EXECUTOR: Run hashing in a "thread" or "process" pool (None: inline)
+        PASSWORD_HASH_WORKERS: Size of the hashing pool
+        PASSWORD_HASH_QUEUE_SIZE: Hashes allowed to wait for the pool before rejection
+        PASSWORD_HASH_TIMEOUT: Seconds to wait for a pooled hash
+        USER_CACHE_ENABLED: Cache users loaded by the Flask-Login user_loader
+        USER_CACHE_SIZE: Maximum number of cached users
+        USER_CACHE_TTL: Seconds a cached user stays valid (bounds cross-worker staleness)
+        GRAPH_BATCH_SIZE: Articles fetched per keyset batch by the graph API
+        EMBEDDER: Name of the registered embedder used for article vectors
+        EMBEDDING_DIR: Directory holding the on-disk similarity index
+        EMBEDDING_PDF_CHARS: Characters of an article's PDF text added to its embedded
+            text (0 embeds the title, tags and summary only)
+        SIMILARITY_CHUNK_ROWS: Vectors scored per matrix product during search
+        SIMILARITY_BACKEND: Neighbour search backend, "exact" or "ivf" (approximate)
+        SIMILARITY_PRELOAD: Open the similarity index when the app is created
+        IVF_NLIST: Number of IVF lists (0 picks sqrt of the number of vectors)
+        IVF_NPROBE: Number of IVF lists scored per query
+        JOBS_ENQUEUE_ON_INSERT: Queue a processing job for every new article
+        JOB_MAX_ATTEMPTS: Attempts before a background job is marked failed
+        JOB_BACKOFF_SECONDS: Base delay of the exponential retry backoff
+        JOB_POLL_INTERVAL: Seconds an idle worker waits between queue polls
+        JOB_STALE_SECONDS: Running jobs older than this are requeued on worker start
+        PERIODIC_JOBS: Seconds between runs of each periodic job kind (0 disables it)
+        VOTE_RECONCILE_BATCH_SIZE: Articles checked per transaction when reconciling scores
+        TRENDING_HALF_LIFE_HOURS: Hours after which a vote counts half in the trending score
+        EVENTS_BROKER: Broker sharing live graph events, "memory" (single process)
+            or "database" (all workers of the server)
+        EVENTS_BUFFER_SIZE: Recent events kept for Last-Event-ID replay
+        EVENTS_MAX_SUBSCRIBERS: Concurrent event streams allowed per process (under
+            `constellate serve`, at most the threads per worker minus
+            EVENTS_RESERVED_THREADS)
+        EVENTS_RESERVED_THREADS: Request threads per server worker kept free of event streams
+        EVENTS_HEARTBEAT_SECONDS: Idle seconds before a heartbeat is sent on an event stream
+            (under `constellate serve`, at most half the worker timeout)
+        EVENTS_MAX_STREAM_SECONDS: Lifetime of an event stream before the client reconnects
+        EVENTS_POLL_INTERVAL: Seconds between polls of the database broker
+        MAX_CONTENT_LENGTH: Largest accepted request body in bytes (PDF uploads); larger
+            requests are rejected with 413 before they are read
+        BLOB_DIR: Directory of the content-addressed blob store (uploaded PDFs)
+        BLOB_CHUNK_SIZE: Bytes read and hashed at a time when storing a blob
+        BLOB_OFFLOAD: Let the front-end server send blob files: "sendfile" (X-Sendfile,
+            Apache/lighttpd), "accel" (X-Accel-Redirect, nginx) or None (stream from Flask)
+        BLOB_ACCEL_PREFIX: nginx internal location aliased to BLOB_DIR (for "accel")
+        BLOB_GC_GRACE_SECONDS: Minimum age of an unreferenced blob before it is collected
+        TEXT_CACHE_DIR: Directory of the text extracted from PDFs, by content hash
+        TEXT_CACHE_COMPRESSION: zlib level of cached texts (1 fastest, 9 smallest)
+        WORKER_PROCESSES: Default number of background worker processes
+        SUMMARIZER: Name of the registered summarizer used by background jobs
+        DEFAULT_AGENT: Name of the LLM agent behind the "agent" summarizer and embedder
+        AGENT_BATCH_SIZE: Largest batch of texts sent to the agent (None: the agent's own)
+        AGENT_BATCH_WAIT: Seconds the first of concurrent agent calls waits for others to join
+            (a lone call does not wait)
+        AGENT_CACHE_PATH: SQLite file caching agent responses by model and prompt (None
+            disables the cache)
+        AGENT_CACHE_SIZE: Cached agent responses kept (least recently used evicted first)
 
     """
 
@@ -31,10 +98,98 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or \
         f'sqlite:///{INSTANCE_DIR / "site.db"}'
 
+    # Schema migrations (see `constellate upgrade`)
+    SCHEMA_CHECK_ON_STARTUP = True
+    MIGRATION_BATCH_SIZE = 500
+
+    # Optional read replica (see database.RoutingSession)
+    SQLALCHEMY_READ_REPLICA_URI = os.environ.get("DATABASE_REPLICA_URL")
+
     # Disable SQLAlchemy event system for performance
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # SQLite engine profile: WAL lets readers run next to a writer, and writers
+    # wait for the lock (busy_timeout, ms) instead of failing with "database is locked"
+    SQLITE_PRAGMAS = {  # noqa: RUF012 - read-only settings
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "busy_timeout": 5000,
+        "cache_size": -65536,  # negative: KiB, i.e. 64 MiB per connection
+        "mmap_size": 268435456,  # 256 MiB
+        "temp_store": "memory",
+    }
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 10
+    DB_POOL_RECYCLE = 3600
+
     # Flask-WTF configuration
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None  # No time limit for CSRF tokens
 
+    # Password hashing cost (see `constellate bench-hash`)
+    PASSWORD_HASH_METHOD = os.environ.get("CONSTELLATE_PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_SALT_LENGTH = 16
+    PASSWORD_HASH_EXECUTOR = os.environ.get("CONSTELLATE_PASSWORD_HASH_EXECUTOR")
+    PASSWORD_HASH_WORKERS = os.cpu_count() or 2
+    PASSWORD_HASH_QUEUE_SIZE = 32
+    PASSWORD_HASH_TIMEOUT = 10.0
+
+    # Identity cache for the Flask-Login user_loader
+    USER_CACHE_ENABLED = True
+    USER_CACHE_SIZE = 1024
+    USER_CACHE_TTL = 60
+
+    # Graph API streaming: rows fetched per keyset batch
+    GRAPH_BATCH_SIZE = 500
+
+    # Article embeddings and similarity search
+    EMBEDDER = os.environ.get("CONSTELLATE_EMBEDDER", "hashing")
+    EMBEDDING_DIR = INSTANCE_DIR / "embeddings"
+    EMBEDDING_PDF_CHARS = 4000
+    SIMILARITY_CHUNK_ROWS = 65536
+    SIMILARITY_BACKEND = os.environ.get("CONSTELLATE_SIMILARITY_BACKEND", "exact")
+    SIMILARITY_PRELOAD = False
+    IVF_NLIST = 0
+    IVF_NPROBE = 8
+
+    # Background jobs (PDF extraction, summarization, embedding)
+    JOBS_ENQUEUE_ON_INSERT = True
+    JOB_MAX_ATTEMPTS = 5
+    JOB_BACKOFF_SECONDS = 30
+    JOB_POLL_INTERVAL = 1.0
+    JOB_STALE_SECONDS = 600
+    WORKER_PROCESSES = 2
+    SUMMARIZER = os.environ.get("CONSTELLATE_SUMMARIZER", "fake")
+    PERIODIC_JOBS = {  # noqa: RUF012 - read-only settings
+        "reconcile_votes": 3600,
+        "refresh_trending": 300,
+        "collect_blobs": 86400,
+    }
+    VOTE_RECONCILE_BATCH_SIZE = 1000
+    TRENDING_HALF_LIFE_HOURS = 24.0
+
+    # LLM agent behind the "agent" summarizer and embedder
+    DEFAULT_AGENT = os.environ.get("CONSTELLATE_DEFAULT_AGENT", "fake")
+    AGENT_BATCH_SIZE = None
+    AGENT_BATCH_WAIT = 0.01
+    AGENT_CACHE_PATH = INSTANCE_DIR / "agent_cache.db"
+    AGENT_CACHE_SIZE = 100_000
+
+    # Live graph updates (Server-Sent Events)
+    EVENTS_BROKER = os.environ.get("CONSTELLATE_EVENTS_BROKER", "memory")
+    EVENTS_BUFFER_SIZE = 1000
+    EVENTS_MAX_SUBSCRIBERS = 100
+    EVENTS_RESERVED_THREADS = 4
+    EVENTS_HEARTBEAT_SECONDS = 15.0
+    EVENTS_MAX_STREAM_SECONDS = 300.0
+    EVENTS_POLL_INTERVAL = 0.5
+
+    # Content-addressed PDF storage and uploads
+    MAX_CONTENT_LENGTH = 64 * 1024 * 1024
+    BLOB_DIR = INSTANCE_DIR / "blobs"
+    BLOB_CHUNK_SIZE = 1 << 20
+    BLOB_OFFLOAD = os.environ.get("CONSTELLATE_BLOB_OFFLOAD")
+    BLOB_ACCEL_PREFIX = "/_blobs/"
+    BLOB_GC_GRACE_SECONDS = 86400
+    TEXT_CACHE_DIR = INSTANCE_DIR / "texts"
+    TEXT_CACHE_COMPRESSION = 6
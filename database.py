@@ -3,11 +3,86 @@
 Handles SQLAlchemy database setup and initialization.
 """
 
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+from flask import Flask, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Engine, Select, event, inspect, text
+from sqlalchemy.engine import make_url
+
+# Bind key of the optional read-only engine (see ``SQLALCHEMY_READ_REPLICA_URI``)
+REPLICA_BIND = "replica"
+
+# Request methods whose queries may be served by the replica
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RoutingSession(Session):
+    """Session sending reads to the read replica when one is configured.
+
+    SELECTs go to the replica during GET/HEAD/OPTIONS requests and inside
+    ``replica_reads`` blocks. Everything else, and every statement after the
+    session has written (flushed or executed DML), uses the primary, so a
+    request always reads its own writes.
+    """
+
+    def get_bind(
+        self,
+        mapper: Any | None = None,  # noqa: ANN401 - as in Session.get_bind
+        clause: Any | None = None,  # noqa: ANN401
+        bind: Any | None = None,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Pick the replica for eligible reads, otherwise defer to the bind-key routing."""
+        if bind is None and isinstance(clause, Select) and self._reads_from_replica():
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self) -> bool:
+        """Whether reads of this session may use the replica right now."""
+        if self.info.get("wrote") or self.new or self.dirty or self.deleted:
+            return False
+        if self.info.get("replica_reads"):
+            return True
+        return has_request_context() and request.method in READ_METHODS
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_to_primary(session: Session, _flush_context: object) -> None:
+    """Keep a session that wrote on the primary for the rest of its life."""
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _pin_on_dml(orm_execute_state: Any) -> None:  # noqa: ANN401 - sqlalchemy ORMExecuteState
+    """Pin the session to the primary when it runs a bulk INSERT/UPDATE/DELETE."""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Let reads in this block use the replica outside of read-only requests.
+
+    Also usable as a decorator on read-only query helpers.
+    """
+    session = db.session()
+    previous = session.info.get("replica_reads", False)
+    session.info["replica_reads"] = True
+    try:
+        yield
+    finally:
+        session.info["replica_reads"] = previous
+
 
 # Initialize SQLAlchemy instance
 # This will be initialized with the Flask app in app.py
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def init_db() -> None:
@@ -18,3 +93,135 @@ def init_db() -> None:
     """
     db.create_all()
 
+
+def create_missing_indexes() -> list[str]:
+    """Add indexes declared on the models to existing tables.
+
+    ``create_all`` only creates indexes together with new tables; this adds
+    the ones missing from tables created by an older version. Indexes on
+    columns the table does not have yet are left to the migration adding the
+    column. Afterwards the SQLite planner statistics are refreshed so the new
+    indexes get used.
+    Should be called within a Flask application context.
+
+    Returns:
+        list[str]: Names of the created indexes
+
+    """
+    inspector = inspect(db.engine)
+    tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing and {c.name for c in index.columns} <= columns:
+                index.create(db.engine)
+                created.append(index.name)
+    if created and db.engine.dialect.name == "sqlite":
+        with db.engine.begin() as conn:
+            conn.execute(text("PRAGMA optimize"))
+    return created
+
+
+def engine_options(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Build the engine options (pool sizing) for the configured backend.
+
+    SQLite file databases keep a small queue pool per process, as WAL mode lets
+    readers proceed next to the single writer; in-memory databases are left to
+    Flask-SQLAlchemy's static pool. Server backends get a pre-pinged, recycled
+    pool. Options set in ``SQLALCHEMY_ENGINE_OPTIONS`` take precedence.
+
+    Args:
+        config: Application config
+
+    Returns:
+        dict: Keyword arguments for ``create_engine``
+
+    """
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    options: dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite":
+        if url.database and url.database != ":memory:":
+            options = {
+                "pool_size": config["DB_POOL_SIZE"],
+                "max_overflow": config["DB_MAX_OVERFLOW"],
+            }
+    else:
+        options = {
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_recycle": config["DB_POOL_RECYCLE"],
+            "pool_pre_ping": True,
+        }
+    return {**options, **config.get("SQLALCHEMY_ENGINE_OPTIONS", {})}
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Mapping[str, Any]) -> None:
+    """Run ``PRAGMA`` statements on every new connection of a SQLite engine.
+
+    Args:
+        engine: Engine to configure (non-SQLite engines are ignored)
+        pragmas: Pragma names and values, e.g. ``{"journal_mode": "wal"}``
+
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+    if engine.url.query.get("mode") == "ro":
+        # The journal mode belongs to the file and cannot be set read-only
+        pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, _record: object) -> None:  # noqa: ANN401
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def replica_binds(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Return ``SQLALCHEMY_BINDS`` extended with the read replica, if configured.
+
+    Args:
+        config: Application config
+
+    Returns:
+        dict: Bind keys and URIs
+
+    """
+    binds = dict(config.get("SQLALCHEMY_BINDS") or {})
+    if config.get("SQLALCHEMY_READ_REPLICA_URI"):
+        binds[REPLICA_BIND] = config["SQLALCHEMY_READ_REPLICA_URI"]
+    return binds
+
+
+def configure_engines(app: Flask) -> None:
+    """Apply the SQLite pragma profile to the app's engines.
+
+    Args:
+        app: Flask application after ``db.init_app``
+
+    """
+    # The replica mirrors the primary's schema: keep create_all/drop_all off it
+    db.metadatas.pop(REPLICA_BIND, None)
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_sqlite_pragmas(engine, app.config["SQLITE_PRAGMAS"])
+
+
+def dispose_engines(app: Flask) -> None:
+    """Drop pooled connections inherited from a parent process.
+
+    Must be called in every process forked after the engine was used (e.g. in
+    a pre-forking server's post-fork hook). ``close=False`` leaves the parent's
+    connections untouched while the child starts with a fresh pool.
+
+    Args:
+        app: Flask application whose engines are disposed
+
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,5 @@
+"""Events package for Constellate.
+
+Contains the in-process pub/sub bus and the brokers that feed it, used to
+push live graph updates to browsers over Server-Sent Events.
+"""
@@ -0,0 +1,236 @@
+"""Event brokers feeding the in-process bus.
+
+A broker assigns event ids and delivers published events to the bus of every
+process that serves subscribers. The memory broker works within a single
+process; the database broker shares events between the workers of a
+pre-forking server through the ``graph_events`` table.
+"""
+
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from flask import Flask
+
+from database import db
+from events.bus import Event, EventBus
+from models.event import GraphEvent
+
+
+class Broker(ABC):
+    """Interface for event brokers.
+
+    Attributes:
+        name: Name the broker is registered under
+
+    """
+
+    name: str
+
+    def __init__(self, app: Flask, bus: EventBus) -> None:
+        """Create a broker delivering to ``bus``.
+
+        Args:
+            app: Flask application (for configuration and database access)
+            bus: Bus of this process
+
+        """
+        self.app = app
+        self.bus = bus
+
+    @abstractmethod
+    def publish(self, kind: str, data: str) -> int:
+        """Publish an event to every process.
+
+        Args:
+            kind: Event type
+            data: JSON-encoded payload
+
+        Returns:
+            int: Id of the new event
+
+        """
+
+    def start(self) -> None:  # noqa: B027 - optional hook
+        """Begin delivering events published elsewhere (called on first subscribe)."""
+
+    def stop(self) -> None:  # noqa: B027 - optional hook
+        """Stop delivering events published elsewhere."""
+
+
+class MemoryBroker(Broker):
+    """Broker for a single process: events go straight to its bus.
+
+    Ids continue from the start time in milliseconds, so they keep increasing
+    across restarts and a client reconnecting with a ``Last-Event-ID`` from
+    before a restart does not wait for ids it has already seen.
+    """
+
+    name = "memory"
+
+    def __init__(self, app: Flask, bus: EventBus) -> None:
+        """Create a broker delivering to ``bus``.
+
+        Args:
+            app: Flask application
+            bus: Bus of this process
+
+        """
+        super().__init__(app, bus)
+        self._ids = itertools.count(time.time_ns() // 1_000_000)
+        self._lock = threading.Lock()
+
+    def publish(self, kind: str, data: str) -> int:
+        """Deliver an event to this process's bus.
+
+        Args:
+            kind: Event type
+            data: JSON-encoded payload
+
+        Returns:
+            int: Id of the new event
+
+        """
+        with self._lock:
+            event = Event(next(self._ids), kind, data)
+            self.bus.deliver(event)
+        return event.id
+
+
+class DatabaseBroker(Broker):
+    """Broker sharing events between processes through the ``graph_events`` table.
+
+    Publishing appends a row (its id is the event id, equal in every worker,
+    so ``Last-Event-ID`` replay works whichever worker a client reconnects
+    to). Each process serving subscribers polls the table from a background
+    thread, started on first subscribe so pre-forked workers start their own.
+    Rows older than the replay buffer are pruned.
+    """
+
+    name = "database"
+
+    # Prune the table once every this many events
+    PRUNE_EVERY = 100
+
+    def __init__(self, app: Flask, bus: EventBus) -> None:
+        """Create a broker delivering to ``bus``.
+
+        Args:
+            app: Flask application
+            bus: Bus of this process
+
+        """
+        super().__init__(app, bus)
+        self.poll_interval = app.config["EVENTS_POLL_INTERVAL"]
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def publish(self, kind: str, data: str) -> int:
+        """Append an event to the table in its own transaction.
+
+        Args:
+            kind: Event type
+            data: JSON-encoded payload
+
+        Returns:
+            int: Id of the new event
+
+        """
+        with db.engine.begin() as conn:
+            event_id = conn.execute(
+                db.insert(GraphEvent).values(kind=kind, data=data).returning(GraphEvent.id),
+            ).scalar_one()
+            if event_id % self.PRUNE_EVERY == 0:
+                conn.execute(
+                    db.delete(GraphEvent).where(GraphEvent.id <= event_id - self.bus.buffer_size),
+                )
+        return event_id
+
+    def start(self) -> None:
+        """Load the replay window and start the polling thread unless it is running.
+
+        Must be called inside an application context.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self.poll()
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="constellate-events", daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread and wait for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> int:
+        """Deliver the events newer than the bus's last one.
+
+        On the first poll this loads the replay window and marks older events
+        as missing. Must be called inside an application context.
+
+        Returns:
+            int: Number of delivered events
+
+        """
+        last_id = self.bus.last_id
+        statement = db.select(GraphEvent.id, GraphEvent.kind, GraphEvent.data)
+        if last_id:
+            statement = statement.where(GraphEvent.id > last_id).order_by(GraphEvent.id)
+        else:
+            statement = statement.order_by(GraphEvent.id.desc()).limit(self.bus.buffer_size)
+        with db.engine.connect() as conn:
+            rows = sorted(conn.execute(statement).all())
+        if rows and not last_id:
+            self.bus.mark_missing(rows[0].id - 1)
+        for row in rows:
+            self.bus.deliver(Event(row.id, row.kind, row.data))
+        return len(rows)
+
+    def _run(self) -> None:
+        """Poll the table until stopped."""
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    delivered = self.poll()
+                except Exception:
+                    self.app.logger.exception("Polling graph events failed")
+                    delivered = 0
+                if not delivered:
+                    self._stop.wait(self.poll_interval)
+
+
+# Registry of available brokers by name
+BROKERS: dict[str, type[Broker]] = {
+    MemoryBroker.name: MemoryBroker,
+    DatabaseBroker.name: DatabaseBroker,
+}
+
+
+def get_broker(name: str, app: Flask, bus: EventBus) -> Broker:
+    """Instantiate a registered broker.
+
+    Args:
+        name: Registered broker name
+        app: Flask application
+        bus: Bus of this process
+
+    Returns:
+        Broker: New broker instance
+
+    Raises:
+        KeyError: If no broker is registered under ``name``
+
+    """
+    try:
+        broker_class = BROKERS[name]
+    except KeyError:
+        msg = f"Unknown event broker {name!r}; available: {', '.join(sorted(BROKERS))}"
+        raise KeyError(msg) from None
+    return broker_class(app, bus)
@@ -0,0 +1,192 @@
+"""In-process event bus with a bounded replay buffer.
+
+Events are kept in a ring buffer ordered by id. Subscribers do not own queues;
+each keeps the id of the last event it sent and waits for newer ones, so a
+slow client costs no memory and a reconnecting client resumes from its
+``Last-Event-ID`` as long as that event is still buffered.
+"""
+
+import threading
+from collections import deque
+from itertools import takewhile
+
+
+class SubscriberLimitError(RuntimeError):
+    """Raised when the bus already has its maximum number of subscribers."""
+
+
+class Event:
+    """A published event.
+
+    Attributes:
+        id: Increasing event id
+        kind: Event type, sent as the SSE ``event`` field
+        data: JSON-encoded payload
+        frame: The event encoded as a Server-Sent Events message
+
+    """
+
+    __slots__ = ("data", "frame", "id", "kind")
+
+    def __init__(self, event_id: int, kind: str, data: str) -> None:
+        """Create an event and encode its SSE message once for all subscribers.
+
+        Args:
+            event_id: Increasing event id
+            kind: Event type
+            data: JSON-encoded payload (single line)
+
+        """
+        self.id = event_id
+        self.kind = kind
+        self.data = data
+        self.frame = f"id: {event_id}\nevent: {kind}\ndata: {data}\n\n"
+
+    def __repr__(self) -> str:
+        """String representation of Event object."""
+        return f"<Event {self.id} {self.kind}>"
+
+
+class Subscription:
+    """A subscriber slot on the bus, released by ``close``."""
+
+    def __init__(self, bus: "EventBus") -> None:
+        """Take a slot (the caller has checked the limit).
+
+        Args:
+            bus: Bus the slot belongs to
+
+        """
+        self._bus = bus
+        self._closed = False
+
+    def close(self) -> None:
+        """Release the slot; safe to call more than once."""
+        if not self._closed:
+            self._closed = True
+            self._bus.release()
+
+
+class EventBus:
+    """Thread-safe fan-out of events to waiting subscribers.
+
+    Attributes:
+        buffer_size: Number of recent events kept for replay
+        max_subscribers: Maximum number of concurrent subscribers
+        subscribers: Current number of subscribers
+
+    """
+
+    def __init__(self, buffer_size: int = 1000, max_subscribers: int = 100) -> None:
+        """Create an empty bus.
+
+        Args:
+            buffer_size: Number of recent events kept for replay
+            max_subscribers: Maximum number of concurrent subscribers
+
+        """
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.subscribers = 0
+        self._events: deque[Event] = deque(maxlen=buffer_size)
+        # Newest event id that is not (or no longer) available for replay
+        self._missing_id = 0
+        self._condition = threading.Condition()
+
+    @property
+    def last_id(self) -> int:
+        """Id of the newest buffered event, or 0 if none was delivered yet."""
+        with self._condition:
+            return self._events[-1].id if self._events else 0
+
+    def deliver(self, event: Event) -> None:
+        """Append an event and wake the subscribers.
+
+        Events not newer than the last buffered one are ignored, so a broker
+        may deliver the same event twice.
+
+        Args:
+            event: Event to publish
+
+        """
+        with self._condition:
+            if self._events and event.id <= self._events[-1].id:
+                return
+            if len(self._events) == self.buffer_size:
+                self._missing_id = self._events[0].id
+            self._events.append(event)
+            self._condition.notify_all()
+
+    def mark_missing(self, event_id: int) -> None:
+        """Record that events up to ``event_id`` cannot be replayed.
+
+        Brokers call this when they start from a window of recent events, so
+        clients that saw only older ones are told to resync.
+
+        Args:
+            event_id: Newest id of the missing events
+
+        """
+        with self._condition:
+            self._missing_id = max(self._missing_id, event_id)
+
+    def since(self, after_id: int) -> list[Event] | None:
+        """Return the buffered events newer than ``after_id``.
+
+        Args:
+            after_id: Id of the last event the subscriber has seen
+
+        Returns:
+            list[Event]: Newer events, oldest first, or None if some of them
+                have already left the buffer (the subscriber must resync)
+
+        """
+        with self._condition:
+            if after_id < self._missing_id:
+                return None
+            if not self._events or after_id >= self._events[-1].id:
+                return []
+            # Walk back from the newest event: subscribers are usually near the end
+            newer = list(takewhile(lambda event: event.id > after_id, reversed(self._events)))
+        newer.reverse()
+        return newer
+
+    def wait(self, after_id: int, timeout: float) -> list[Event] | None:
+        """Block until an event newer than ``after_id`` arrives or the timeout passes.
+
+        Args:
+            after_id: Id of the last event the subscriber has seen
+            timeout: Seconds to wait
+
+        Returns:
+            list[Event]: Newer events (empty on timeout), or None if the
+                subscriber fell behind the buffer
+
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: bool(self._events) and self._events[-1].id > after_id, timeout,
+            )
+        return self.since(after_id)
+
+    def subscribe(self) -> Subscription:
+        """Take a subscriber slot.
+
+        Returns:
+            Subscription: Slot to close when the subscriber disconnects
+
+        Raises:
+            SubscriberLimitError: If all slots are taken
+
+        """
+        with self._condition:
+            if self.subscribers >= self.max_subscribers:
+                msg = f"Event bus has reached {self.max_subscribers} subscribers"
+                raise SubscriberLimitError(msg)
+            self.subscribers += 1
+        return Subscription(self)
+
+    def release(self) -> None:
+        """Give back a subscriber slot (called by ``Subscription.close``)."""
+        with self._condition:
+            self.subscribers -= 1
@@ -0,0 +1,141 @@
+"""Live graph updates over Server-Sent Events.
+
+``EventChannel`` ties the process's event bus to the configured broker; it is
+created by the app factory as ``app.extensions["events"]``. Writers call
+``publish`` after committing, and every open ``/api/graph/events`` stream
+receives the record.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+
+from flask import Flask, current_app
+
+from events.brokers import get_broker
+from events.bus import EventBus, Subscription
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+
+class EventChannel:
+    """Publishing and subscribing endpoint of the graph events.
+
+    Attributes:
+        bus: Event bus of this process
+        broker: Broker distributing events between processes
+
+    """
+
+    def __init__(self, app: Flask) -> None:
+        """Create the bus and broker configured for the app.
+
+        Args:
+            app: Flask application
+
+        """
+        config = app.config
+        self.bus = EventBus(
+            buffer_size=config["EVENTS_BUFFER_SIZE"],
+            max_subscribers=config["EVENTS_MAX_SUBSCRIBERS"],
+        )
+        self.broker = get_broker(config["EVENTS_BROKER"], app, self.bus)
+
+    def publish(self, kind: str, record: dict) -> int:
+        """Publish a record to all subscribers.
+
+        Args:
+            kind: Event type
+            record: JSON-serializable payload
+
+        Returns:
+            int: Id of the new event
+
+        """
+        return self.broker.publish(kind, json.dumps(record, separators=(",", ":")))
+
+    def subscribe(self) -> Subscription:
+        """Take a subscriber slot and make sure the broker is delivering.
+
+        Returns:
+            Subscription: Slot to close when the client disconnects
+
+        Raises:
+            SubscriberLimitError: If the subscriber cap is reached
+
+        """
+        subscription = self.bus.subscribe()
+        try:
+            self.broker.start()
+        except BaseException:
+            subscription.close()
+            raise
+        return subscription
+
+    def stream(
+        self,
+        subscription: Subscription,
+        last_event_id: int | None = None,
+        heartbeat: float = 15.0,
+        max_seconds: float = 300.0,
+    ) -> Iterator[str]:
+        """Yield Server-Sent Events messages for one client.
+
+        Events after ``last_event_id`` are replayed from the buffer first; if
+        some of them are gone, a ``reset`` event tells the client to reload the
+        graph. A comment line is sent when nothing happened for ``heartbeat``
+        seconds, which keeps proxies from closing the connection. The stream
+        ends after ``max_seconds`` so that clients reconnect (resuming from
+        their last event) and the worker thread is freed.
+
+        Args:
+            subscription: Slot taken by ``subscribe``; closed when the stream ends
+            last_event_id: Id of the last event the client received, if any
+            heartbeat: Seconds between heartbeats on an idle stream
+            max_seconds: Lifetime of the stream
+
+        Yields:
+            str: SSE messages
+
+        """
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            cursor = self.bus.last_id if last_event_id is None else last_event_id
+            deadline = time.monotonic() + max_seconds
+            while (remaining := deadline - time.monotonic()) > 0:
+                events = self.bus.wait(cursor, min(heartbeat, remaining))
+                if events is None:
+                    cursor = self.bus.last_id
+                    yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+                elif events:
+                    cursor = events[-1].id
+                    yield "".join(event.frame for event in events)
+                else:
+                    yield ": heartbeat\n\n"
+        finally:
+            subscription.close()
+
+
+def publish(kind: str, record: dict) -> int | None:
+    """Publish a graph update from the current app; never fails the caller.
+
+    Must be called after the change is committed. Errors are logged, since
+    the write itself has already succeeded.
+
+    Args:
+        kind: Event type (``node``, ``edge``, ``score``)
+        record: JSON-serializable payload
+
+    Returns:
+        int: Id of the new event, or None if publishing failed
+
+    """
+    channel: EventChannel | None = current_app.extensions.get("events")
+    if channel is None:
+        return None
+    try:
+        return channel.publish(kind, record)
+    except Exception:
+        current_app.logger.exception("Publishing a %s event failed", kind)
+        return None
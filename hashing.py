@@ -0,0 +1,156 @@
+"""Executor-backed password hashing.
+
+Runs CPU-bound password hashing in a bounded thread or process pool so login
+bursts cannot occupy every request worker. When the pool and its queue are
+full, new requests are rejected immediately instead of piling up, and a
+request whose hash is not done within the timeout is rejected the same way.
+"""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the hashing pool has no free slot or does not answer in time."""
+
+
+class PasswordHasher:
+    """Bounded executor for password hashing.
+
+    At most ``workers + queue_size`` hashes are in flight; the executor is
+    created lazily so that pre-forking servers start it in each worker.
+
+    Attributes:
+        mode: ``"thread"`` or ``"process"``
+        workers: Number of pool workers
+        queue_size: Hashes allowed to wait for a free worker
+        timeout: Seconds to wait for a result
+        rejected: Number of requests rejected because the pool was full
+        timed_out: Number of requests whose hash was not done within ``timeout``
+
+    """
+
+    def __init__(
+        self, mode: str, workers: int, queue_size: int = 0, timeout: float = 10.0,
+    ) -> None:
+        """Create a hasher; the pool itself is started on first use.
+
+        Args:
+            mode: ``"thread"`` or ``"process"``
+            workers: Number of pool workers
+            queue_size: Hashes allowed to wait for a free worker
+            timeout: Seconds to wait for a result
+
+        Raises:
+            ValueError: If ``mode`` is not supported
+
+        """
+        if mode not in {"thread", "process"}:
+            msg = f"Unknown hashing executor {mode!r}; expected 'thread' or 'process'"
+            raise ValueError(msg)
+        self.mode = mode
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.rejected = 0
+        self.timed_out = 0
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        """Start the pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "thread":
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:  # noqa: ANN401
+        """Schedule a call in the pool, or fail fast if it is full.
+
+        Args:
+            func: Picklable callable (for the process pool)
+            *args: Arguments passed to ``func``
+
+        Returns:
+            Future: Future of the call
+
+        Raises:
+            HashingBusyError: If all worker and queue slots are taken
+
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            msg = "Password hashing pool is full"
+            raise HashingBusyError(msg)
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def _result(self, future: Future) -> Any:  # noqa: ANN401 - result of the submitted call
+        """Wait for a pooled call, giving up after ``timeout`` seconds.
+
+        Raises:
+            HashingBusyError: If the call is not done in time
+
+        """
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drop the hash if it is still queued; a running one finishes unobserved
+            future.cancel()
+            self.timed_out += 1
+            msg = "Password hashing timed out"
+            raise HashingBusyError(msg) from None
+
+    def generate(self, password: str, method: str, salt_length: int) -> str:
+        """Hash a password in the pool.
+
+        Args:
+            password: Plain text password
+            method: Werkzeug hash method
+            salt_length: Salt length in characters
+
+        Returns:
+            str: Password hash
+
+        Raises:
+            HashingBusyError: If the pool is full or the hash takes longer than ``timeout``
+
+        """
+        return self._result(self.submit(generate_password_hash, password, method, salt_length))
+
+    def check(self, pwhash: str, password: str) -> bool:
+        """Verify a password against a hash in the pool.
+
+        Args:
+            pwhash: Stored password hash
+            password: Plain text password
+
+        Returns:
+            bool: True if the password matches
+
+        Raises:
+            HashingBusyError: If the pool is full or the check takes longer than ``timeout``
+
+        """
+        return self._result(self.submit(check_password_hash, pwhash, password))
+
+    def shutdown(self) -> None:
+        """Stop the pool, waiting for running hashes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,5 @@
+"""Importers package for Constellate.
+
+Contains the parsers of bibliography formats (arXiv metadata export, BibTeX,
+CSV) and the bulk import pipeline behind ``constellate import``.
+"""
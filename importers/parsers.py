@@ -0,0 +1,308 @@
+"""Parsers turning bibliography records into article rows.
+
+Each format has a reader, run in the importing process, that splits a file
+into raw records as it streams it, and a parser, run in the worker pool, that
+turns a chunk of raw records into article dicts (``title``, ``url``,
+``summary``, ``tags``) or None for records without a title.
+"""
+
+import csv
+import json
+import re
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, TextIO
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from models.tag import parse_tags
+
+# Column sizes of the articles table
+MAX_TITLE_LENGTH = 200
+MAX_URL_LENGTH = 500
+MAX_TAGS_LENGTH = 500
+
+_WHITESPACE = re.compile(r"\s+")
+_ARXIV_URL = re.compile(
+    r"^(?:https?://)?(?:www\.|export\.)?arxiv\.org/(?:abs|pdf)/(?P<id>.+?)(?:v\d+)?(?:\.pdf)?/?$",
+    re.IGNORECASE,
+)
+_DOI_URL = re.compile(
+    r"^(?:doi:\s*|(?:https?://)?(?:dx\.)?doi\.org/)?(?P<doi>10\.\d+/\S+)$", re.IGNORECASE,
+)
+_BIBTEX_FIELD = re.compile(r"\s*,?\s*(?P<name>[A-Za-z][\w-]*)\s*=\s*")
+
+
+def clean_text(value: str | None) -> str | None:
+    """Collapse whitespace; return None for empty values."""
+    if value is None:
+        return None
+    text = _WHITESPACE.sub(" ", value).strip()
+    return text or None
+
+
+def normalize_url(url: str | None) -> str | None:
+    """Normalize an article URL so that duplicates compare equal.
+
+    arXiv abstract and PDF links (any version) map to the abstract page and
+    DOIs (bare or as links) to ``https://doi.org/``; other URLs get an https scheme, a lowercase
+    host without ``www.``, no fragment, tracking parameters or trailing slash.
+
+    Args:
+        url: URL as found in the input (may be None)
+
+    Returns:
+        str: Normalized URL, or None if empty or longer than the url column
+
+    """
+    url = (url or "").strip()
+    if not url:
+        return None
+    if match := _ARXIV_URL.match(url):
+        return f"https://arxiv.org/abs/{match['id']}"
+    if match := _DOI_URL.match(url):
+        return f"https://doi.org/{match['doi'].lower()}"
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    scheme = "https" if parts.scheme.lower() in {"http", "https"} else parts.scheme.lower()
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    ])
+    normalized = urlunsplit((scheme, host, parts.path.rstrip("/"), query, ""))
+    return normalized if len(normalized) <= MAX_URL_LENGTH else None
+
+
+def make_article(
+    title: str | None, url: str | None, summary: str | None, tags: list[str],
+) -> dict[str, Any] | None:
+    """Build an article row from cleaned-up fields.
+
+    Args:
+        title: Title (required)
+        url: Raw URL
+        summary: Abstract
+        tags: Raw tag names
+
+    Returns:
+        dict: Row for the articles table, or None without a title
+
+    """
+    title = clean_text(title)
+    if not title:
+        return None
+    names = parse_tags(",".join(tags))
+    joined = ""
+    for name in names:
+        candidate = f"{joined},{name}" if joined else name
+        if len(candidate) > MAX_TAGS_LENGTH:
+            break
+        joined = candidate
+    return {
+        "title": title[:MAX_TITLE_LENGTH],
+        "url": normalize_url(url),
+        "summary": clean_text(summary),
+        "tags": joined or None,
+    }
+
+
+# arXiv metadata export (one JSON object per line)
+
+
+def read_arxiv(stream: TextIO) -> Iterator[str]:
+    """Yield the non-empty lines of an arXiv metadata snapshot."""
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def parse_arxiv(lines: list[str]) -> list[dict[str, Any] | None]:
+    """Parse arXiv metadata records (``id``, ``title``, ``abstract``, ``categories``).
+
+    Args:
+        lines: JSON lines
+
+    Returns:
+        list: Article rows (None for malformed records)
+
+    """
+    articles = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            articles.append(None)
+            continue
+        arxiv_id = record.get("id")
+        articles.append(
+            make_article(
+                record.get("title"),
+                f"https://arxiv.org/abs/{arxiv_id}" if arxiv_id else record.get("doi"),
+                record.get("abstract"),
+                (record.get("categories") or "").split(),
+            ),
+        )
+    return articles
+
+
+# BibTeX
+
+
+def read_bibtex(stream: TextIO) -> Iterator[str]:
+    """Yield the text of each BibTeX entry (an entry starts with a line beginning ``@``)."""
+    entry: list[str] = []
+    for line in stream:
+        if line.lstrip().startswith("@") and entry:
+            yield "".join(entry)
+            entry = []
+        if entry or line.lstrip().startswith("@"):
+            entry.append(line)
+    if entry:
+        yield "".join(entry)
+
+
+def _bibtex_value(text: str, start: int) -> tuple[str, int]:
+    """Read a braced, quoted or bare field value; return it and the position after it."""
+    opener = text[start : start + 1]
+    if opener in {"{", '"'}:
+        depth = 0
+        for index in range(start, len(text)):
+            char = text[index]
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+            if index > start and depth == 0 and char == ("}" if opener == "{" else '"'):
+                return text[start + 1 : index], index + 1
+        return text[start + 1 :], len(text)
+    end = start
+    while end < len(text) and text[end] not in ",}\n":
+        end += 1
+    return text[start:end].strip(), end
+
+
+def parse_bibtex_fields(entry: str) -> dict[str, str]:
+    """Parse the fields of one BibTeX entry into a lowercase-keyed dict.
+
+    Args:
+        entry: Entry text (``@type{key, name = value, ...}``)
+
+    Returns:
+        dict: Field values with TeX grouping braces removed (empty for
+            ``@comment``, ``@string`` and ``@preamble`` entries)
+
+    """
+    kind = entry.lstrip()[1:].split("{", 1)[0].strip().lower()
+    if kind in {"comment", "string", "preamble"} or "{" not in entry:
+        return {}
+    body = entry.split("{", 1)[1]
+    # Skip the citation key
+    position = body.find(",")
+    fields: dict[str, str] = {}
+    while position != -1 and (match := _BIBTEX_FIELD.match(body, position)):
+        value, position = _bibtex_value(body, match.end())
+        fields[match["name"].lower()] = value.replace("{", "").replace("}", "")
+    return fields
+
+
+def parse_bibtex(entries: list[str]) -> list[dict[str, Any] | None]:
+    """Parse BibTeX entries (``title``, ``url``/``doi``/``eprint``, ``abstract``, ``keywords``).
+
+    Args:
+        entries: Entry texts
+
+    Returns:
+        list: Article rows (None for entries without a title)
+
+    """
+    articles = []
+    for entry in entries:
+        fields = parse_bibtex_fields(entry)
+        url = fields.get("url") or fields.get("doi")
+        if not url and fields.get("eprint") and fields.get("archiveprefix", "").lower() == "arxiv":
+            url = f"https://arxiv.org/abs/{fields['eprint']}"
+        articles.append(
+            make_article(
+                fields.get("title"),
+                url,
+                fields.get("abstract"),
+                re.split(r"[,;]", fields.get("keywords", "")),
+            ),
+        )
+    return articles
+
+
+# CSV (header row with title, url, summary/abstract, tags/keywords)
+
+
+def read_csv(stream: TextIO) -> Iterator[dict[str, str]]:
+    """Yield CSV rows keyed by lowercase column name."""
+    for row in csv.DictReader(stream):
+        yield {(key or "").strip().lower(): value for key, value in row.items()}
+
+
+def parse_csv(rows: list[dict[str, str]]) -> list[dict[str, Any] | None]:
+    """Parse CSV rows.
+
+    Args:
+        rows: Rows keyed by lowercase column name
+
+    Returns:
+        list: Article rows (None for rows without a title)
+
+    """
+    return [
+        make_article(
+            row.get("title"),
+            row.get("url") or row.get("doi"),
+            row.get("summary") or row.get("abstract"),
+            re.split(r"[,;]", row.get("tags") or row.get("keywords") or ""),
+        )
+        for row in rows
+    ]
+
+
+# Registry of formats by name: (reader, parser)
+FORMATS: dict[str, tuple[Callable[[TextIO], Iterator[Any]], Callable[[list], list]]] = {
+    "arxiv": (read_arxiv, parse_arxiv),
+    "bibtex": (read_bibtex, parse_bibtex),
+    "csv": (read_csv, parse_csv),
+}
+
+# Format guessed from the file extension
+EXTENSIONS = {".json": "arxiv", ".jsonl": "arxiv", ".bib": "bibtex", ".csv": "csv"}
+
+
+def detect_format(path: str | Path) -> str:
+    """Guess the format of an input file from its extension.
+
+    Args:
+        path: Input file
+
+    Returns:
+        str: Registered format name
+
+    Raises:
+        ValueError: If the extension is not known
+
+    """
+    suffix = Path(path).suffix.lower()
+    try:
+        return EXTENSIONS[suffix]
+    except KeyError:
+        msg = f"Cannot tell the format of {path}; pass one of: {', '.join(sorted(FORMATS))}"
+        raise ValueError(msg) from None
+
+
+def parse_chunk(fmt: str, records: list) -> list[dict[str, Any] | None]:
+    """Parse a chunk of raw records (run in the worker pool).
+
+    Args:
+        fmt: Registered format name
+        records: Raw records produced by the format's reader
+
+    Returns:
+        list: Article rows, None for invalid records
+
+    """
+    return FORMATS[fmt][1](records)
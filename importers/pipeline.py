@@ -0,0 +1,263 @@
+"""Bulk article import.
+
+Input files are streamed in chunks of raw records, parsed in a process pool
+and inserted with Core ``INSERT`` batches, one transaction per chunk. The
+statements are executed with a list of parameter sets, which SQLAlchemy
+renders as multi-row ``VALUES`` from one cached compilation. The
+per-article ORM hooks (tag index, edges, job queue) are bypassed; tag links
+and edges are built in bulk once all articles are in.
+"""
+
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from flask import current_app
+
+from database import db
+from importers.parsers import FORMATS, detect_format, normalize_url, parse_chunk
+from models.article import Article
+from models.edge import rebuild_edges
+from models.job import PROCESS_ARTICLE, QUEUED, Job, utcnow
+from models.tag import Tag, article_tags, parse_tags
+
+
+class ImportStats:
+    """Counters of an import run.
+
+    Attributes:
+        read: Records read from the input files
+        inserted: Articles inserted
+        duplicates: Records skipped because their normalized URL already exists
+        invalid: Records skipped because they have no title or could not be parsed
+        tag_links: Article-tag rows inserted
+        edges: Edges in the graph after the import
+        started: ``time.perf_counter()`` at the start of the import
+
+    """
+
+    def __init__(self) -> None:
+        """Start counting."""
+        self.read = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.tag_links = 0
+        self.edges = 0
+        self.started = time.perf_counter()
+
+    @property
+    def seconds(self) -> float:
+        """Seconds since the import started."""
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Records processed per second."""
+        return self.read / max(self.seconds, 1e-9)
+
+
+def read_chunks(path: str | Path, fmt: str, chunk_size: int) -> Iterator[list]:
+    """Stream a file as chunks of raw records.
+
+    Args:
+        path: Input file
+        fmt: Registered format name
+        chunk_size: Records per chunk
+
+    Yields:
+        list: Raw records for ``parse_chunk``
+
+    """
+    reader = FORMATS[fmt][0]
+    with Path(path).open(encoding="utf-8", newline="") as stream:
+        records = reader(stream)
+        while chunk := list(islice(records, chunk_size)):
+            yield chunk
+
+
+def _parsed_chunks(
+    chunks: Iterable[tuple[str, list]], processes: int,
+) -> Iterator[tuple[int, list]]:
+    """Parse chunks in a process pool, in order, with a bounded number in flight.
+
+    Yields:
+        tuple: Number of raw records and their parsed rows
+
+    """
+    if processes < 1:
+        for fmt, chunk in chunks:
+            yield len(chunk), parse_chunk(fmt, chunk)
+        return
+    pending: deque[tuple[int, Future]] = deque()
+    with ProcessPoolExecutor(processes, mp_context=get_context("spawn")) as pool:
+        for fmt, chunk in chunks:
+            pending.append((len(chunk), pool.submit(parse_chunk, fmt, chunk)))
+            if len(pending) >= 2 * processes:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+
+
+def existing_urls() -> set[str]:
+    """Return the normalized URLs of the articles already stored."""
+    return {
+        normalized
+        for (url,) in db.session.execute(db.select(Article.url).where(Article.url.isnot(None)))
+        if (normalized := normalize_url(url))
+    }
+
+
+def _insert_chunk(
+    rows: list[dict[str, Any] | None],
+    user_id: int,
+    seen: set[str],
+    stats: ImportStats,
+    *,
+    enqueue: bool,
+) -> list[tuple[int, str | None]]:
+    """Insert the new articles of a parsed chunk in one transaction.
+
+    Returns:
+        list: (id, tags) of the inserted articles
+
+    """
+    values = []
+    for row in rows:
+        if row is None:
+            stats.invalid += 1
+            continue
+        if row["url"]:
+            if row["url"] in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(row["url"])
+        values.append({**row, "user_id": user_id})
+    if not values:
+        return []
+    articles = Article.__table__
+    inserted = db.session.execute(
+        articles.insert().returning(articles.c.id, articles.c.tags), values,
+    ).all()
+    if enqueue:
+        db.session.execute(
+            Job.__table__.insert(),
+            [
+                {
+                    "kind": PROCESS_ARTICLE,
+                    "article_id": article_id,
+                    "status": QUEUED,
+                    "attempts": 0,
+                    "max_attempts": current_app.config["JOB_MAX_ATTEMPTS"],
+                    "run_after": utcnow(),
+                }
+                for article_id, _tags in inserted
+            ],
+        )
+    db.session.commit()
+    stats.inserted += len(inserted)
+    return [tuple(row) for row in inserted]
+
+
+def link_tags(tagged: list[tuple[int, str | None]], chunk_size: int = 1000) -> int:
+    """Create the tags of imported articles and link them in bulk.
+
+    Args:
+        tagged: (article id, comma-separated tags) pairs
+        chunk_size: Rows per INSERT (one transaction each)
+
+    Returns:
+        int: Number of article-tag rows inserted
+
+    """
+    names_by_article = [(article_id, parse_tags(tags)) for article_id, tags in tagged if tags]
+    names = sorted({name for _article_id, names in names_by_article for name in names})
+    tag_ids: dict[str, int] = {}
+    for start in range(0, len(names), chunk_size):
+        batch = names[start : start + chunk_size]
+        tag_ids.update(
+            (name, tag_id)
+            for tag_id, name in db.session.execute(
+                db.select(Tag.id, Tag.name).where(Tag.name.in_(batch)),
+            )
+        )
+        missing = [{"name": name} for name in batch if name not in tag_ids]
+        if missing:
+            tags = Tag.__table__
+            tag_ids.update(
+                (name, tag_id)
+                for tag_id, name in db.session.execute(
+                    tags.insert().returning(tags.c.id, tags.c.name), missing,
+                )
+            )
+        db.session.commit()
+    links = [
+        {"article_id": article_id, "tag_id": tag_ids[name]}
+        for article_id, names in names_by_article
+        for name in names
+    ]
+    for start in range(0, len(links), chunk_size):
+        db.session.execute(article_tags.insert(), links[start : start + chunk_size])
+        db.session.commit()
+    return len(links)
+
+
+def import_articles(  # noqa: PLR0913 - import options
+    paths: Iterable[str | Path],
+    user_id: int,
+    fmt: str | None = None,
+    chunk_size: int = 1000,
+    processes: int = 0,
+    *,
+    enqueue: bool = False,
+    progress: Callable[[ImportStats], None] | None = None,
+) -> ImportStats:
+    """Import articles from bibliography files.
+
+    Must be called inside an application context.
+
+    Args:
+        paths: Input files
+        user_id: User recorded as the submitter of every article
+        fmt: Format name (default: detected from each file's extension)
+        chunk_size: Records per parse task, INSERT and transaction
+        processes: Parser processes (0 parses in this process)
+        enqueue: Queue a ``process_article`` job for every imported article
+        progress: Called with the running counters after every chunk
+
+    Returns:
+        ImportStats: Final counters
+
+    Raises:
+        ValueError: If a file's format is unknown
+
+    """
+    stats = ImportStats()
+    formats = [(path, fmt or detect_format(path)) for path in paths]
+    for _path, name in formats:
+        if name not in FORMATS:
+            msg = f"Unknown import format {name!r}; available: {', '.join(sorted(FORMATS))}"
+            raise ValueError(msg)
+    chunks = (
+        (name, chunk) for path, name in formats for chunk in read_chunks(path, name, chunk_size)
+    )
+    seen = existing_urls()
+    tagged: list[tuple[int, str | None]] = []
+    for count, rows in _parsed_chunks(chunks, processes):
+        stats.read += count
+        tagged.extend(_insert_chunk(rows, user_id, seen, stats, enqueue=enqueue))
+        if progress is not None:
+            progress(stats)
+    stats.tag_links = link_tags(tagged, chunk_size)
+    if stats.tag_links:
+        stats.edges = rebuild_edges()
+    if progress is not None:
+        progress(stats)
+    return stats
@@ -0,0 +1,5 @@
+"""Jobs package for Constellate.
+
+Contains the SQLite-backed job queue, job handlers and the worker pool that
+runs PDF extraction and summarization off the request path.
+"""
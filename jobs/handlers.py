@@ -0,0 +1,146 @@
+"""Job handlers run by background workers.
+
+Handlers are registered by job kind and receive the claimed Job inside an
+application context. Raising an exception marks the attempt as failed.
+"""
+
+from collections.abc import Callable
+
+from flask import current_app
+
+from jobs.summarizers import get_summarizer
+from models.article import Article
+from models.blob import collect_blobs
+from models.extraction import article_pdf_text
+from models.job import COLLECT_BLOBS, PROCESS_ARTICLE, RECONCILE_VOTES, REFRESH_TRENDING, Job
+from models.vote import reconcile_scores, refresh_trending
+from similarity.service import embed_articles
+
+# Registry of job handlers by kind
+HANDLERS: dict[str, Callable[[Job], None]] = {}
+
+
+def handler(kind: str) -> Callable[[Callable[[Job], None]], Callable[[Job], None]]:
+    """Register a function as the handler of a job kind.
+
+    Args:
+        kind: Job kind handled by the decorated function
+
+    Returns:
+        Callable: Decorator registering the function
+
+    """
+
+    def decorator(func: Callable[[Job], None]) -> Callable[[Job], None]:
+        HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+def summarize_articles(articles: list[Article]) -> list[Article]:
+    """Summarize articles from their PDF text (or title and tags) in one batch.
+
+    Existing summaries are not part of the input, so summarizing an unchanged
+    article again sends the same text. The summaries are assigned to the
+    articles and marked as generated; the caller commits (and re-embeds the
+    changed articles).
+
+    Args:
+        articles: Articles to (re)summarize
+
+    Returns:
+        list: Articles whose summary changed
+
+    """
+    texts = []
+    for article in articles:
+        extracted = article_pdf_text(article, "summarize")
+        if extracted is not None:
+            texts.append(extracted.text)
+        else:
+            texts.append("\n".join(part for part in (article.title, article.tags) if part))
+    summarizer = get_summarizer(current_app.config["SUMMARIZER"])
+    changed = []
+    for article, summary in zip(articles, summarizer.summarize_batch(texts), strict=True):
+        if (summary or None) != article.summary:
+            changed.append(article)
+        article.summary = summary or None
+        article.summary_generated = article.summary is not None
+    return changed
+
+
+@handler(PROCESS_ARTICLE)
+def process_article(job: Job) -> None:
+    """Summarize (from the PDF when available) and embed a submitted article.
+
+    Args:
+        job: Claimed job referencing the article
+
+    """
+    article = job.article
+    if article is None:
+        return
+    if not article.summary:
+        summarize_articles([article])
+    # embed_articles commits the summary together with the embedding
+    embed_articles([article])
+
+
+@handler(RECONCILE_VOTES)
+def reconcile_votes(job: Job) -> None:  # noqa: ARG001 - periodic job without arguments
+    """Repair article scores that drifted from their votes.
+
+    Args:
+        job: Claimed periodic job
+
+    """
+    repaired = reconcile_scores(current_app.config["VOTE_RECONCILE_BATCH_SIZE"])
+    if repaired:
+        current_app.logger.warning("Repaired the score of %d articles", repaired)
+
+
+@handler(REFRESH_TRENDING)
+def refresh_trending_scores(job: Job) -> None:  # noqa: ARG001 - periodic job without arguments
+    """Recompute the time-decayed trending scores.
+
+    Args:
+        job: Claimed periodic job
+
+    """
+    refresh_trending(current_app.config["TRENDING_HALF_LIFE_HOURS"])
+
+
+@handler(COLLECT_BLOBS)
+def collect_unreferenced_blobs(job: Job) -> None:  # noqa: ARG001 - periodic job without arguments
+    """Delete stored PDFs that no article references any more.
+
+    Args:
+        job: Claimed periodic job
+
+    """
+    removed = collect_blobs(
+        current_app.extensions["blobs"],
+        current_app.config["BLOB_GC_GRACE_SECONDS"],
+        texts=current_app.extensions["texts"],
+    )
+    if removed:
+        current_app.logger.info("Collected %d unreferenced blobs", removed)
+
+
+def run(job: Job) -> None:
+    """Run the handler registered for a job's kind.
+
+    Args:
+        job: Claimed job
+
+    Raises:
+        KeyError: If no handler is registered for the job's kind
+
+    """
+    try:
+        func = HANDLERS[job.kind]
+    except KeyError:
+        msg = f"No handler registered for job kind {job.kind!r}"
+        raise KeyError(msg) from None
+    func(job)
@@ -0,0 +1,172 @@
+"""SQLite-backed job queue operations.
+
+Jobs are claimed with a compare-and-swap UPDATE, so any number of worker
+processes can poll the same table without double-running a job.
+"""
+
+import json
+from datetime import timedelta
+
+from flask import current_app
+
+from database import db
+from models.job import DONE, FAILED, QUEUED, RUNNING, Job, utcnow
+
+
+def enqueue(kind: str, article_id: int | None = None, payload: dict | None = None) -> Job:
+    """Add a job to the queue and commit it.
+
+    Args:
+        kind: Name of the registered handler
+        article_id: Article the job works on
+        payload: Optional JSON-serializable handler arguments
+
+    Returns:
+        Job: The queued job
+
+    """
+    job = Job(
+        kind=kind,
+        article_id=article_id,
+        payload=json.dumps(payload) if payload is not None else None,
+        status=QUEUED,
+        max_attempts=current_app.config["JOB_MAX_ATTEMPTS"],
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def claim(worker_id: str) -> Job | None:
+    """Claim the next due job for a worker.
+
+    Args:
+        worker_id: Identifier recorded in ``Job.locked_by``
+
+    Returns:
+        Job: The claimed job (status running), or None if nothing is due
+
+    """
+    while True:
+        now = utcnow()
+        job_id = db.session.execute(
+            db.select(Job.id)
+            .where(Job.status == QUEUED, Job.run_after <= now)
+            .order_by(Job.run_after, Job.id)
+            .limit(1),
+        ).scalar()
+        if job_id is None:
+            db.session.commit()
+            return None
+        claimed = db.session.execute(
+            db.update(Job)
+            .where(Job.id == job_id, Job.status == QUEUED)
+            .values(
+                status=RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_at=now,
+            ),
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id, populate_existing=True)
+        # Another worker won the race for this job; try the next one
+
+
+def complete(job: Job) -> None:
+    """Mark a claimed job as done.
+
+    Args:
+        job: Job returned by ``claim``
+
+    """
+    job.status = DONE
+    job.last_error = None
+    job.locked_by = None
+    db.session.commit()
+
+
+def fail(job: Job, error: str) -> None:
+    """Record a failed attempt, scheduling a retry with exponential backoff.
+
+    The n-th retry waits ``JOB_BACKOFF_SECONDS * 2 ** (n - 1)``; once
+    ``max_attempts`` is reached the job is marked failed.
+
+    Args:
+        job: Job returned by ``claim``
+        error: Error message to record
+
+    """
+    job.last_error = error
+    job.locked_by = None
+    if job.attempts >= job.max_attempts:
+        job.status = FAILED
+    else:
+        delay = current_app.config["JOB_BACKOFF_SECONDS"] * 2 ** (job.attempts - 1)
+        job.status = QUEUED
+        job.run_after = utcnow() + timedelta(seconds=delay)
+    db.session.commit()
+
+
+def schedule_periodic(intervals: dict[str, float]) -> int:
+    """Queue the next run of each periodic job kind that has none pending.
+
+    The check and the insert are a single ``INSERT ... SELECT ... WHERE NOT
+    EXISTS``, so workers calling this concurrently queue one job per kind.
+
+    Args:
+        intervals: Seconds between runs by job kind; kinds with 0 are skipped
+
+    Returns:
+        int: Number of jobs queued
+
+    """
+    count = 0
+    for kind, seconds in intervals.items():
+        if not seconds:
+            continue
+        pending = (
+            db.select(Job.id).where(Job.kind == kind, Job.status.in_((QUEUED, RUNNING))).exists()
+        )
+        rows = db.select(
+            db.literal(kind),
+            db.literal(QUEUED),
+            db.literal(0),
+            db.literal(current_app.config["JOB_MAX_ATTEMPTS"]),
+            db.literal(utcnow() + timedelta(seconds=seconds), db.DateTime),
+        ).where(~pending)
+        count += db.session.execute(
+            db.insert(Job).from_select(
+                ["kind", "status", "attempts", "max_attempts", "run_after"], rows,
+            ),
+        ).rowcount
+    db.session.commit()
+    return count
+
+
+def requeue_stale(timeout_seconds: float) -> int:
+    """Return jobs stuck in running (e.g. after a worker crash) to the queue.
+
+    Jobs that already used all their attempts are marked failed instead, so a
+    job that crashes its worker cannot loop forever.
+
+    Args:
+        timeout_seconds: Running jobs claimed longer ago than this are requeued
+
+    Returns:
+        int: Number of jobs requeued
+
+    """
+    cutoff = utcnow() - timedelta(seconds=timeout_seconds)
+    stale = (Job.status == RUNNING) & (Job.locked_at < cutoff)
+    db.session.execute(
+        db.update(Job)
+        .where(stale, Job.attempts >= Job.max_attempts)
+        .values(status=FAILED, locked_by=None, last_error="Worker timed out"),
+    )
+    count = db.session.execute(
+        db.update(Job).where(stale).values(status=QUEUED, locked_by=None, run_after=utcnow()),
+    ).rowcount
+    db.session.commit()
+    return count
@@ -0,0 +1,148 @@
+"""Article summarizers used by background jobs.
+
+Defines the Summarizer interface, a deterministic local fake summarizer, the
+summarizer delegating to the app's LLM agent and the registry used to select
+a summarizer by name.
+"""
+
+import re
+from abc import ABC, abstractmethod
+
+from lazy import lazy_import
+
+agents_service = lazy_import("agents.service")
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class Summarizer(ABC):
+    """Interface for text summarizers.
+
+    Attributes:
+        name: Identifier of the summarizer
+
+    """
+
+    name: str
+
+    @abstractmethod
+    def summarize(self, text: str) -> str:
+        """Summarize a text.
+
+        Args:
+            text: Full article text
+
+        Returns:
+            str: Summary
+
+        """
+
+    def summarize_batch(self, texts: list[str]) -> list[str]:
+        """Summarize several texts (one at a time unless overridden).
+
+        Args:
+            texts: Full article texts
+
+        Returns:
+            list: One summary per text
+
+        """
+        return [self.summarize(text) for text in texts]
+
+
+class FakeSummarizer(Summarizer):
+    """Deterministic summarizer returning the leading sentences of the text.
+
+    Needs no model, so it is used for tests and as the default local summarizer.
+    """
+
+    name = "fake"
+
+    def __init__(self, sentences: int = 3, max_chars: int = 1000) -> None:
+        """Create a fake summarizer.
+
+        Args:
+            sentences: Number of leading sentences kept
+            max_chars: Maximum summary length
+
+        """
+        self.sentences = sentences
+        self.max_chars = max_chars
+
+    def summarize(self, text: str) -> str:
+        """Return the first sentences of the whitespace-normalized text.
+
+        Args:
+            text: Full article text
+
+        Returns:
+            str: Summary
+
+        """
+        text = " ".join(text.split())
+        return " ".join(_SENTENCE_RE.split(text)[: self.sentences])[: self.max_chars]
+
+
+class AgentSummarizer(Summarizer):
+    """Summarizer delegating to the app's agent (see ``agents.service``).
+
+    Calls from concurrent threads are batched and summaries of texts already
+    seen by the same model and prompt come from the response cache.
+    """
+
+    name = "agent"
+
+    def __init__(self) -> None:
+        """Bind the summarizer to the current app's agent."""
+        self.agent = agents_service.get_app_agent()
+
+    def summarize(self, text: str) -> str:
+        """Summarize a text with the agent.
+
+        Args:
+            text: Full article text
+
+        Returns:
+            str: Summary
+
+        """
+        return self.agent.summarize([text])[0]
+
+    def summarize_batch(self, texts: list[str]) -> list[str]:
+        """Summarize texts with one agent call.
+
+        Args:
+            texts: Full article texts
+
+        Returns:
+            list: One summary per text
+
+        """
+        return self.agent.summarize(texts)
+
+
+# Registry of available summarizers by name
+SUMMARIZERS: dict[str, type[Summarizer]] = {
+    FakeSummarizer.name: FakeSummarizer,
+    AgentSummarizer.name: AgentSummarizer,
+}
+
+
+def get_summarizer(name: str) -> Summarizer:
+    """Instantiate a registered summarizer.
+
+    Args:
+        name: Registered summarizer name
+
+    Returns:
+        Summarizer: New summarizer instance
+
+    Raises:
+        KeyError: If no summarizer is registered under ``name``
+
+    """
+    try:
+        return SUMMARIZERS[name]()
+    except KeyError:
+        msg = f"Unknown summarizer {name!r}; available: {', '.join(sorted(SUMMARIZERS))}"
+        raise KeyError(msg) from None
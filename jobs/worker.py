@@ -0,0 +1,112 @@
+"""Background worker processes for the job queue.
+
+Each worker process builds its own Flask app (and database engine) and polls
+the queue table; ``run_pool`` supervises a pool of them.
+"""
+
+import multiprocessing
+import os
+import socket
+import threading
+from collections.abc import Callable
+
+from flask import Flask, current_app
+
+from database import db
+from jobs.handlers import run
+from jobs.queue import claim, complete, fail, requeue_stale, schedule_periodic
+from models.job import Job
+
+
+def work_once(worker_id: str) -> bool:
+    """Claim and run a single due job.
+
+    Args:
+        worker_id: Identifier recorded on the claimed job
+
+    Returns:
+        bool: True if a job was run (successfully or not), False if none was due
+
+    """
+    job = claim(worker_id)
+    if job is None:
+        return False
+    try:
+        run(job)
+    except Exception as exc:
+        current_app.logger.exception("Job %s (%s) failed", job.id, job.kind)
+        db.session.rollback()
+        fail(db.session.get(Job, job.id), f"{type(exc).__name__}: {exc}")
+    else:
+        complete(job)
+    return True
+
+
+def work(
+    worker_id: str, *, burst: bool = False, stop: threading.Event | None = None,
+) -> int:
+    """Process jobs until stopped.
+
+    Must be called inside an application context. Periodic jobs are queued
+    on start and whenever the queue runs dry.
+
+    Args:
+        worker_id: Identifier recorded on claimed jobs
+        burst: Return as soon as no job is due instead of polling
+        stop: Event that ends the loop when set
+
+    Returns:
+        int: Number of jobs run
+
+    """
+    config = current_app.config
+    requeue_stale(config["JOB_STALE_SECONDS"])
+    schedule_periodic(config["PERIODIC_JOBS"])
+    stop = stop or threading.Event()
+    count = 0
+    while not stop.is_set():
+        if work_once(worker_id):
+            count += 1
+        elif burst:
+            break
+        else:
+            schedule_periodic(config["PERIODIC_JOBS"])
+            stop.wait(config["JOB_POLL_INTERVAL"])
+    return count
+
+
+def _worker_main(
+    app_factory: Callable[[], Flask], index: int, stop: threading.Event, *, burst: bool,
+) -> None:
+    """Entry point of a worker process."""
+    app = app_factory()
+    with app.app_context():
+        work(f"{socket.gethostname()}:{os.getpid()}:{index}", burst=burst, stop=stop)
+
+
+def run_pool(app_factory: Callable[[], Flask], processes: int, *, burst: bool = False) -> None:
+    """Run a pool of worker processes until they finish or are interrupted.
+
+    Args:
+        app_factory: Picklable callable returning the Flask app (e.g. ``create_app``)
+        processes: Number of worker processes
+        burst: Let workers exit once the queue has no due jobs
+
+    """
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    workers = [
+        context.Process(
+            target=_worker_main, args=(app_factory, index, stop), kwargs={"burst": burst},
+        )
+        for index in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,41 @@
+"""Deferred module imports.
+
+Optional and heavy subsystems (NumPy-based similarity search, the worker
+pool, the production server, LLM agents) are bound to module names at import
+time but only executed on first attribute access, so CLI invocations, tests
+and web workers that never use them do not pay their import cost.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return a module that is imported on first attribute access.
+
+    Already imported modules are returned as they are. Missing modules still
+    fail immediately (the module is located eagerly, only executed lazily).
+
+    Args:
+        name: Absolute module name, e.g. ``"similarity.service"``
+
+    Returns:
+        ModuleType: The (possibly not yet executed) module
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found
+
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        msg = f"No module named {name!r}"
+        raise ModuleNotFoundError(msg, name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
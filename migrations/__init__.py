@@ -0,0 +1,5 @@
+"""Migrations package for Constellate.
+
+Contains the versioned schema migrations, their runner and the startup check
+that refuses to serve a database whose schema version does not match the code.
+"""
@@ -0,0 +1,146 @@
+"""Building blocks for schema migrations.
+
+Migrations are functions registered with a version number. They must be
+idempotent (a fresh database already has the current schema, and an
+interrupted migration is re-run from the start), and long data changes
+commit in batches so the database is never locked for the whole migration.
+"""
+
+import time
+from collections.abc import Callable
+
+from sqlalchemy import Column, Table, inspect, text, update
+from sqlalchemy.schema import CreateColumn
+
+from database import db
+
+# Versions applied to the database, one row per migration
+schema_migrations = db.Table(
+    "schema_migrations",
+    db.Column("version", db.Integer, primary_key=True, autoincrement=False),
+    db.Column("description", db.String(200), nullable=False),
+    db.Column("applied_at", db.DateTime, nullable=False, server_default=db.func.now()),
+)
+
+
+class Migration:
+    """A registered schema migration.
+
+    Attributes:
+        version: Position in the upgrade sequence (unique, increasing)
+        description: Short human-readable summary
+        apply: Function performing the migration inside an app context
+
+    """
+
+    def __init__(self, version: int, description: str, apply: Callable[[], None]) -> None:
+        """Create a migration.
+
+        Args:
+            version: Position in the upgrade sequence
+            description: Short human-readable summary
+            apply: Function performing the migration
+
+        """
+        self.version = version
+        self.description = description
+        self.apply = apply
+
+    def __repr__(self) -> str:
+        """String representation of Migration object."""
+        return f"<Migration {self.version} {self.description}>"
+
+
+# Registry of migrations by version
+MIGRATIONS: dict[int, Migration] = {}
+
+
+def migration(version: int, description: str) -> Callable[[Callable[[], None]], Callable[[], None]]:
+    """Register a function as the migration to a schema version.
+
+    Args:
+        version: Schema version reached by the migration
+        description: Short human-readable summary
+
+    Returns:
+        Callable: Decorator registering the function
+
+    Raises:
+        ValueError: If the version is already registered
+
+    """
+
+    def decorator(func: Callable[[], None]) -> Callable[[], None]:
+        if version in MIGRATIONS:
+            msg = f"Migration {version} is already registered"
+            raise ValueError(msg)
+        MIGRATIONS[version] = Migration(version, description, func)
+        return func
+
+    return decorator
+
+
+def add_column(table: Table, name: str) -> bool:
+    """Add a column declared on the model to an existing table.
+
+    ``ALTER TABLE ... ADD COLUMN`` does not rewrite the table, so this is fast
+    even on large tables; NOT NULL columns need a ``server_default`` to be
+    added to a table that has rows.
+
+    Args:
+        table: Model table declaring the column
+        name: Column name
+
+    Returns:
+        bool: True if the column was added, False if it already existed
+
+    """
+    existing = {column["name"] for column in inspect(db.engine).get_columns(table.name)}
+    if name in existing:
+        return False
+    column: Column = table.c[name]
+    dialect = db.engine.dialect
+    ddl = CreateColumn(column).compile(dialect=dialect)
+    table_name = dialect.identifier_preparer.format_table(table)
+    db.session.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {ddl}"))
+    db.session.commit()
+    return True
+
+
+def backfill_in_batches(
+    table: Table,
+    values: dict,
+    where: tuple = (),
+    batch_size: int = 1000,
+    pause: float = 0.0,
+) -> int:
+    """Run an UPDATE over a table in primary-key ranges, committing per range.
+
+    Each batch is a short transaction, so other writers get the database
+    between batches instead of waiting for the whole backfill.
+
+    Args:
+        table: Table with a single integer primary key
+        values: Column values (or SQL expressions) to set
+        where: Extra conditions restricting the updated rows
+        batch_size: Width of each primary-key range
+        pause: Seconds to sleep between batches, to leave room for other writers
+
+    Returns:
+        int: Number of updated rows
+
+    """
+    (key,) = table.primary_key.columns
+    highest = db.session.execute(db.select(db.func.max(key))).scalar() or 0
+    updated = 0
+    for lower in range(0, highest, batch_size):
+        result = db.session.execute(
+            update(table)
+            .where(key > lower, key <= lower + batch_size, *where)
+            .values(values),
+        )
+        db.session.commit()
+        updated += result.rowcount
+        if pause:
+            time.sleep(pause)
+    return updated
@@ -0,0 +1,163 @@
+"""Apply migrations and check the schema version.
+
+The schema version of a database is the highest migration recorded in
+``schema_migrations``. ``upgrade`` applies the pending migrations in order;
+``ensure_schema`` runs at startup, creating the schema of an empty database
+and refusing to continue if an existing one is not at the code's version.
+
+On SQLite the version is also cached in the database header
+(``PRAGMA user_version``), so the startup check of an up-to-date database is
+a single header read instead of inspecting the tables.
+"""
+
+from collections.abc import Callable
+
+from sqlalchemy import inspect, text
+
+import migrations.versions  # noqa: F401 - registers the migrations
+from database import db, init_db
+from migrations.base import MIGRATIONS, Migration, schema_migrations
+
+
+class SchemaMismatchError(RuntimeError):
+    """Raised when the database schema version differs from the code's."""
+
+
+def head() -> int:
+    """Return the schema version the code expects (the latest migration)."""
+    return max(MIGRATIONS, default=0)
+
+
+def current_version() -> int:
+    """Return the schema version of the database (0 if never migrated).
+
+    Returns:
+        int: Highest applied migration version
+
+    """
+    if not inspect(db.engine).has_table(schema_migrations.name):
+        return 0
+    version = db.session.execute(db.select(db.func.max(schema_migrations.c.version))).scalar()
+    db.session.commit()
+    return version or 0
+
+
+def pending(target: int | None = None) -> list[Migration]:
+    """Return the migrations not yet applied, in upgrade order.
+
+    Args:
+        target: Stop at this version (default: the latest)
+
+    Returns:
+        list[Migration]: Migrations to apply
+
+    """
+    current = current_version()
+    target = head() if target is None else target
+    return [MIGRATIONS[v] for v in sorted(MIGRATIONS) if current < v <= target]
+
+
+def cached_version() -> int | None:
+    """Return the schema version cached in the SQLite header.
+
+    Returns:
+        int: Cached version (0 if never set), or None on other backends
+
+    """
+    if db.engine.dialect.name != "sqlite":
+        return None
+    with db.engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def _cache_version(version: int) -> None:
+    """Store the schema version in the SQLite header (no-op on other backends)."""
+    if db.engine.dialect.name == "sqlite":
+        with db.engine.begin() as conn:
+            conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+def stamp(versions: list[int]) -> None:
+    """Record migrations as applied without running them.
+
+    Args:
+        versions: Migration versions to record
+
+    """
+    schema_migrations.create(db.engine, checkfirst=True)
+    if versions:
+        db.session.execute(
+            schema_migrations.insert(),
+            [{"version": v, "description": MIGRATIONS[v].description} for v in versions],
+        )
+    db.session.commit()
+    _cache_version(current_version())
+
+
+def upgrade(
+    target: int | None = None, on_apply: Callable[[Migration], None] | None = None,
+) -> list[Migration]:
+    """Apply the pending migrations in order.
+
+    Each migration is recorded as soon as it finishes, so an interrupted
+    upgrade resumes with the migration that was running.
+
+    Args:
+        target: Stop at this version (default: the latest)
+        on_apply: Called with each migration before it runs (e.g. for progress output)
+
+    Returns:
+        list[Migration]: Applied migrations
+
+    """
+    migrations = pending(target)
+    schema_migrations.create(db.engine, checkfirst=True)
+    for item in migrations:
+        if on_apply is not None:
+            on_apply(item)
+        item.apply()
+        stamp([item.version])
+    return migrations
+
+
+def check_schema() -> None:
+    """Verify the database is at the schema version the code expects.
+
+    Raises:
+        SchemaMismatchError: If the database is behind or ahead of the code
+
+    """
+    current, expected = current_version(), head()
+    if current < expected:
+        msg = (
+            f"Database schema is at version {current} but the code expects {expected}; "
+            "run `constellate upgrade`"
+        )
+        raise SchemaMismatchError(msg)
+    if current > expected:
+        msg = (
+            f"Database schema is at version {current}, newer than the code's {expected}; "
+            "deploy the matching code version"
+        )
+        raise SchemaMismatchError(msg)
+
+
+def ensure_schema() -> None:
+    """Create the schema of an empty database, or check an existing one.
+
+    A database whose cached version matches the code is accepted without
+    further checks. An empty database gets the current schema from the models
+    directly and is stamped with every migration; a database with tables must
+    already be at the code's version.
+
+    Raises:
+        SchemaMismatchError: If an existing database needs an upgrade
+
+    """
+    if cached_version() == head():
+        return
+    if not inspect(db.engine).get_table_names():
+        init_db()
+        stamp(sorted(MIGRATIONS))
+        return
+    check_schema()
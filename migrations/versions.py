@@ -0,0 +1,103 @@
+"""Schema migrations, in upgrade order.
+
+Databases created before the migration subsystem existed are at version 0
+(they have the original ``users`` and ``articles`` tables only); these
+migrations bring them to the current schema. New migrations are appended with
+the next version number.
+"""
+
+from flask import current_app
+
+from database import create_missing_indexes, db
+from migrations.base import add_column, migration
+from models.article import Article, backfill_tags, edge_sync_suspended
+from models.blob import Blob
+from models.edge import rebuild_edges
+from models.event import GraphEvent
+from models.extraction import ExtractionStat
+from models.search import rebuild_search_index
+from models.vote import Vote, reconcile_scores, refresh_trending
+
+
+@migration(1, "Create tables added since the original schema")
+def create_tables() -> None:
+    """Create the tag, edge, embedding and job tables if they are missing."""
+    db.create_all()
+
+
+@migration(2, "Add the article listing indexes")
+def add_article_indexes() -> None:
+    """Add indexes the original tables were created without."""
+    create_missing_indexes()
+
+
+@migration(3, "Populate the normalized tag index from Article.tags")
+def populate_tags() -> None:
+    """Backfill ``article_tags`` in batches (one transaction per batch).
+
+    The edges are left to migration 4, which rebuilds them all once.
+    """
+    with edge_sync_suspended():
+        backfill_tags(batch_size=current_app.config["MIGRATION_BATCH_SIZE"])
+
+
+@migration(4, "Compute the shared-tag edges")
+def compute_edges() -> None:
+    """Fill ``article_edges`` from the backfilled tags, in batches."""
+    rebuild_edges(batch_size=current_app.config["MIGRATION_BATCH_SIZE"])
+
+
+@migration(5, "Index articles for full-text search")
+def index_search() -> None:
+    """Create the FTS5 table and triggers and index existing articles.
+
+    Not batched (see ``rebuild_search_index``): writers wait for the indexing.
+    """
+    if db.engine.dialect.name == "sqlite":
+        rebuild_search_index()
+
+
+@migration(6, "Add votes and the denormalized article score")
+def add_votes() -> None:
+    """Create the votes table, add ``articles.score`` and fill it from the votes."""
+    Vote.__table__.create(db.engine, checkfirst=True)
+    add_column(Article.__table__, "score")
+    reconcile_scores(batch_size=current_app.config["MIGRATION_BATCH_SIZE"])
+
+
+@migration(7, "Add the trending article score")
+def add_trending() -> None:
+    """Add ``articles.trending`` with its index and compute it from the votes."""
+    add_column(Article.__table__, "trending")
+    create_missing_indexes()
+    refresh_trending(current_app.config["TRENDING_HALF_LIFE_HOURS"])
+
+
+@migration(8, "Add the graph event table of the database event broker")
+def add_graph_events() -> None:
+    """Create the ``graph_events`` table if it is missing."""
+    GraphEvent.__table__.create(db.engine, checkfirst=True)
+
+
+@migration(9, "Add the blob store table and Article.pdf_hash")
+def add_blobs() -> None:
+    """Create the ``blobs`` table and add ``articles.pdf_hash`` with its index."""
+    Blob.__table__.create(db.engine, checkfirst=True)
+    add_column(Article.__table__, "pdf_hash")
+    create_missing_indexes()
+
+
+@migration(10, "Add the PDF text cache statistics table")
+def add_extraction_stats() -> None:
+    """Create the ``extraction_stats`` table if it is missing."""
+    ExtractionStat.__table__.create(db.engine, checkfirst=True)
+
+
+@migration(11, "Add Article.summary_generated")
+def add_summary_provenance() -> None:
+    """Add ``articles.summary_generated``.
+
+    Existing summaries count as written by people, so ``summarize --all``
+    never replaces them.
+    """
+    add_column(Article.__table__, "summary_generated")
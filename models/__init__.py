@@ -1,6 +1,6 @@
 """Models package for Constellate.
 
-This package is reserved for AI agent models that will be added in the future.
-The database models (User, Article) are defined in separate modules.
+The database models (User, Article, ...) are defined in separate modules.
+The LLM engines used for summaries and embeddings live in the ``agents``
+package.
 """
-
@@ -4,10 +4,16 @@ Defines the Article SQLAlchemy model for storing research articles.
 """
 
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
 
+from flask_sqlalchemy.query import Query
 from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes, load_only
 
 from database import db
+from models.edge import refresh_edges
+from models.tag import Tag, article_tags, parse_tags
 
 
 class Article(db.Model):
@@ -17,20 +23,41 @@ class Article(db.Model):
         id: Primary key, unique article identifier
         title: Article title
         summary: Article summary or description
+        summary_generated: Whether ``summary`` was written by the summarizer
+            (and may be rewritten by it), rather than submitted or imported
         url: URL to the article (arXiv link, PDF, etc.)
-        tags: Comma-separated tags for categorization
+        tags: Comma-separated tags as entered by the user; mirrored into
+            ``tag_objects`` on flush
+        tag_objects: Normalized Tag rows linked through ``article_tags``
         user_id: Foreign key to the user who submitted the article
         created_at: Timestamp of article creation
         updated_at: Timestamp of last update
-        pdf_path: Path to the local PDF file
+        pdf_path: Path to a local PDF file (legacy; see ``pdf_hash``)
+        pdf_hash: Blob store key (SHA-256) of the article's PDF
+        score: Sum of the article's votes (denormalized from ``votes``)
+        trending: Time-decayed sum of the votes, refreshed in the background
 
     """
 
     __tablename__ = "articles"
+    __table_args__ = (
+        # "My articles" (author's newest first); the user_id prefix also serves User.articles
+        db.Index("ix_articles_user_id_created_at", "user_id", "created_at"),
+        # "Recent articles" and "recently updated" listings
+        db.Index("ix_articles_created_at", "created_at"),
+        db.Index("ix_articles_updated_at", "updated_at"),
+        # "Trending" listing (ORDER BY trending DESC LIMIT k)
+        db.Index("ix_articles_trending", "trending"),
+        # Blob reference counts (articles sharing a PDF)
+        db.Index("ix_articles_pdf_hash", "pdf_hash"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     summary = db.Column(db.Text, nullable=True)
+    summary_generated = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false(),
+    )
     url = db.Column(db.String(500), nullable=True)
     tags = db.Column(db.String(500), nullable=True)  # Comma-separated tags
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -39,7 +66,193 @@ class Article(db.Model):
         db.DateTime, nullable=False, server_default=db.func.now(), onupdate=db.func.now(),
     )
     pdf_path = db.Column(db.String(500), nullable=True)
+    # active_history: the replaced key is loaded on change, for the blob reference counts
+    pdf_hash = db.column_property(
+        db.Column(db.String(64), db.ForeignKey("blobs.sha256"), nullable=True),
+        active_history=True,
+    )
+    score = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    trending = db.Column(db.Float, nullable=False, default=0.0, server_default="0")
+
+    # Normalized tags (many-to-many through article_tags)
+    tag_objects = db.relationship(
+        "Tag", secondary=article_tags, backref=db.backref("articles", lazy="dynamic"),
+    )
 
     def __repr__(self) -> str:
         """String representation of Article object."""
-        return f"<Article {self.title}>"
\ No newline at end of file
+        return f"<Article {self.title}>"
+
+
+def resolve_tags(session: Session, names: list[str]) -> list[Tag]:
+    """Get or create Tag rows for the given normalized names.
+
+    Tags that are pending in the session (created earlier in the same flush)
+    are reused so that two new articles sharing a new tag don't collide.
+
+    Args:
+        session: Session used to look up and add tags
+        names: Normalized tag names
+
+    Returns:
+        list[Tag]: Tag objects in the same order as ``names``
+
+    """
+    if not names:
+        return []
+    known = {obj.name: obj for obj in session.new if isinstance(obj, Tag)}
+    missing = [name for name in names if name not in known]
+    if missing:
+        with session.no_autoflush:
+            for tag in session.query(Tag).filter(Tag.name.in_(missing)):
+                known[tag.name] = tag
+    result = []
+    for name in names:
+        if name not in known:
+            known[name] = Tag(name=name)
+            session.add(known[name])
+        result.append(known[name])
+    return result
+
+
+def _changed(obj: Article, key: str) -> bool:
+    """Tell whether an attribute changed, without loading it (an unloaded one cannot have)."""
+    return attributes.get_history(
+        obj, key, passive=attributes.PASSIVE_NO_INITIALIZE,
+    ).has_changes()
+
+
+@event.listens_for(db.session, "before_flush")
+def _sync_tag_index(session: Session, _flush_context: object, _instances: object) -> None:
+    """Mirror changes of ``Article.tags`` into the normalized tag index."""
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Article):
+            continue
+        if obj in session.new or _changed(obj, "tags"):
+            obj.tag_objects = resolve_tags(session, parse_tags(obj.tags))
+
+
+@contextmanager
+def edge_sync_suspended() -> Iterator[None]:
+    """Leave ``article_edges`` alone on flushes of this session in this block.
+
+    For bulk tag changes followed by ``rebuild_edges``, which would otherwise
+    rewrite the edges of every article of every batch first.
+    """
+    session = db.session()
+    previous = session.info.get("edge_sync_suspended", False)
+    session.info["edge_sync_suspended"] = True
+    try:
+        yield
+    finally:
+        session.info["edge_sync_suspended"] = previous
+
+
+@event.listens_for(db.session, "after_flush")
+def _sync_edges(session: Session, _flush_context: object) -> None:
+    """Update ``article_edges`` for articles whose tag links changed in this flush."""
+    if session.info.get("edge_sync_suspended"):
+        return
+    changed = {
+        obj.id
+        for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Article) and (_changed(obj, "tags") or _changed(obj, "tag_objects"))
+    }
+    deleted = {obj.id for obj in session.deleted if isinstance(obj, Article)}
+    refresh_edges(session, changed, deleted)
+
+
+def articles_by_tag(name: str) -> Query:
+    """Build a query for articles carrying the given tag.
+
+    Args:
+        name: Tag name (normalized before lookup)
+
+    Returns:
+        Query: Article query ordered by id, using the article_tags tag index
+
+    """
+    return (
+        Article.query.join(article_tags, article_tags.c.article_id == Article.id)
+        .join(Tag, Tag.id == article_tags.c.tag_id)
+        .filter(Tag.name == name.strip().lower())
+        .order_by(Article.id)
+    )
+
+
+def articles_by_user(user_id: int) -> Query:
+    """Build a query for a user's articles, newest first.
+
+    Args:
+        user_id: Author's user id
+
+    Returns:
+        Query: Article query served by ``ix_articles_user_id_created_at``
+
+    """
+    return Article.query.filter(Article.user_id == user_id).order_by(
+        Article.created_at.desc(), Article.id.desc(),
+    )
+
+
+def recent_articles() -> Query:
+    """Build a query for all articles, newest first.
+
+    Returns:
+        Query: Article query served by ``ix_articles_created_at``
+
+    """
+    return Article.query.order_by(Article.created_at.desc(), Article.id.desc())
+
+
+def recently_updated_articles() -> Query:
+    """Build a query for all articles, most recently updated first.
+
+    Returns:
+        Query: Article query served by ``ix_articles_updated_at``
+
+    """
+    return Article.query.order_by(Article.updated_at.desc(), Article.id.desc())
+
+
+def trending_articles() -> Query:
+    """Build a query for all articles, highest trending score first.
+
+    Returns:
+        Query: Article query served by ``ix_articles_trending``
+
+    """
+    return Article.query.order_by(Article.trending.desc(), Article.id.desc())
+
+
+def backfill_tags(batch_size: int = 500) -> int:
+    """Populate the normalized tag index from the legacy ``Article.tags`` column.
+
+    Walks the articles table in primary-key order, committing once per batch,
+    so it can be re-run safely on a live database.
+
+    Args:
+        batch_size: Number of articles processed per transaction
+
+    Returns:
+        int: Number of articles processed
+
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        batch = (
+            Article.query.options(load_only(Article.id, Article.tags))
+            .filter(Article.id > last_id, Article.tags.isnot(None))
+            .order_by(Article.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        for article in batch:
+            article.tag_objects = resolve_tags(db.session, parse_tags(article.tags))
+        db.session.commit()
+        processed += len(batch)
+    return processed
@@ -0,0 +1,192 @@
+"""Blob model and reference counting of stored files.
+
+Every file in the blob store (see ``storage.blobs``) has a row keyed by its
+SHA-256. ``Blob.refcount`` counts the articles pointing at it through
+``Article.pdf_hash``; it is adjusted by the flush that changes an article's
+PDF, and ``collect_blobs`` repairs any drift before deleting the blobs no
+article uses any more.
+"""
+
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import BinaryIO
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, attributes
+
+from database import db
+from models.article import Article
+from models.job import utcnow
+from storage.blobs import BlobStore
+from storage.texts import TextCache
+
+
+class Blob(db.Model):
+    """Stored file, shared by every article with the same content.
+
+    Attributes:
+        sha256: Primary key, hex SHA-256 of the content (the blob store key)
+        size: Size in bytes
+        refcount: Number of articles referencing the blob
+        stored_at: Timestamp of the last upload of this content; unreferenced
+            blobs are only collected once it is older than the grace period
+
+    """
+
+    __tablename__ = "blobs"
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    refcount = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    stored_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+
+    def __repr__(self) -> str:
+        """String representation of Blob object."""
+        return f"<Blob {self.sha256[:12]} refs={self.refcount}>"
+
+
+def register_blob(key: str, size: int) -> None:
+    """Add the row of a stored blob, or refresh it if the content was stored before.
+
+    The row is written in the current transaction; the caller points an
+    article at the key and commits.
+
+    Args:
+        key: Blob key (hex SHA-256)
+        size: Size in bytes
+
+    """
+    insert = postgresql.insert if db.engine.dialect.name == "postgresql" else sqlite.insert
+    now = utcnow()
+    statement = insert(Blob).values(sha256=key, size=size, refcount=0, stored_at=now)
+    db.session.execute(
+        statement.on_conflict_do_update(index_elements=["sha256"], set_={"stored_at": now}),
+    )
+
+
+def store_blob(store: BlobStore, stream: BinaryIO) -> str:
+    """Store a stream in the blob store and register it (see ``register_blob``).
+
+    Args:
+        store: Blob store receiving the file
+        stream: Binary stream, read to the end in chunks
+
+    Returns:
+        str: Blob key (hex SHA-256)
+
+    """
+    key, size = store.put(stream)
+    register_blob(key, size)
+    return key
+
+
+@event.listens_for(db.session, "before_flush")
+def _count_blob_references(session: Session, _flush_context: object, _instances: object) -> None:
+    """Adjust ``Blob.refcount`` for articles whose PDF is set, changed or deleted."""
+    deltas: Counter[str] = Counter()
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Article) and obj.pdf_hash:
+                deltas[obj.pdf_hash] += 1
+        for obj in session.dirty:
+            if isinstance(obj, Article):
+                # An attribute that was never loaded cannot have changed
+                history = attributes.get_history(
+                    obj, "pdf_hash", passive=attributes.PASSIVE_NO_INITIALIZE,
+                )
+                deltas.update(key for key in history.added if key)
+                deltas.subtract(key for key in history.deleted if key)
+        for obj in session.deleted:
+            if isinstance(obj, Article):
+                history = attributes.get_history(
+                    obj, "pdf_hash", passive=attributes.PASSIVE_NO_INITIALIZE,
+                )
+                key = history.deleted[0] if history.deleted else obj.pdf_hash
+                if key:
+                    deltas[key] -= 1
+        for key, delta in deltas.items():
+            if delta:
+                session.execute(
+                    db.update(Blob)
+                    .where(Blob.sha256 == key)
+                    .values(refcount=Blob.refcount + delta),
+                )
+
+
+def _delete_file(store: BlobStore, texts: TextCache | None, key: str, older_than: float) -> bool:
+    """Remove a blob's file older than a cutoff, and its cached text."""
+    if not store.delete(key, older_than=older_than):
+        return False
+    if texts is not None:
+        texts.delete(key)
+    return True
+
+
+def collect_blobs(
+    store: BlobStore,
+    grace_seconds: float,
+    batch_size: int = 1000,
+    *,
+    texts: TextCache | None = None,
+) -> int:
+    """Delete the blobs no article references any more.
+
+    Reference counts are first recomputed from the articles. Blobs with no
+    references are only deleted once they were last stored more than
+    ``grace_seconds`` ago, so an upload that has not been attached to its
+    article yet is kept. Files without a row (left by a failed transaction)
+    and interrupted uploads past the grace period are removed as well, along
+    with the cached text of every removed file.
+
+    Args:
+        store: Blob store holding the files
+        grace_seconds: Minimum age of a collected blob
+        batch_size: Blobs deleted per transaction
+        texts: Text cache whose entries of removed files are deleted
+
+    Returns:
+        int: Number of files removed
+
+    """
+    references = (
+        db.select(db.func.count(Article.id))
+        .where(Article.pdf_hash == Blob.sha256)
+        .scalar_subquery()
+    )
+    db.session.execute(
+        db.update(Blob).where(Blob.refcount != references).values(refcount=references),
+    )
+    db.session.commit()
+
+    cutoff = utcnow() - timedelta(seconds=grace_seconds)
+    file_cutoff = time.time() - grace_seconds
+    collectable = (Blob.refcount <= 0) & (Blob.stored_at < cutoff)
+    removed = 0
+    while True:
+        keys = db.session.execute(
+            db.delete(Blob)
+            .where(
+                Blob.sha256.in_(db.select(Blob.sha256).where(collectable).limit(batch_size)),
+                collectable,
+            )
+            .returning(Blob.sha256),
+        ).scalars().all()
+        db.session.commit()
+        removed += sum(_delete_file(store, texts, key, file_cutoff) for key in keys)
+        if len(keys) < batch_size:
+            break
+
+    stored = list(store.scan())
+    for start in range(0, len(stored), batch_size):
+        batch = dict(stored[start : start + batch_size])
+        known = set(db.session.execute(
+            db.select(Blob.sha256).where(Blob.sha256.in_(batch)),
+        ).scalars())
+        removed += sum(
+            _delete_file(store, texts, key, file_cutoff)
+            for key, mtime in batch.items()
+            if key not in known and mtime < file_cutoff
+        )
+    return removed + store.remove_stale_parts(file_cutoff)
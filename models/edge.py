@@ -0,0 +1,142 @@
+"""Article edge model for the knowledge graph.
+
+Defines the ArticleEdge SQLAlchemy model, a materialized table of article pairs
+that share tags, and the SQL used to keep it up to date.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import Select, Table
+from sqlalchemy.orm import Session
+
+from database import db
+from models.tag import article_tags
+
+
+class ArticleEdge(db.Model):
+    """Edge between two articles sharing at least one tag.
+
+    Each undirected edge is stored once with ``source_id < target_id``.
+
+    Attributes:
+        source_id: Lower article id of the pair
+        target_id: Higher article id of the pair
+        shared_tags: Number of tags both articles carry (edge weight)
+
+    """
+
+    __tablename__ = "article_edges"
+    __table_args__ = (db.Index("ix_article_edges_target_id", "target_id"),)
+
+    source_id = db.Column(
+        db.Integer, db.ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True,
+    )
+    target_id = db.Column(
+        db.Integer, db.ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True,
+    )
+    shared_tags = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of ArticleEdge object."""
+        return f"<ArticleEdge {self.source_id}-{self.target_id} ({self.shared_tags})>"
+
+
+def _shared_tag_pairs(left: Table, right: Table) -> Select:
+    """Select (source_id, target_id, shared_tags) rows from ``article_tags``.
+
+    Args:
+        left: Alias of article_tags for the first article of a pair
+        right: Alias of article_tags for the second article of a pair
+
+    Returns:
+        Select: Self-join of article_tags on tag_id, grouped by article pair
+
+    """
+    lower = left.c.article_id < right.c.article_id
+    source = db.case((lower, left.c.article_id), else_=right.c.article_id)
+    target = db.case((lower, right.c.article_id), else_=left.c.article_id)
+    return (
+        db.select(source, target, db.func.count())
+        .select_from(left)
+        .join(
+            right,
+            (right.c.tag_id == left.c.tag_id) & (right.c.article_id != left.c.article_id),
+        )
+        .group_by(left.c.article_id, right.c.article_id)
+    )
+
+
+def refresh_edges(
+    session: Session, changed_ids: Iterable[int], deleted_ids: Iterable[int] = (),
+) -> None:
+    """Recompute the edges touching the given articles.
+
+    Only the rows adjacent to the changed articles are rewritten, so the cost
+    is proportional to their degree rather than to the size of the graph.
+
+    Args:
+        session: Session whose connection runs the statements
+        changed_ids: Articles whose tags were inserted or changed
+        deleted_ids: Articles that were deleted
+
+    """
+    changed = set(changed_ids)
+    touched = changed | set(deleted_ids)
+    if not touched:
+        return
+    table = ArticleEdge.__table__
+    session.execute(
+        table.delete().where(
+            table.c.source_id.in_(touched) | table.c.target_id.in_(touched),
+        ),
+    )
+    if not changed:
+        return
+    # A pair of two changed articles is produced from both sides of the join;
+    # keep it only once, from the side with the lower id.
+    left = article_tags.alias("left_tags")
+    right = article_tags.alias("right_tags")
+    pairs = _shared_tag_pairs(left, right).where(
+        left.c.article_id.in_(changed),
+        right.c.article_id.not_in(changed) | (right.c.article_id > left.c.article_id),
+    )
+    session.execute(
+        table.insert().from_select(["source_id", "target_id", "shared_tags"], pairs),
+    )
+
+
+def rebuild_edges(batch_size: int = 1000) -> int:
+    """Rebuild the whole edge table from ``article_tags``.
+
+    Walks ``source_id`` ranges, replacing the edges of each range in its own
+    transaction, so other writers get the database between batches.
+
+    Args:
+        batch_size: Width of each ``source_id`` range
+
+    Returns:
+        int: Number of edges written
+
+    """
+    table = ArticleEdge.__table__
+    left = article_tags.alias("left_tags")
+    right = article_tags.alias("right_tags")
+    highest = max(
+        db.session.execute(db.select(db.func.max(article_tags.c.article_id))).scalar() or 0,
+        db.session.execute(db.select(db.func.max(table.c.source_id))).scalar() or 0,
+    )
+    for lower in range(0, highest, batch_size):
+        upper = lower + batch_size
+        db.session.execute(
+            table.delete().where(table.c.source_id > lower, table.c.source_id <= upper),
+        )
+        pairs = _shared_tag_pairs(left, right).where(
+            left.c.article_id > lower,
+            left.c.article_id <= upper,
+            left.c.article_id < right.c.article_id,
+        )
+        db.session.execute(
+            table.insert().from_select(["source_id", "target_id", "shared_tags"], pairs),
+        )
+        db.session.commit()
+    return db.session.query(ArticleEdge).count()
@@ -0,0 +1,60 @@
+"""Article embedding model for similarity search.
+
+Defines the ArticleEmbedding SQLAlchemy model storing one float32 vector per article.
+"""
+
+from database import db
+from lazy import lazy_import
+
+# Only the vector accessors need NumPy; keep it out of the model import
+np = lazy_import("numpy")
+
+
+class ArticleEmbedding(db.Model):
+    """Embedding vector of an article, stored as a float32 blob.
+
+    The table is the source of truth; the on-disk similarity index is rebuilt
+    from it when missing or stale.
+
+    Attributes:
+        article_id: Primary key, foreign key to the embedded article
+        model: Name of the embedder that produced the vector
+        dim: Vector dimensionality
+        vector: Raw little-endian float32 bytes (``dim * 4`` bytes)
+        updated_at: Timestamp of the last (re)computation
+
+    """
+
+    __tablename__ = "article_embeddings"
+
+    article_id = db.Column(
+        db.Integer, db.ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True,
+    )
+    model = db.Column(db.String(100), nullable=False)
+    dim = db.Column(db.Integer, nullable=False)
+    vector = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, server_default=db.func.now(), onupdate=db.func.now(),
+    )
+
+    # Relationship to the article (deleted together with it)
+    article = db.relationship(
+        "Article",
+        backref=db.backref("embedding", uselist=False, cascade="all, delete-orphan"),
+    )
+
+    @property
+    def array(self) -> "np.ndarray":
+        """Return the vector as a float32 NumPy array."""
+        return np.frombuffer(self.vector, dtype="<f4")
+
+    @array.setter
+    def array(self, values: "np.ndarray") -> None:
+        """Store a vector, converting it to little-endian float32."""
+        values = np.asarray(values, dtype="<f4").ravel()
+        self.dim = values.shape[0]
+        self.vector = values.tobytes()
+
+    def __repr__(self) -> str:
+        """String representation of ArticleEmbedding object."""
+        return f"<ArticleEmbedding {self.article_id} ({self.model}, {self.dim})>"
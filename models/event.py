@@ -0,0 +1,31 @@
+"""Graph event model.
+
+Backs the database event broker: every web worker appends the events it
+publishes and polls the events published by the others.
+"""
+
+from database import db
+
+
+class GraphEvent(db.Model):
+    """Published graph update, kept until it is pruned from the replay window.
+
+    Attributes:
+        id: Primary key, the event id sent to clients (never reused)
+        kind: Event type (``node``, ``edge``, ``score``)
+        data: JSON-encoded event payload
+        created_at: Timestamp of publication
+
+    """
+
+    __tablename__ = "graph_events"
+    __table_args__ = {"sqlite_autoincrement": True}  # noqa: RUF012 - SQLAlchemy table options
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    data = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+
+    def __repr__(self) -> str:
+        """String representation of GraphEvent object."""
+        return f"<GraphEvent {self.id} {self.kind}>"
@@ -0,0 +1,129 @@
+"""PDF text shared by the processing stages, with per-stage cache statistics.
+
+``article_pdf_text`` returns the text of an article's PDF from the app's
+text cache (see ``storage.texts``), extracting and caching it on a miss.
+Each lookup is counted for the stage that made it ("summarize", "embed"),
+together with the time spent extracting, in ``extraction_stats``. The counts
+are written in their own short transaction: in the stage's session they
+would hold the SQLite write lock through extraction, the summarizer and the
+embedder, until the stage commits.
+"""
+
+import time
+
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import db
+from models.article import Article
+from storage.texts import ExtractedText, TextCache, extract_pdf, file_sha256
+
+
+class ExtractionStat(db.Model):
+    """Text cache lookups of a processing stage.
+
+    Attributes:
+        stage: Primary key, name of the stage
+        hits: Lookups answered from the cache
+        misses: Lookups that extracted the text
+        extract_seconds: Total time spent extracting on misses
+
+    """
+
+    __tablename__ = "extraction_stats"
+
+    stage = db.Column(db.String(32), primary_key=True)
+    hits = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    misses = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    extract_seconds = db.Column(db.Float, nullable=False, default=0.0, server_default="0")
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache (0 without lookups)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        """String representation of ExtractionStat object."""
+        return f"<ExtractionStat {self.stage} hits={self.hits} misses={self.misses}>"
+
+
+def record_lookup(stage: str, *, hit: bool, seconds: float = 0.0) -> None:
+    """Count a text cache lookup of a stage.
+
+    The counters are incremented in a transaction of their own, committed
+    at once, so the session of the stage does not start writing. Call it
+    outside of a write transaction of that session (which SQLite would make
+    this one wait for).
+
+    Args:
+        stage: Name of the stage
+        hit: Whether the text was cached
+        seconds: Time spent extracting the text on a miss
+
+    """
+    insert = postgresql.insert if db.engine.dialect.name == "postgresql" else sqlite.insert
+    statement = insert(ExtractionStat).values(
+        stage=stage, hits=int(hit), misses=int(not hit), extract_seconds=seconds,
+    )
+    with db.engine.begin() as conn:
+        conn.execute(
+            statement.on_conflict_do_update(
+                index_elements=["stage"],
+                set_={
+                    "hits": ExtractionStat.hits + statement.excluded.hits,
+                    "misses": ExtractionStat.misses + statement.excluded.misses,
+                    "extract_seconds": (
+                        ExtractionStat.extract_seconds + statement.excluded.extract_seconds
+                    ),
+                },
+            ),
+        )
+
+
+def extraction_stats() -> list[ExtractionStat]:
+    """Return the statistics of every stage, by stage name."""
+    # Written outside of the session: refresh rows it has loaded before
+    return db.session.execute(
+        db.select(ExtractionStat)
+        .order_by(ExtractionStat.stage)
+        .execution_options(populate_existing=True),
+    ).scalars().all()
+
+
+def article_pdf_text(article: Article, stage: str) -> ExtractedText | None:
+    """Return the text of an article's PDF, extracting it only if it is not cached.
+
+    Stored PDFs are looked up by their blob key; a legacy ``pdf_path`` file is
+    hashed first, which is much cheaper than parsing it.
+
+    Args:
+        article: Article whose PDF is read
+        stage: Name of the stage asking, for the statistics
+
+    Returns:
+        ExtractedText: Text of the PDF, or None if the article has no PDF
+
+    Raises:
+        RuntimeError: If the text is not cached and ``pypdf`` is not installed
+
+    """
+    if article.pdf_hash:
+        key = article.pdf_hash
+        path = current_app.extensions["blobs"].path(key)
+    elif article.pdf_path:
+        path = article.pdf_path
+        key = file_sha256(path)
+    else:
+        return None
+    cache: TextCache = current_app.extensions["texts"]
+    extracted = cache.get(key)
+    if extracted is not None:
+        record_lookup(stage, hit=True)
+        return extracted
+    started = time.perf_counter()
+    extracted = extract_pdf(path)
+    seconds = time.perf_counter() - started
+    cache.put(key, extracted)
+    record_lookup(stage, hit=False, seconds=seconds)
+    return extracted
@@ -0,0 +1,128 @@
+"""Job model for background processing.
+
+Defines the Job SQLAlchemy model backing the SQLite job queue, and the hook
+enqueueing processing for newly submitted articles.
+"""
+
+from datetime import datetime, timezone
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from database import db
+from models.article import Article
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Job kind run for every newly submitted article
+PROCESS_ARTICLE = "process_article"
+
+# Periodic job kind repairing drift of the denormalized article scores
+RECONCILE_VOTES = "reconcile_votes"
+
+# Periodic job kind recomputing the time-decayed trending scores
+REFRESH_TRENDING = "refresh_trending"
+
+# Periodic job kind deleting stored PDFs no article references
+COLLECT_BLOBS = "collect_blobs"
+
+
+def utcnow() -> datetime:
+    """Return the current UTC time as a naive datetime (as stored by SQLite)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Job(db.Model):
+    """Background job stored in the queue table.
+
+    Attributes:
+        id: Primary key, unique job identifier
+        kind: Name of the registered handler that runs the job
+        article_id: Article the job works on (optional)
+        payload: Optional JSON-encoded handler arguments
+        status: One of queued, running, done, failed
+        attempts: Number of times the job has been claimed
+        max_attempts: Attempts allowed before the job is marked failed
+        run_after: Earliest time the job may be claimed (used for backoff)
+        locked_by: Identifier of the worker running the job
+        locked_at: Time the job was claimed
+        last_error: Error message of the last failed attempt
+        created_at: Timestamp of job creation
+        updated_at: Timestamp of last update
+
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (db.Index("ix_jobs_status_run_after", "status", "run_after"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    article_id = db.Column(
+        db.Integer, db.ForeignKey("articles.id", ondelete="CASCADE"), nullable=True, index=True,
+    )
+    payload = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default=QUEUED)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_after = db.Column(db.DateTime, nullable=False, default=utcnow)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+    updated_at = db.Column(
+        db.DateTime, nullable=False, server_default=db.func.now(), onupdate=db.func.now(),
+    )
+
+    # Relationship to the article (jobs are deleted together with it)
+    article = db.relationship(
+        "Article",
+        backref=db.backref(
+            "jobs", lazy="dynamic", cascade="all, delete-orphan", order_by="Job.id",
+        ),
+    )
+
+    def to_dict(self) -> dict:
+        """Return the job's public status fields."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_after": self.run_after.isoformat() if self.run_after else None,
+            "last_error": self.last_error,
+        }
+
+    def __repr__(self) -> str:
+        """String representation of Job object."""
+        return f"<Job {self.id} {self.kind} {self.status}>"
+
+
+@event.listens_for(db.session, "after_flush")
+def _enqueue_new_articles(session: Session, _flush_context: object) -> None:
+    """Queue processing for articles inserted in this flush.
+
+    Rows are inserted in the same transaction as the articles, so an article
+    is never committed without its job (and vice versa).
+    """
+    if not has_app_context() or not current_app.config["JOBS_ENQUEUE_ON_INSERT"]:
+        return
+    rows = [
+        {
+            "kind": PROCESS_ARTICLE,
+            "article_id": obj.id,
+            "status": QUEUED,
+            "attempts": 0,
+            "max_attempts": current_app.config["JOB_MAX_ATTEMPTS"],
+            "run_after": utcnow(),
+        }
+        for obj in session.new
+        if isinstance(obj, Article)
+    ]
+    if rows:
+        session.execute(Job.__table__.insert(), rows)
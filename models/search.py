@@ -0,0 +1,172 @@
+"""Full-text search over article titles and summaries.
+
+Articles are shadowed by the external-content FTS5 table ``articles_fts``,
+kept in sync by SQLite triggers (so ORM flushes, Core statements and bulk
+imports are all indexed). The table and triggers are created together with
+the ``articles`` table; ``rebuild_search_index`` adds them to existing
+databases and re-indexes every article.
+"""
+
+import re
+
+from markupsafe import escape
+from sqlalchemy import DDL, column, event, literal_column, table, text
+
+from database import db
+from models.article import Article
+from models.tag import Tag, article_tags
+
+FTS_TABLE = "articles_fts"
+
+# Column weights for bm25 (title, summary): title matches rank higher
+TITLE_WEIGHT = 10.0
+SUMMARY_WEIGHT = 1.0
+
+# Snippet markers; private-use characters that cannot clash with user text
+# and are replaced by <mark> tags after HTML-escaping the snippet
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Lightweight handle on the virtual table (it is not part of the metadata,
+# so create_all never tries to create it as a regular table)
+articles_fts = table(FTS_TABLE, column("rowid"), column("title"), column("summary"))
+
+SCHEMA = (
+    # Prefix indexes keep search-as-you-type (last term prefix) queries fast
+    (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+        "title, summary, content='articles', content_rowid='id', "
+        "tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+        "INSERT INTO articles_fts(rowid, title, summary) "
+        "VALUES (new.id, new.title, new.summary); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+        "INSERT INTO articles_fts(articles_fts, rowid, title, summary) "
+        "VALUES ('delete', old.id, old.title, old.summary); END"
+    ),
+    (
+        "CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, summary "
+        "ON articles BEGIN "
+        "INSERT INTO articles_fts(articles_fts, rowid, title, summary) "
+        "VALUES ('delete', old.id, old.title, old.summary); "
+        "INSERT INTO articles_fts(rowid, title, summary) "
+        "VALUES (new.id, new.title, new.summary); END"
+    ),
+)
+
+for _statement in SCHEMA:
+    event.listen(
+        Article.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    Article.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite"),
+)
+
+
+def match_expression(query: str) -> str | None:
+    """Turn user input into a safe FTS5 query.
+
+    Every word is quoted (so FTS5 operators and punctuation in the input are
+    searched literally) and all words must match; the last word also matches
+    as a prefix, for search-as-you-type.
+
+    Args:
+        query: Raw search input
+
+    Returns:
+        str: FTS5 MATCH expression, or None if the input has no words
+
+    """
+    terms = _TOKEN.findall(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def highlight(snippet: str | None) -> str:
+    """HTML-escape a snippet and wrap its matches in ``<mark>`` tags."""
+    escaped = str(escape(snippet or ""))
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def search_articles(
+    query: str, tag: str | None = None, limit: int = 20, offset: int = 0,
+) -> list[dict]:
+    """Search article titles and summaries, best matches first.
+
+    Args:
+        query: Raw search input
+        tag: Optional tag name the articles must carry
+        limit: Maximum number of results
+        offset: Number of results to skip (for paging)
+
+    Returns:
+        list[dict]: ``id``, ``title``, ``url``, ``tags``, ``score`` (bm25, lower
+            is better) and ``snippet`` (HTML with ``<mark>`` highlights)
+
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    fts_name = literal_column(FTS_TABLE)
+    score = db.func.bm25(fts_name, TITLE_WEIGHT, SUMMARY_WEIGHT).label("score")
+    snippet = db.func.snippet(fts_name, -1, _MARK_START, _MARK_END, "…", 16).label("snippet")
+    statement = (
+        db.select(Article.id, Article.title, Article.url, Article.tags, score, snippet)
+        .select_from(articles_fts)
+        .join(Article.__table__, Article.id == articles_fts.c.rowid)
+        .where(fts_name.op("MATCH")(expression))
+        .order_by(score, Article.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    if tag:
+        statement = statement.where(
+            db.select(article_tags.c.article_id)
+            .join(Tag, Tag.id == article_tags.c.tag_id)
+            .where(article_tags.c.article_id == Article.id, Tag.name == tag.strip().lower())
+            .exists(),
+        )
+    return [
+        {
+            "id": row.id,
+            "title": row.title,
+            "url": row.url,
+            "tags": row.tags,
+            "score": row.score,
+            "snippet": highlight(row.snippet),
+        }
+        for row in db.session.execute(statement)
+    ]
+
+
+def rebuild_search_index() -> int:
+    """Create the search table and triggers if missing and re-index all articles.
+
+    FTS5 re-indexes an external-content table in one statement, and cannot be
+    fed in batches while the triggers are live (an update of a row not indexed
+    yet would corrupt the index), so the rebuild holds the write lock until it
+    ends: run it in a maintenance window on large databases. The merge of the
+    index segments that follows is a separate transaction.
+
+    Returns:
+        int: Number of indexed articles
+
+    """
+    for statement in SCHEMA:
+        db.session.execute(text(statement))
+    db.session.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+    db.session.commit()
+    db.session.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')"))
+    db.session.commit()
+    return db.session.execute(db.select(db.func.count()).select_from(Article)).scalar()
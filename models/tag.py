@@ -0,0 +1,127 @@
+"""Tag model for normalized article tagging.
+
+Defines the Tag SQLAlchemy model and the ``article_tags`` association table,
+plus indexed SQL helpers for tag statistics.
+"""
+
+from sqlalchemy.orm import aliased
+
+from database import db, replica_reads
+
+# Association table between articles and tags.
+# The composite primary key serves (article_id, ...) lookups; the secondary
+# index serves "articles tagged X" lookups without touching the articles table.
+article_tags = db.Table(
+    "article_tags",
+    db.Column(
+        "article_id",
+        db.Integer,
+        db.ForeignKey("articles.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Column(
+        "tag_id",
+        db.Integer,
+        db.ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Index("ix_article_tags_tag_id_article_id", "tag_id", "article_id"),
+)
+
+
+class Tag(db.Model):
+    """Tag model for categorizing articles.
+
+    Attributes:
+        id: Primary key, unique tag identifier
+        name: Normalized (lowercase, stripped) tag name
+
+    """
+
+    __tablename__ = "tags"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """String representation of Tag object."""
+        return f"<Tag {self.name}>"
+
+
+def parse_tags(raw: str | None) -> list[str]:
+    """Split a comma-separated tag string into normalized tag names.
+
+    Names are stripped and lowercased; empty entries and duplicates are dropped
+    while the original order is preserved.
+
+    Args:
+        raw: Comma-separated tag string (may be None)
+
+    Returns:
+        list[str]: Normalized tag names
+
+    """
+    if not raw:
+        return []
+    names: list[str] = []
+    for part in raw.split(","):
+        name = part.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+@replica_reads()
+def tag_counts(limit: int | None = None) -> list[tuple[str, int]]:
+    """Count articles per tag.
+
+    Args:
+        limit: Optional maximum number of tags to return
+
+    Returns:
+        list[tuple[str, int]]: (tag name, article count), most used first
+
+    """
+    count = db.func.count(article_tags.c.article_id)
+    query = (
+        db.session.query(Tag.name, count)
+        .join(article_tags, article_tags.c.tag_id == Tag.id)
+        .group_by(Tag.id)
+        .order_by(count.desc(), Tag.name)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [(name, n) for name, n in query.all()]
+
+
+@replica_reads()
+def tag_cooccurrence(min_count: int = 1) -> list[tuple[str, str, int]]:
+    """Count how often pairs of tags appear on the same article.
+
+    Args:
+        min_count: Minimum number of shared articles for a pair to be returned
+
+    Returns:
+        list[tuple[str, str, int]]: (tag a, tag b, shared article count) with
+            tag a's id lower than tag b's, most frequent pairs first
+
+    """
+    left = article_tags.alias("left_tags")
+    right = article_tags.alias("right_tags")
+    left_tag = aliased(Tag)
+    right_tag = aliased(Tag)
+    count = db.func.count(left.c.article_id)
+    query = (
+        db.session.query(left_tag.name, right_tag.name, count)
+        .select_from(left)
+        .join(
+            right,
+            (right.c.article_id == left.c.article_id) & (right.c.tag_id > left.c.tag_id),
+        )
+        .join(left_tag, left_tag.id == left.c.tag_id)
+        .join(right_tag, right_tag.id == right.c.tag_id)
+        .group_by(left.c.tag_id, right.c.tag_id)
+        .having(count >= min_count)
+        .order_by(count.desc(), left_tag.name, right_tag.name)
+    )
+    return [(a, b, n) for a, b, n in query.all()]
@@ -3,11 +3,72 @@
 Defines the User SQLAlchemy model with authentication capabilities.
 """
 
+import time
+from functools import lru_cache
+
+from flask import current_app, has_app_context
 from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, make_transient_to_detached
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from database import db
 
+# Werkzeug's defaults, used outside an application context
+DEFAULT_HASH_METHOD = "scrypt"
+DEFAULT_SALT_LENGTH = 16
+
+
+def password_hash_settings() -> tuple[str, int]:
+    """Return the configured password hash method and salt length.
+
+    Returns:
+        tuple: ``(PASSWORD_HASH_METHOD, PASSWORD_SALT_LENGTH)`` from the app
+            config, or werkzeug's defaults outside an application context
+
+    """
+    if has_app_context():
+        config = current_app.config
+        return config["PASSWORD_HASH_METHOD"], config["PASSWORD_SALT_LENGTH"]
+    return DEFAULT_HASH_METHOD, DEFAULT_SALT_LENGTH
+
+
+@lru_cache(maxsize=8)
+def resolved_hash_method(method: str) -> str:
+    """Return the full parameter string werkzeug stores for a hash method.
+
+    Short forms are expanded with werkzeug's defaults, e.g. ``"scrypt"`` becomes
+    ``"scrypt:32768:8:1"``. Costs one hash per method and process.
+
+    Args:
+        method: Hash method as accepted by ``generate_password_hash``
+
+    Returns:
+        str: Method prefix of hashes generated with ``method``
+
+    """
+    return generate_password_hash("", method=method, salt_length=1).split("$", 1)[0]
+
+
+def time_password_hash(
+    method: str, salt_length: int = DEFAULT_SALT_LENGTH, rounds: int = 5,
+) -> float:
+    """Measure the mean time to hash a password with the given parameters.
+
+    Args:
+        method: Hash method as accepted by ``generate_password_hash``
+        salt_length: Salt length in characters
+        rounds: Number of hashes to time
+
+    Returns:
+        float: Mean seconds per hash
+
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        generate_password_hash("benchmark-password", method=method, salt_length=salt_length)
+    return (time.perf_counter() - start) / rounds
+
 
 class User(UserMixin, db.Model):
     """User model for authentication and user management.
@@ -35,27 +96,98 @@ class User(UserMixin, db.Model):
     articles = db.relationship("Article", backref="author", lazy="dynamic")
 
     def set_password(self, password: str) -> None:
-        """Set user password by hashing it.
+        """Set user password by hashing it with the configured parameters.
+
+        Runs in the app's hashing pool when ``PASSWORD_HASH_EXECUTOR`` is set.
 
         Args:
             password: Plain text password to hash and store
 
+        Raises:
+            HashingBusyError: If the hashing pool is full
+
         """
-        self.password_hash = generate_password_hash(password)
+        method, salt_length = password_hash_settings()
+        hasher = current_app.extensions.get("password_hasher") if has_app_context() else None
+        if hasher is not None:
+            self.password_hash = hasher.generate(password, method, salt_length)
+        else:
+            self.password_hash = generate_password_hash(
+                password, method=method, salt_length=salt_length,
+            )
 
     def check_password(self, password: str) -> bool:
         """Verify a password against the stored hash.
 
+        Runs in the app's hashing pool when ``PASSWORD_HASH_EXECUTOR`` is set.
+
         Args:
             password: Plain text password to verify
 
         Returns:
             bool: True if password matches, False otherwise
 
+        Raises:
+            HashingBusyError: If the hashing pool is full
+
         """
+        hasher = current_app.extensions.get("password_hasher") if has_app_context() else None
+        if hasher is not None:
+            return hasher.check(self.password_hash, password)
         return check_password_hash(self.password_hash, password)
 
+    def needs_rehash(self) -> bool:
+        """Check whether the stored hash uses other than the configured parameters.
+
+        Returns:
+            bool: True if the method, its cost parameters or the salt length differ
+
+        """
+        method, salt_length = password_hash_settings()
+        stored_method, _, rest = self.password_hash.partition("$")
+        salt = rest.partition("$")[0]
+        return stored_method != resolved_hash_method(method) or len(salt) != salt_length
+
     def __repr__(self) -> str:
         """String representation of User object."""
         return f"<User {self.username}>"
 
+
+def load_cached_user(user_id: int) -> User | None:
+    """Load a user by primary key through the app's identity cache.
+
+    The cache (``app.extensions["user_cache"]``, enabled by ``USER_CACHE_ENABLED``)
+    holds detached column snapshots; a hit is merged into the current session
+    without emitting SQL.
+
+    Args:
+        user_id: User primary key
+
+    Returns:
+        User: Session-bound user or None if not found
+
+    """
+    cache = current_app.extensions.get("user_cache")
+    if cache is None:
+        return db.session.get(User, user_id)
+
+    snapshot = cache.get(user_id)
+    if snapshot is not None:
+        return db.session.merge(snapshot, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.c})
+        make_transient_to_detached(snapshot)
+        cache.set(user_id, snapshot)
+    return user
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(_mapper: Mapper, _connection: object, target: User) -> None:
+    """Drop a changed or deleted user from the identity cache."""
+    if has_app_context():
+        cache = current_app.extensions.get("user_cache")
+        if cache is not None:
+            cache.invalidate(target.id)
@@ -0,0 +1,214 @@
+"""Vote model and score maintenance.
+
+Each user has at most one vote per article. The sum of an article's votes is
+denormalized into ``Article.score``, adjusted by the same transaction that
+changes the vote, so listings never count vote rows. ``reconcile_scores``
+repairs any drift from the votes table. Neither touches
+``Article.updated_at``, which tracks edits of the article itself.
+
+``Article.trending`` weighs each vote by its age (exponential decay with a
+configurable half-life); it is recomputed by ``refresh_trending`` in a
+periodic background job, so the trending listing is an indexed
+``ORDER BY trending DESC LIMIT k``. The refresh leaves ``updated_at`` alone
+too.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import db
+from migrations.base import backfill_in_batches
+from models.article import Article
+
+# Accepted vote values; 0 withdraws the vote
+VOTE_VALUES = (-1, 0, 1)
+
+
+class Vote(db.Model):
+    """A user's up- or down-vote on an article.
+
+    Attributes:
+        user_id: Voting user (part of the primary key)
+        article_id: Voted article (part of the primary key)
+        value: +1 or -1
+        created_at: Timestamp of the first vote
+        updated_at: Timestamp of the last change of ``value``
+
+    """
+
+    __tablename__ = "votes"
+    __table_args__ = (
+        db.Index("ix_votes_article_id", "article_id"),
+        # Recent votes scanned by refresh_trending
+        db.Index("ix_votes_updated_at", "updated_at"),
+    )
+
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True,
+    )
+    article_id = db.Column(
+        db.Integer, db.ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True,
+    )
+    value = db.Column(db.SmallInteger, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+
+    # Relationship to the article (votes are deleted together with it)
+    article = db.relationship(
+        "Article", backref=db.backref("votes", lazy="dynamic", cascade="all, delete-orphan"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of Vote object."""
+        return f"<Vote {self.user_id} on {self.article_id}: {self.value:+d}>"
+
+
+def _upsert(user_id: int, article_id: int, value: int) -> object:
+    """Build an INSERT that updates the existing vote on conflict."""
+    insert = postgresql.insert if db.engine.dialect.name == "postgresql" else sqlite.insert
+    statement = insert(Vote).values(user_id=user_id, article_id=article_id, value=value)
+    return statement.on_conflict_do_update(
+        index_elements=[Vote.user_id, Vote.article_id],
+        set_={"value": statement.excluded.value, "updated_at": db.func.now()},
+        where=Vote.value != statement.excluded.value,
+    )
+
+
+def _days_since(moment: datetime, column: object, dialect: str) -> object:
+    """Build the SQL for the days from ``column`` to ``moment`` (SQLite or PostgreSQL)."""
+    if dialect == "postgresql":
+        return db.extract("epoch", moment - column) / 86400
+    return db.func.julianday(moment) - db.func.julianday(column)
+
+
+def cast_vote(user_id: int, article_id: int, value: int) -> int | None:
+    """Set a user's vote on an article and adjust its score; idempotent.
+
+    The score is changed first, by the difference to the previous vote, in a
+    single ``UPDATE articles SET score = score + ...``. That statement takes
+    the write lock, so the vote upsert in the same transaction cannot race
+    with a concurrent vote of the same user, and repeating a vote is a no-op.
+
+    Args:
+        user_id: Voting user
+        article_id: Voted article
+        value: +1, -1, or 0 to withdraw the vote
+
+    Returns:
+        int: The article's new score, or None if the article does not exist
+
+    Raises:
+        ValueError: If ``value`` is not one of -1, 0, 1
+
+    """
+    if value not in VOTE_VALUES:
+        msg = f"Vote value must be one of {VOTE_VALUES}, got {value!r}"
+        raise ValueError(msg)
+    previous = (
+        db.select(Vote.value)
+        .where(Vote.user_id == user_id, Vote.article_id == article_id)
+        .scalar_subquery()
+    )
+    updated = db.session.execute(
+        db.update(Article)
+        .where(Article.id == article_id)
+        # A vote is not an edit: keep updated_at from its onupdate
+        .values(
+            score=Article.score + value - db.func.coalesce(previous, 0),
+            updated_at=Article.updated_at,
+        ),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    if not updated:
+        db.session.rollback()
+        return None
+    if value:
+        db.session.execute(_upsert(user_id, article_id, value))
+    else:
+        db.session.execute(
+            db.delete(Vote).where(Vote.user_id == user_id, Vote.article_id == article_id),
+        )
+    db.session.commit()
+    return db.session.execute(db.select(Article.score).where(Article.id == article_id)).scalar()
+
+
+def reconcile_scores(batch_size: int = 1000) -> int:
+    """Recompute ``Article.score`` from the votes where it has drifted.
+
+    Runs in primary-key batches, one short transaction each.
+
+    Args:
+        batch_size: Articles checked per transaction
+
+    Returns:
+        int: Number of articles whose score was repaired
+
+    """
+    total = (
+        db.select(db.func.coalesce(db.func.sum(Vote.value), 0))
+        .where(Vote.article_id == Article.id)
+        .scalar_subquery()
+    )
+    return backfill_in_batches(
+        Article.__table__,
+        {"score": total, "updated_at": Article.updated_at},
+        where=(Article.score != total,),
+        batch_size=batch_size,
+    )
+
+
+def refresh_trending(
+    half_life_hours: float, horizon: float = 10.0, batch_size: int = 1000,
+) -> int:
+    """Recompute ``Article.trending`` from the recent votes.
+
+    A vote counts ``value * 0.5 ** (age / half_life)``, by the time it was
+    last changed. Votes older than ``horizon`` half-lives (weight below 0.1%
+    for the default) are skipped, and articles without recent votes drop to 0.
+    Since every score decays by the same factor, the ranking stays correct
+    between refreshes except for votes cast since the last one.
+
+    Args:
+        half_life_hours: Hours after which a vote counts half
+        horizon: Half-lives after which votes are ignored
+        batch_size: Articles updated per transaction
+
+    Returns:
+        int: Number of articles with a trending score
+
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    cutoff = now - timedelta(hours=half_life_hours * horizon)
+    per_day = math.log(2) * 24 / half_life_hours
+    weight = db.func.exp(-per_day * _days_since(now, Vote.updated_at, db.engine.dialect.name))
+    recent = Vote.updated_at >= cutoff
+    scores = db.session.execute(
+        db.select(Vote.article_id, db.func.sum(Vote.value * weight))
+        .where(recent)
+        .group_by(Vote.article_id),
+    ).all()
+    db.session.execute(
+        db.update(Article)
+        .where(Article.trending != 0, Article.id.not_in(db.select(Vote.article_id).where(recent)))
+        .values(trending=0, updated_at=Article.updated_at),
+        execution_options={"synchronize_session": False},
+    )
+    table = Article.__table__
+    set_trending = (
+        db.update(table)
+        .where(table.c.id == db.bindparam("article_id"))
+        .values(trending=db.bindparam("trending_score"), updated_at=table.c.updated_at)
+    )
+    for start in range(0, len(scores), batch_size):
+        db.session.execute(
+            set_trending,
+            [
+                {"article_id": article_id, "trending_score": trending}
+                for article_id, trending in scores[start : start + batch_size]
+            ],
+        )
+        db.session.commit()
+    db.session.commit()
+    return len(scores)
@@ -0,0 +1,92 @@
+"""Startup profiling.
+
+Runs the app factory in a fresh interpreter with ``-X importtime`` and
+aggregates the per-module import times CPython reports on stderr.
+"""
+
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# Code timed in the child interpreter; prints the seconds spent in it
+STARTUP_CODE = (
+    "import time; start = time.perf_counter(); "
+    "from app import create_app; create_app(); "
+    "print(time.perf_counter() - start)"
+)
+
+
+def parse_import_times(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse ``-X importtime`` output.
+
+    Args:
+        stderr: Standard error of an interpreter run with ``-X importtime``
+
+    Returns:
+        list: ``(module, self_us, cumulative_us)`` per imported module
+
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():  # skips the header line
+            rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def by_package(rows: list[tuple[str, int, int]]) -> list[tuple[str, int]]:
+    """Sum the own import time of the modules of each top-level package.
+
+    Args:
+        rows: Output of ``parse_import_times``
+
+    Returns:
+        list: ``(package, microseconds)``, slowest first
+
+    """
+    totals: dict[str, int] = defaultdict(int)
+    for name, own, _cumulative in rows:
+        totals[name.split(".")[0]] += own
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def by_module(rows: list[tuple[str, int, int]]) -> list[tuple[str, int]]:
+    """List modules by their own import time.
+
+    Args:
+        rows: Output of ``parse_import_times``
+
+    Returns:
+        list: ``(module, microseconds)``, slowest first
+
+    """
+    return sorted(((name, own) for name, own, _ in rows), key=lambda item: item[1], reverse=True)
+
+
+def profile_startup(code: str = STARTUP_CODE) -> tuple[float, list[tuple[str, int, int]]]:
+    """Run ``code`` in a fresh interpreter and collect its import times.
+
+    Args:
+        code: Python code printing its own duration in seconds
+
+    Returns:
+        tuple: Seconds reported by ``code`` and the parsed import times
+
+    Raises:
+        RuntimeError: If the child interpreter fails
+
+    """
+    result = subprocess.run(  # noqa: S603 - runs this interpreter on fixed code
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        msg = f"Startup failed:\n{result.stderr.splitlines()[-1] if result.stderr else ''}"
+        raise RuntimeError(msg)
+    return float(result.stdout.split()[-1]), parse_import_times(result.stderr)
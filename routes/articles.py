@@ -0,0 +1,277 @@
+"""Article API routes.
+
+Handles article submission, voting, the trending listing, PDF downloads,
+per-article background job status and full-text search.
+"""
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request
+from flask_login import current_user
+from flask_wtf.csrf import validate_csrf
+from wtforms import ValidationError
+
+from database import db
+from events.service import publish
+from models.article import Article, trending_articles
+from models.blob import register_blob
+from models.search import search_articles
+from models.vote import VOTE_VALUES, cast_vote
+from routes.graph import publish_article
+from storage.blobs import send_blob
+from storage.uploads import receive_pdf_upload
+
+# Create blueprint for article API routes
+articles_bp = Blueprint("articles_api", __name__)
+
+# Maximum title length accepted on submission (matches Article.title)
+MAX_TITLE_LENGTH = 200
+
+# Upper bound for the search page size
+MAX_SEARCH_RESULTS = 100
+
+# Upper bound for the trending listing size
+MAX_TRENDING_RESULTS = 100
+
+
+def article_title(data: dict) -> str:
+    """Return the title of a submission.
+
+    Args:
+        data: Submitted fields
+
+    Returns:
+        str: Title without surrounding whitespace
+
+    Raises:
+        BadRequest: If the title is missing or longer than ``MAX_TITLE_LENGTH``
+
+    """
+    title = (data.get("title") or "").strip()
+    if not title or len(title) > MAX_TITLE_LENGTH:
+        abort(400)
+    return title
+
+
+def check_upload_fields(fields: dict[str, str]) -> None:
+    """Reject a multipart submission before its PDF is stored.
+
+    Unlike JSON, a multipart form can be posted from another site, so it must
+    carry the CSRF token of the session (``csrf_token`` field or
+    ``X-CSRFToken`` header) while ``WTF_CSRF_ENABLED`` is set.
+
+    Args:
+        fields: Text fields of the submission
+
+    Raises:
+        BadRequest: If the CSRF token or the title is invalid
+
+    """
+    if current_app.config["WTF_CSRF_ENABLED"]:
+        try:
+            validate_csrf(fields.get("csrf_token") or request.headers.get("X-CSRFToken"))
+        except ValidationError as exc:
+            abort(400, description=str(exc))
+    article_title(fields)
+
+
+def receive_upload() -> tuple[dict[str, str], str | None]:
+    """Read a multipart submission, streaming its ``pdf`` file into the blob store.
+
+    Bodies over ``MAX_CONTENT_LENGTH`` are rejected from their Content-Length
+    before anything is read, and the fields are checked (see
+    ``check_upload_fields``) before the file is stored.
+
+    Returns:
+        tuple: Text fields by name, and the key of the stored PDF (None without one)
+
+    """
+    max_length = current_app.config["MAX_CONTENT_LENGTH"]
+    if max_length is not None and (request.content_length or 0) > max_length:
+        abort(413)
+    boundary = request.mimetype_params.get("boundary")
+    if not boundary:
+        abort(400)
+
+    store = current_app.extensions["blobs"]
+    fields, stored = receive_pdf_upload(
+        request.stream,
+        boundary.encode("latin-1"),
+        store,
+        check_fields=check_upload_fields,
+        chunk_size=store.chunk_size,
+        max_form_memory_size=request.max_form_memory_size,
+        max_form_parts=request.max_form_parts,
+    )
+    if stored is None:
+        return fields, None
+    register_blob(*stored)
+    return fields, stored[0]
+
+
+@articles_bp.route("/articles", methods=["POST"])
+def submit_article() -> tuple[Response, int]:
+    """Submit a new article.
+
+    Requires authentication. Expects a JSON body with ``title`` and optional
+    ``url``, ``tags`` and ``summary``, or the same fields as
+    ``multipart/form-data`` with an optional ``pdf`` file (up to
+    ``MAX_CONTENT_LENGTH``; 415 if it is not a PDF) and a CSRF token (see
+    ``check_upload_fields``). Summarization and
+    embedding are queued as a background job, so the request returns
+    immediately.
+
+    Returns:
+        tuple: JSON with the article id and its jobs, and status 202
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    if request.mimetype == "multipart/form-data":
+        data, pdf_hash = receive_upload()
+    else:
+        data, pdf_hash = request.get_json(silent=True) or {}, None
+    title = article_title(data)
+
+    article = Article(
+        title=title,
+        url=data.get("url") or None,
+        tags=data.get("tags") or None,
+        summary=data.get("summary") or None,
+        user_id=current_user.id,
+        pdf_hash=pdf_hash,
+    )
+    db.session.add(article)
+    db.session.commit()
+    publish_article(article.id)
+
+    return jsonify({
+        "id": article.id,
+        "pdf": pdf_hash,
+        "jobs": [job.to_dict() for job in article.jobs],
+    }), 202
+
+
+@articles_bp.route("/articles/<int:article_id>/vote", methods=["PUT"])
+def vote(article_id: int) -> Response:
+    """Set the current user's vote on an article.
+
+    Requires authentication. Expects a JSON body with ``value`` 1 (upvote),
+    -1 (downvote) or 0 (withdraw the vote). Repeating a request leaves the
+    score unchanged.
+
+    Returns:
+        Response: JSON with the article id, its new score and the vote value
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    value = (request.get_json(silent=True) or {}).get("value")
+    if isinstance(value, bool) or value not in VOTE_VALUES:
+        abort(400)
+
+    score = cast_vote(current_user.id, article_id, value)
+    if score is None:
+        abort(404)
+    publish("score", {"type": "score", "id": article_id, "score": score})
+
+    return jsonify({"id": article_id, "score": score, "vote": value})
+
+
+@articles_bp.route("/articles/trending")
+def trending() -> Response:
+    """List the articles with the highest time-decayed vote score.
+
+    Requires authentication. Query parameter ``limit`` (default 20, at most
+    100). Scores are refreshed by a periodic background job.
+
+    Returns:
+        Response: JSON list of articles, most trending first
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    limit = request.args.get("limit", 20, type=int)
+    if not 1 <= limit <= MAX_TRENDING_RESULTS:
+        abort(400)
+
+    articles = trending_articles().limit(limit)
+    return jsonify([
+        {
+            "id": article.id,
+            "title": article.title,
+            "url": article.url,
+            "score": article.score,
+            "trending": article.trending,
+        }
+        for article in articles
+    ])
+
+
+@articles_bp.route("/articles/<int:article_id>/pdf")
+def article_pdf(article_id: int) -> Response:
+    """Download the PDF of an article.
+
+    Requires authentication. Supports ``Range`` requests and revalidation
+    with ``If-None-Match`` (the ETag is the PDF's SHA-256); the file is
+    streamed from the blob store or, with ``BLOB_OFFLOAD``, sent by the
+    front-end server.
+
+    Returns:
+        Response: PDF, partial content or 304
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    article = db.session.get(Article, article_id)
+    if article is None or not article.pdf_hash:
+        abort(404)
+
+    return send_blob(article.pdf_hash, download_name=f"article-{article_id}.pdf")
+
+
+@articles_bp.route("/articles/<int:article_id>/jobs")
+def article_jobs(article_id: int) -> Response:
+    """Return the background jobs of an article.
+
+    Requires authentication.
+
+    Returns:
+        Response: JSON list of job status objects, oldest first
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    article = db.session.get(Article, article_id)
+    if article is None:
+        abort(404)
+
+    return jsonify([job.to_dict() for job in article.jobs])
+
+
+@articles_bp.route("/search")
+def search() -> Response:
+    """Search article titles and summaries.
+
+    Requires authentication. Query parameters: ``q`` (search words; the
+    last one also matches as a prefix), optional ``tag``, ``limit`` (default
+    20, at most 100) and ``offset``.
+
+    Returns:
+        Response: JSON with the query and its results, best match first
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    query = request.args.get("q", "")
+    limit = request.args.get("limit", 20, type=int)
+    offset = request.args.get("offset", 0, type=int)
+    if not 1 <= limit <= MAX_SEARCH_RESULTS or offset < 0:
+        abort(400)
+
+    results = search_articles(query, tag=request.args.get("tag"), limit=limit, offset=offset)
+    return jsonify({"query": query, "results": results})
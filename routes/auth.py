@@ -37,6 +37,11 @@ def login() -> Response | str:
 
         # Check if user exists and password is correct
         if user and user.check_password(form.password.data):
+            # Transparently migrate the hash to the configured parameters
+            if user.needs_rehash():
+                user.set_password(form.password.data)
+                db.session.commit()
+
             login_user(user, remember=form.remember_me.data)
 
             # Redirect to next page or home
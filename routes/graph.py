@@ -0,0 +1,301 @@
+"""Graph API routes for the knowledge graph.
+
+Streams graph nodes and edges as newline-delimited JSON (NDJSON), paginated
+with a keyset cursor on ``Article.id``, and pushes live node, edge and score
+updates as Server-Sent Events.
+"""
+
+import json
+from collections import defaultdict
+from collections.abc import Iterator
+
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
+from flask_login import current_user
+from sqlalchemy import ColumnElement
+
+from database import db
+from events.service import publish
+from lazy import lazy_import
+from models.article import Article
+from models.edge import ArticleEdge
+from models.tag import Tag, article_tags
+from models.user import User
+
+# NumPy-based similarity search, imported on the first similarity request
+similarity_service = lazy_import("similarity.service")
+
+# Create blueprint for graph API routes
+graph_bp = Blueprint("graph_api", __name__)
+
+# Upper bound for the number of neighbours returned by the similarity endpoint
+MAX_SIMILAR = 100
+
+
+def _line(record: dict) -> str:
+    """Serialize one NDJSON record."""
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _article_filters(tag: str | None, author: str | None) -> list[ColumnElement[bool]]:
+    """Build WHERE clauses for the optional tag and author filters.
+
+    Args:
+        tag: Tag name articles must carry
+        author: Username of the submitting user
+
+    Returns:
+        list: Clauses over Article and User (the caller joins users)
+
+    """
+    filters = []
+    if tag:
+        tagged = (
+            db.select(article_tags.c.article_id)
+            .join(Tag, Tag.id == article_tags.c.tag_id)
+            .where(Tag.name == tag.strip().lower())
+        )
+        filters.append(Article.id.in_(tagged))
+    if author:
+        filters.append(User.username == author)
+    return filters
+
+
+def graph_records(
+    after: int = 0,
+    limit: int | None = None,
+    tag: str | None = None,
+    author: str | None = None,
+) -> Iterator[dict]:
+    """Yield the graph records, one keyset batch at a time.
+
+    Each batch emits its ``node`` records followed by the ``edge`` records whose
+    higher-id endpoint is in the batch, so both endpoints of an edge have always
+    been sent before the edge itself. The stream ends with a ``cursor`` record
+    holding the id to pass as ``cursor`` for the next page, or null when done.
+
+    Args:
+        after: Only articles with an id greater than this are returned
+        limit: Maximum number of nodes in this page (None for all)
+        tag: Optional tag filter
+        author: Optional author username filter
+
+    Yields:
+        dict: Records with a ``type`` of ``node``, ``edge`` or ``cursor``
+
+    """
+    batch_size = current_app.config["GRAPH_BATCH_SIZE"]
+    filters = _article_filters(tag, author)
+    scope = (
+        db.select(Article.id).outerjoin(User, User.id == Article.user_id).where(*filters)
+    )
+    remaining = limit
+    last_id = after
+    exhausted = False
+
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        nodes = db.session.execute(
+            db.select(
+                Article.id,
+                Article.title,
+                Article.url,
+                Article.score,
+                Article.trending,
+                Article.user_id,
+                User.username,
+            )
+            .outerjoin(User, User.id == Article.user_id)
+            .where(Article.id > last_id, *filters)
+            .order_by(Article.id)
+            .limit(size),
+        ).all()
+        if not nodes:
+            exhausted = True
+            break
+        ids = [node.id for node in nodes]
+
+        tags = defaultdict(list)
+        for article_id, name in db.session.execute(
+            db.select(article_tags.c.article_id, Tag.name)
+            .join(Tag, Tag.id == article_tags.c.tag_id)
+            .where(article_tags.c.article_id.in_(ids))
+            .order_by(Tag.name),
+        ):
+            tags[article_id].append(name)
+
+        for node in nodes:
+            yield {
+                "type": "node",
+                "id": node.id,
+                "title": node.title,
+                "url": node.url,
+                "tags": tags[node.id],
+                "author": node.username,
+                "score": node.score,
+                "trending": node.trending,
+            }
+
+        edges = db.select(ArticleEdge.source_id, ArticleEdge.target_id, ArticleEdge.shared_tags)
+        edges = edges.where(ArticleEdge.target_id.in_(ids)).order_by(
+            ArticleEdge.target_id, ArticleEdge.source_id,
+        )
+        if filters:
+            edges = edges.where(ArticleEdge.source_id.in_(scope))
+        for source, target, weight in db.session.execute(edges):
+            yield {"type": "edge", "source": source, "target": target, "weight": weight}
+
+        last_id = ids[-1]
+        if remaining is not None:
+            remaining -= len(nodes)
+        if len(nodes) < size:
+            exhausted = True
+            break
+
+    yield {"type": "cursor", "next": None if exhausted else last_id}
+
+
+def stream_graph(
+    after: int = 0,
+    limit: int | None = None,
+    tag: str | None = None,
+    author: str | None = None,
+) -> Iterator[str]:
+    """Yield the graph as NDJSON, one document per line (see ``graph_records``).
+
+    Args:
+        after: Only articles with an id greater than this are returned
+        limit: Maximum number of nodes in this page (None for all)
+        tag: Optional tag filter
+        author: Optional author username filter
+
+    Yields:
+        str: One JSON document per line
+
+    """
+    for record in graph_records(after=after, limit=limit, tag=tag, author=author):
+        yield _line(record)
+
+
+def publish_article(article_id: int) -> None:
+    """Publish a new article's node and its edges to the live graph streams.
+
+    Must be called after the article is committed. Its edges all point to
+    lower ids, so the article's page of ``graph_records`` holds all of them.
+
+    Args:
+        article_id: Id of the committed article
+
+    """
+    for record in graph_records(after=article_id - 1, limit=1):
+        if record["type"] != "cursor":
+            publish(record["type"], record)
+
+
+@graph_bp.route("/graph")
+def graph_data() -> Response:
+    """Stream graph nodes and edges as NDJSON.
+
+    Requires authentication.
+
+    Query parameters:
+        cursor: Article id to resume after (default 0)
+        limit: Maximum number of nodes in this page (default: all)
+        tag: Only include articles with this tag
+        author: Only include articles submitted by this username
+
+    Returns:
+        Response: Streaming ``application/x-ndjson`` response
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    after = request.args.get("cursor", 0, type=int)
+    limit = request.args.get("limit", type=int)
+    if limit is not None and limit < 1:
+        abort(400)
+
+    records = stream_graph(
+        after=after,
+        limit=limit,
+        tag=request.args.get("tag"),
+        author=request.args.get("author"),
+    )
+    return Response(stream_with_context(records), mimetype="application/x-ndjson")
+
+
+@graph_bp.route("/graph/events")
+def graph_events() -> Response:
+    """Stream live graph updates as Server-Sent Events.
+
+    Requires authentication. Sends ``node`` and ``edge`` records (as in
+    ``/api/graph``) for new articles and ``score`` records for votes. A
+    reconnecting client resumes after its ``Last-Event-ID`` header (or
+    ``last_event_id`` query parameter); a ``reset`` event means updates were
+    missed and the graph should be reloaded.
+
+    Returns:
+        Response: Streaming ``text/event-stream`` response
+
+    Raises:
+        SubscriberLimitError: If the subscriber cap is reached (served as 503)
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    last_event_id = request.headers.get("Last-Event-ID", request.args.get("last_event_id"))
+    if last_event_id is not None:
+        if not last_event_id.isdigit():
+            abort(400)
+        last_event_id = int(last_event_id)
+
+    config = current_app.config
+    channel = current_app.extensions["events"]
+    subscription = channel.subscribe()
+    messages = channel.stream(
+        subscription,
+        last_event_id=last_event_id,
+        heartbeat=config["EVENTS_HEARTBEAT_SECONDS"],
+        max_seconds=config["EVENTS_MAX_STREAM_SECONDS"],
+    )
+    response = Response(messages, mimetype="text/event-stream")
+    # The slot is also released if the response is closed before streaming starts
+    response.call_on_close(subscription.close)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@graph_bp.route("/articles/<int:article_id>/similar")
+def similar(article_id: int) -> Response:
+    """Return the articles most similar to the given one by embedding.
+
+    Requires authentication.
+
+    Query parameters:
+        k: Maximum number of neighbours (default 10, at most MAX_SIMILAR)
+
+    Returns:
+        Response: JSON list of ``{id, title, score}`` objects, best first
+
+    """
+    if not current_user.is_authenticated:
+        abort(401)
+
+    k = request.args.get("k", 10, type=int)
+    if not 1 <= k <= MAX_SIMILAR:
+        abort(400)
+
+    return jsonify([
+        {"id": article.id, "title": article.title, "score": round(score, 6)}
+        for article, score in similarity_service.similar_articles(article_id, k)
+    ])
@@ -0,0 +1,145 @@
+"""Production WSGI serving for Constellate.
+
+Runs the application factory under gunicorn's pre-forking multi-worker server.
+Workers are threaded (gthread): each Server-Sent Events stream holds a request
+thread for its whole lifetime, which a sync worker would spend entirely on one
+client (and kill after the worker timeout).
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from flask import Flask
+
+from database import dispose_engines
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # pragma: no cover - gunicorn is not available on Windows
+    BaseApplication = None
+
+
+def post_fork(_server: object, worker: Any) -> None:  # noqa: ANN401 - gunicorn worker
+    """Gunicorn hook: give each forked worker its own database connection pool."""
+    dispose_engines(worker.app.wsgi())
+
+
+def fit_event_streams(app: Flask, threads: int, timeout: float) -> None:
+    """Keep the event streams of a worker within its threads and timeout.
+
+    Streams may take the threads beyond ``EVENTS_RESERVED_THREADS`` (none on
+    a worker with fewer threads; further streams get 503), and heartbeats are
+    sent at least twice per worker timeout.
+
+    Args:
+        app: Flask app served by the worker
+        threads: Request threads per worker
+        timeout: Worker timeout in seconds
+
+    """
+    config = app.config
+    streams = max(threads - config["EVENTS_RESERVED_THREADS"], 0)
+    config["EVENTS_MAX_SUBSCRIBERS"] = min(config["EVENTS_MAX_SUBSCRIBERS"], streams)
+    config["EVENTS_HEARTBEAT_SECONDS"] = min(config["EVENTS_HEARTBEAT_SECONDS"], timeout / 2)
+    app.extensions["events"].bus.max_subscribers = config["EVENTS_MAX_SUBSCRIBERS"]
+
+
+def build_options(  # noqa: PLR0913, PLR0917 - one argument per server option
+    bind: str,
+    workers: int,
+    threads: int,
+    timeout: int = 30,
+    graceful_timeout: int = 30,
+    max_requests: int = 0,
+    *,
+    preload: bool = True,
+) -> dict[str, Any]:
+    """Build the gunicorn settings for the serve command.
+
+    Args:
+        bind: Address to listen on, e.g. ``0.0.0.0:8000``
+        workers: Number of worker processes
+        threads: Request threads per worker (see ``fit_event_streams``)
+        timeout: Seconds before a silent worker is killed and restarted
+        graceful_timeout: Seconds workers get to finish requests on reload/stop
+        max_requests: Restart workers after this many requests (0 disables)
+        preload: Import the app once in the master before forking
+
+    Returns:
+        dict: Gunicorn settings
+
+    """
+    return {
+        "bind": bind,
+        "workers": workers,
+        "threads": threads,
+        "worker_class": "gthread",
+        "timeout": timeout,
+        "graceful_timeout": graceful_timeout,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "preload_app": preload,
+        "post_fork": post_fork,
+    }
+
+
+if BaseApplication is not None:
+
+    class GunicornApplication(BaseApplication):
+        """Gunicorn application serving an app built by a factory.
+
+        Send ``SIGHUP`` to the master for a graceful reload: the app is built
+        again from the factory (in the master when preloading), new workers are
+        started with it and old ones finish their in-flight requests first.
+        Modules the master has already imported are not imported again, so
+        deploying new code takes a restart.
+        """
+
+        def __init__(self, app_factory: Callable[[], Flask], options: dict[str, Any]) -> None:
+            """Create the gunicorn application.
+
+            Args:
+                app_factory: Callable returning the Flask app
+                options: Gunicorn settings (see ``build_options``)
+
+            """
+            self.app_factory = app_factory
+            self.options = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            """Apply the settings to gunicorn's config."""
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Flask:
+            """Build the Flask app (in the master when preloading)."""
+            app = self.app_factory()
+            fit_event_streams(app, self.cfg.threads, self.cfg.timeout)
+            return app
+
+        def reload(self) -> None:
+            """Reapply the settings and drop the app built so far (on ``SIGHUP``).
+
+            Gunicorn caches the app in ``callable``; with preloading, the master
+            would otherwise hand the old app to the new workers.
+            """
+            self.callable = None
+            super().reload()
+
+
+def serve(app_factory: Callable[[], Flask], options: dict[str, Any]) -> None:
+    """Run the app under gunicorn until the master exits.
+
+    Args:
+        app_factory: Callable returning the Flask app
+        options: Gunicorn settings (see ``build_options``)
+
+    Raises:
+        RuntimeError: If gunicorn is not installed
+
+    """
+    if BaseApplication is None:
+        msg = "The serve command requires gunicorn (not available on Windows)"
+        raise RuntimeError(msg)
+    GunicornApplication(app_factory, options).run()
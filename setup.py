@@ -14,10 +14,14 @@ setup(
     ),
     author="OstarkovSN, Cursor",
     packages=find_packages(),
+    py_modules=["app", "cache", "config", "database", "hashing", "lazy", "profiling", "server"],
+    entry_points={"console_scripts": ["constellate=app:main"]},
     install_requires=[
         "flask>=3.0.0",
         "flask-login>=0.6.3",
         "flask-wtf>=1.2.1",
+        "gunicorn>=22.0; sys_platform != 'win32'",
+        "numpy>=1.26",
         "sqlalchemy>=2.0.0",
         "werkzeug>=3.0.0",
         "wtforms>=3.1.0",
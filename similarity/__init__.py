@@ -0,0 +1,4 @@
+"""Similarity package for Constellate.
+
+Contains text embedders and the vector index used for article similarity edges.
+"""
@@ -0,0 +1,220 @@
+"""Approximate nearest-neighbour index (IVF-flat) over article vectors.
+
+The vectors are stored exactly as in ``SimilarityIndex``; on top of them the
+index keeps k-means centroids and the list (centroid) of every record, so a
+query only scores the records of the ``nprobe`` closest lists.
+"""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from similarity.index import SimilarityIndex, normalize
+
+
+def kmeans(
+    vectors: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0,
+) -> np.ndarray:
+    """Cluster unit vectors with spherical k-means (Lloyd iterations).
+
+    Args:
+        vectors: Array of shape ``(n, dim)`` with ``n >= n_clusters``
+        n_clusters: Number of centroids
+        n_iter: Number of assignment/update rounds
+        seed: Seed for the initial centroid sample
+
+    Returns:
+        np.ndarray: float32 unit centroids of shape ``(n_clusters, dim)``
+
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = ~sums.any(axis=1)
+        # Re-seed empty clusters with random points so every list stays usable
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex(SimilarityIndex):
+    """Inverted-file index answering approximate top-k cosine queries.
+
+    ``train`` persists the centroids and the list of every record present at
+    training time. Records appended afterwards (by any process) are assigned
+    to their nearest list in memory when the file is re-mapped, so inserts
+    never retrain. Untrained indexes fall back to the exact parent search.
+
+    Attributes:
+        nlist: Number of lists (0 picks ``sqrt(n)`` when training)
+        nprobe: Number of lists scored per query
+
+    """
+
+    CENTROIDS = "centroids.npy"
+    ASSIGNMENTS = "lists.bin"
+
+    def __init__(
+        self,
+        directory: Path,
+        dim: int,
+        chunk_rows: int = 65536,
+        nlist: int = 0,
+        nprobe: int = 8,
+    ) -> None:
+        """Open (or create) an IVF index in ``directory``.
+
+        Args:
+            directory: Directory holding the index files
+            dim: Vector dimensionality
+            chunk_rows: Rows scored per matrix product by the exact fallback
+            nlist: Number of lists (0 picks ``sqrt(n)`` when training)
+            nprobe: Number of lists scored per query
+
+        """
+        super().__init__(directory, dim, chunk_rows)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        if not self.path.exists():
+            self._centroid_path.unlink(missing_ok=True)
+            self._assign_path.unlink(missing_ok=True)
+        self._centroids: np.ndarray | None = None
+        self._centroid_mtime: float | None = None
+        self._assignments = np.empty(0, dtype="<i4")
+        self._lists: list[np.ndarray] = []
+
+    @property
+    def _centroid_path(self) -> Path:
+        return self.directory / self.CENTROIDS
+
+    @property
+    def _assign_path(self) -> Path:
+        return self.directory / self.ASSIGNMENTS
+
+    @property
+    def trained(self) -> bool:
+        """Whether centroids are available."""
+        self._load_centroids()
+        return self._centroids is not None
+
+    def _load_centroids(self) -> None:
+        """(Re)load the centroids if another process trained the index."""
+        mtime = self._centroid_path.stat().st_mtime if self._centroid_path.exists() else None
+        if mtime == self._centroid_mtime:
+            return
+        self._centroid_mtime = mtime
+        self._centroids = None
+        self._assignments = np.empty(0, dtype="<i4")
+        self._size = -1
+        if mtime is not None:
+            centroids = np.load(self._centroid_path)
+            if centroids.shape[1] == self.dim:
+                self._centroids = centroids
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Return the nearest list of each (normalized) vector."""
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype("<i4")
+
+    def _refresh(self) -> None:
+        """Re-map the vector file and update the inverted lists if it changed."""
+        self._load_centroids()
+        size = self._size
+        super()._refresh()
+        if size == self._size or self._centroids is None:
+            return
+        count = len(self._records)
+        known = len(self._assignments)
+        if known > count:
+            known = 0
+        if not known and self._assign_path.exists():
+            stored = np.fromfile(self._assign_path, dtype="<i4")
+            known = min(len(stored), count)
+            self._assignments = stored[:known]
+        tail = [
+            self._assign(np.asarray(self._records["vec"][start:start + self.chunk_rows]))
+            for start in range(known, count, self.chunk_rows)
+        ]
+        self._assignments = np.concatenate([self._assignments[:known], *tail])
+
+        # Inverted lists hold live rows only, grouped by list id
+        rows = np.flatnonzero(self._live)
+        rows = rows[np.argsort(self._assignments[rows], kind="stable")]
+        bounds = np.searchsorted(self._assignments[rows], np.arange(len(self._centroids) + 1))
+        self._lists = [rows[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+
+    def rebuild(self, batches: Iterable[tuple[Iterable[int], np.ndarray]]) -> int:
+        """Replace all vectors, then retrain the lists.
+
+        Args:
+            batches: ``(ids, vectors)`` pairs, vectors of shape ``(len(ids), dim)``
+
+        Returns:
+            int: Number of vectors written
+
+        """
+        written = super().rebuild(batches)
+        self.train()
+        return written
+
+    def train(self, sample_size: int = 100_000, seed: int = 0) -> None:
+        """Compute centroids from (a sample of) the stored vectors and assign all rows.
+
+        Does nothing but drop the lists if there are fewer vectors than lists.
+
+        Args:
+            sample_size: Maximum number of vectors used for k-means
+            seed: Random seed for sampling and initialization
+
+        """
+        self._refresh()
+        rows = np.flatnonzero(self._live)
+        nlist = self.nlist or max(1, int(np.sqrt(len(rows))))
+        self._centroid_path.unlink(missing_ok=True)
+        self._assign_path.unlink(missing_ok=True)
+        self._load_centroids()
+        self._lists = []
+        if len(rows) < nlist or not len(rows):
+            return
+
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(rows, min(sample_size, len(rows)), replace=False))
+        centroids = kmeans(np.asarray(self._records["vec"][sample]), nlist, seed=seed)
+        self._centroids = centroids
+
+        tmp_path = self._assign_path.with_suffix(".tmp")
+        with tmp_path.open("wb") as file:
+            for start in range(0, len(self._records), self.chunk_rows):
+                block = np.asarray(self._records["vec"][start:start + self.chunk_rows])
+                file.write(self._assign(block).tobytes())
+        tmp_path.replace(self._assign_path)
+        np.save(self._centroid_path, centroids)
+        self._load_centroids()
+
+    def search(self, queries: np.ndarray, k: int) -> list[list[tuple[int, float]]]:
+        """Find approximately the ``k`` most similar vectors for each query.
+
+        Args:
+            queries: Array of shape ``(m, dim)`` (or a single vector)
+            k: Number of neighbours per query
+
+        Returns:
+            list: For each query, ``(article_id, cosine)`` pairs, best first
+
+        """
+        self._refresh()
+        if not self.trained:
+            return super().search(queries, k)
+        queries = normalize(queries)
+        probes = np.argsort(-(queries @ self._centroids.T), axis=1)[:, :self.nprobe]
+        ids = np.asarray(self._records["id"])
+        results = []
+        for query, lists in zip(queries, probes, strict=True):
+            rows = np.sort(np.concatenate([self._lists[i] for i in lists]))
+            scores = np.asarray(self._records["vec"][rows]) @ query
+            top = np.argsort(-scores, kind="stable")[:k]
+            results.append([(int(ids[rows[i]]), float(scores[i])) for i in top])
+        return results
@@ -0,0 +1,139 @@
+"""Text embedders producing article vectors.
+
+Defines the Embedder interface, a deterministic local hashing embedder, the
+embedder delegating to the app's LLM agent and the registry used to select an
+embedder by name.
+"""
+
+import hashlib
+import re
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from lazy import lazy_import
+
+agents_service = lazy_import("agents.service")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class Embedder(ABC):
+    """Interface for text embedders.
+
+    Attributes:
+        name: Identifier stored alongside each vector
+        dim: Dimensionality of produced vectors
+
+    """
+
+    name: str
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape ``(len(texts), dim)``
+
+        """
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic bag-of-words embedder based on feature hashing.
+
+    Needs no model download, so it is used for tests and as the default local
+    embedder. Texts sharing words get a positive cosine similarity.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 256) -> None:
+        """Create a hashing embedder.
+
+        Args:
+            dim: Number of hash buckets (vector dimensionality)
+
+        """
+        self.dim = dim
+
+    def _bucket(self, token: str) -> tuple[int, float]:
+        """Map a token to a bucket index and a +1/-1 sign."""
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts as L2-normalized hashed token counts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape ``(len(texts), dim)``
+
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN_RE.findall(text.lower()):
+                bucket, sign = self._bucket(token)
+                vectors[row, bucket] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class AgentEmbedder(Embedder):
+    """Embedder delegating to the app's agent (see ``agents.service``).
+
+    Its name includes the agent's model, so vectors of different models are
+    kept in separate indexes and switching models re-embeds the articles.
+    """
+
+    def __init__(self) -> None:
+        """Bind the embedder to the current app's agent."""
+        self.agent = agents_service.get_app_agent()
+        self.name = f"agent-{self.agent.model}"
+        self.dim = self.agent.dim
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts with the agent.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: float32 array of shape ``(len(texts), dim)``
+
+        """
+        return self.agent.embed(texts)
+
+
+# Registry of available embedders by name
+EMBEDDERS: dict[str, type[Embedder]] = {
+    HashingEmbedder.name: HashingEmbedder,
+    "agent": AgentEmbedder,
+}
+
+
+def get_embedder(name: str) -> Embedder:
+    """Instantiate a registered embedder.
+
+    Args:
+        name: Registered embedder name
+
+    Returns:
+        Embedder: New embedder instance
+
+    Raises:
+        KeyError: If no embedder is registered under ``name``
+
+    """
+    try:
+        return EMBEDDERS[name]()
+    except KeyError:
+        msg = f"Unknown embedder {name!r}; available: {', '.join(sorted(EMBEDDERS))}"
+        raise KeyError(msg) from None
@@ -0,0 +1,232 @@
+"""Exact cosine similarity index over a memory-mapped vector file.
+
+Vectors are appended to a single binary file of ``(id, vector)`` records and
+searched with chunked NumPy matrix products, so the matrix is never fully
+loaded into memory and new articles only cost an append.
+"""
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so that dot products equal cosine similarities.
+
+    Args:
+        vectors: Array of shape ``(n, dim)``
+
+    Returns:
+        np.ndarray: float32 array of normalized rows (zero rows stay zero)
+
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class SimilarityIndex:
+    """Exact top-k cosine search over article vectors.
+
+    Records are only ever appended: an update appends a new record for the
+    same id (the last one wins) and a removal appends a tombstone with the
+    negated id. Other processes appending to the same file are picked up on
+    the next query by comparing the file size.
+
+    Attributes:
+        directory: Directory holding the index files
+        dim: Vector dimensionality
+        chunk_rows: Rows scored per matrix product, bounding peak memory
+
+    """
+
+    FILENAME = "vectors.bin"
+    META = "index.json"
+
+    def __init__(self, directory: Path, dim: int, chunk_rows: int = 65536) -> None:
+        """Open (or create) an index in ``directory``.
+
+        An existing index with a different dimensionality is discarded.
+
+        Args:
+            directory: Directory holding the index files
+            dim: Vector dimensionality
+            chunk_rows: Rows scored per matrix product
+
+        """
+        self.directory = Path(directory)
+        self.dim = dim
+        self.chunk_rows = chunk_rows
+        self.dtype = np.dtype([("id", "<i8"), ("vec", "<f4", (dim,))])
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        meta_path = self.directory / self.META
+        if meta_path.exists() and json.loads(meta_path.read_text()).get("dim") != dim:
+            self.path.unlink(missing_ok=True)
+        meta_path.write_text(json.dumps({"dim": dim}))
+
+        self._size = -1
+        self._records: np.ndarray = np.empty(0, dtype=self.dtype)
+        self._live = np.empty(0, dtype=bool)
+        self._row_of: dict[int, int] = {}
+
+    @property
+    def path(self) -> Path:
+        """Path of the vector file."""
+        return self.directory / self.FILENAME
+
+    def _refresh(self) -> None:
+        """Re-map the vector file if it changed size since the last access."""
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size == self._size:
+            return
+        count = size // self.dtype.itemsize
+        if count:
+            self._records = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(count,))
+        else:
+            self._records = np.empty(0, dtype=self.dtype)
+        ids = np.asarray(self._records["id"])
+        # The last record of every id wins; tombstones (negative ids) are never live.
+        _, first_from_end = np.unique(np.abs(ids)[::-1], return_index=True)
+        last = count - 1 - first_from_end
+        self._live = np.zeros(count, dtype=bool)
+        self._live[last[ids[last] > 0]] = True
+        rows = np.flatnonzero(self._live)
+        self._row_of = dict(zip(ids[rows].tolist(), rows.tolist(), strict=True))
+        self._size = size
+
+    def __len__(self) -> int:
+        """Number of live vectors."""
+        self._refresh()
+        return len(self._row_of)
+
+    def __contains__(self, article_id: int) -> bool:
+        """Whether a live vector is stored for ``article_id``."""
+        self._refresh()
+        return article_id in self._row_of
+
+    def _append(self, records: np.ndarray) -> None:
+        """Append records to the vector file in a single write."""
+        with self.path.open("ab") as file:
+            file.write(records.tobytes())
+
+    def _records_for(self, ids: Iterable[int], vectors: np.ndarray) -> np.ndarray:
+        """Pack ids and vectors into the on-disk record layout."""
+        ids = np.fromiter(ids, dtype="<i8")
+        records = np.empty(len(ids), dtype=self.dtype)
+        records["id"] = ids
+        records["vec"] = vectors
+        return records
+
+    def add(self, ids: Iterable[int], vectors: np.ndarray) -> None:
+        """Add or replace the vectors of the given articles.
+
+        Args:
+            ids: Article ids (positive)
+            vectors: Array of shape ``(len(ids), dim)``
+
+        """
+        self._append(self._records_for(ids, normalize(vectors)))
+
+    def remove(self, ids: Iterable[int]) -> None:
+        """Remove the vectors of the given articles.
+
+        Args:
+            ids: Article ids
+
+        """
+        ids = [-abs(article_id) for article_id in ids]
+        self._append(self._records_for(ids, np.zeros((len(ids), self.dim), np.float32)))
+
+    def rebuild(self, batches: Iterable[tuple[Iterable[int], np.ndarray]]) -> int:
+        """Replace the whole index, dropping superseded records and tombstones.
+
+        Batches are written one at a time, so the full matrix is never held
+        in memory.
+
+        Args:
+            batches: ``(ids, vectors)`` pairs, vectors of shape ``(len(ids), dim)``
+
+        Returns:
+            int: Number of vectors written
+
+        """
+        tmp_path = self.path.with_suffix(".tmp")
+        written = 0
+        with tmp_path.open("wb") as file:
+            for ids, vectors in batches:
+                records = self._records_for(ids, normalize(vectors))
+                file.write(records.tobytes())
+                written += len(records)
+        self._records = np.empty(0, dtype=self.dtype)  # release the old mapping
+        self._size = -1
+        tmp_path.replace(self.path)
+        return written
+
+    def vector(self, article_id: int) -> np.ndarray | None:
+        """Return the stored (normalized) vector of an article, if any."""
+        self._refresh()
+        row = self._row_of.get(article_id)
+        return None if row is None else np.array(self._records["vec"][row])
+
+    def search(self, queries: np.ndarray, k: int) -> list[list[tuple[int, float]]]:
+        """Find the ``k`` most similar vectors for each query.
+
+        Args:
+            queries: Array of shape ``(m, dim)`` (or a single vector)
+            k: Number of neighbours per query
+
+        Returns:
+            list: For each query, ``(article_id, cosine)`` pairs, best first
+
+        """
+        self._refresh()
+        queries = normalize(queries)
+        count = len(self._records)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, count, self.chunk_rows):
+            stop = min(start + self.chunk_rows, count)
+            block = np.ascontiguousarray(self._records["vec"][start:stop])
+            scores = queries @ block.T
+            scores[:, ~self._live[start:stop]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, stop), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        ids = np.asarray(self._records["id"])
+        return [
+            [
+                (int(ids[row]), float(score))
+                for row, score in zip(rows, scores, strict=True)
+                if np.isfinite(score)
+            ]
+            for rows, scores in zip(best_rows, best_scores, strict=True)
+        ]
+
+    def neighbours(self, article_id: int, k: int) -> list[tuple[int, float]]:
+        """Find the ``k`` articles most similar to a stored article.
+
+        Args:
+            article_id: Article whose vector is used as the query
+            k: Number of neighbours (the article itself is excluded)
+
+        Returns:
+            list: ``(article_id, cosine)`` pairs, best first; empty if the
+                article has no vector
+
+        """
+        vector = self.vector(article_id)
+        if vector is None:
+            return []
+        (results,) = self.search(vector, k + 1)
+        return [(other, score) for other, score in results if other != article_id][:k]
@@ -0,0 +1,206 @@
+"""Application-level access to article embeddings and the similarity index.
+
+Embedder and index instances are created lazily per Flask app and cached in
+``app.extensions["similarity"]``.
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+from flask import current_app
+
+from database import db, replica_reads
+from models.article import Article
+from models.embedding import ArticleEmbedding
+from models.extraction import article_pdf_text
+from similarity.ann import IVFIndex
+from similarity.embedders import Embedder, get_embedder
+from similarity.index import SimilarityIndex
+
+
+def _state() -> dict:
+    """Return the per-app similarity state dictionary."""
+    return current_app.extensions.setdefault("similarity", {})
+
+
+def get_app_embedder() -> Embedder:
+    """Return the embedder selected by the ``EMBEDDER`` config value."""
+    state = _state()
+    if "embedder" not in state:
+        state["embedder"] = get_embedder(current_app.config["EMBEDDER"])
+    return state["embedder"]
+
+
+def _open_index() -> SimilarityIndex:
+    """Open the index for the current embedder and cache it on the app.
+
+    ``SIMILARITY_BACKEND`` selects the exact index (``"exact"``) or the
+    approximate IVF index (``"ivf"``); both share the same vector file.
+    """
+    config = current_app.config
+    embedder = get_app_embedder()
+    directory = Path(config["EMBEDDING_DIR"]) / embedder.name
+    backend = config["SIMILARITY_BACKEND"]
+    if backend == "exact":
+        index = SimilarityIndex(directory, embedder.dim, chunk_rows=config["SIMILARITY_CHUNK_ROWS"])
+    elif backend == "ivf":
+        index = IVFIndex(
+            directory,
+            embedder.dim,
+            chunk_rows=config["SIMILARITY_CHUNK_ROWS"],
+            nlist=config["IVF_NLIST"],
+            nprobe=config["IVF_NPROBE"],
+        )
+    else:
+        msg = f"Unknown similarity backend {backend!r}; expected 'exact' or 'ivf'"
+        raise ValueError(msg)
+    _state()["index"] = index
+    return index
+
+
+def get_index() -> SimilarityIndex:
+    """Return the app's similarity index, opening it on first use.
+
+    The index is rebuilt from the ``article_embeddings`` table if its file is
+    empty, e.g. on first start or after switching embedders.
+    """
+    index = _state().get("index")
+    if index is None:
+        index = _open_index()
+        if not len(index):
+            index.rebuild(_stored_batches())
+    return index
+
+
+def article_text(article: Article) -> str:
+    """Build the text embedded for an article (title, tags and summary)."""
+    return "\n".join(part for part in (article.title, article.tags, article.summary) if part)
+
+
+def embedding_text(article: Article) -> str:
+    """Build the text embedded for an article: ``article_text`` and the start of its PDF.
+
+    At most ``EMBEDDING_PDF_CHARS`` characters of the PDF text are used; the
+    text comes from the extraction cache, so re-embedding (e.g. with a new
+    embedder) does not parse the PDF again.
+    """
+    text = article_text(article)
+    limit = current_app.config["EMBEDDING_PDF_CHARS"]
+    if limit:
+        extracted = article_pdf_text(article, "embed")
+        if extracted is not None and extracted.text:
+            text += "\n" + extracted.text[:limit]
+    return text
+
+
+def embed_articles(articles: list[Article]) -> int:
+    """Compute, store and index embeddings for the given articles.
+
+    Args:
+        articles: Articles to (re)embed
+
+    Returns:
+        int: Number of articles embedded
+
+    """
+    if not articles:
+        return 0
+    embedder = get_app_embedder()
+    vectors = embedder.embed([embedding_text(article) for article in articles])
+    for article, vector in zip(articles, vectors, strict=True):
+        if article.embedding is None:
+            article.embedding = ArticleEmbedding(model=embedder.name)
+        article.embedding.model = embedder.name
+        article.embedding.array = vector
+    db.session.commit()
+    get_index().add([article.id for article in articles], vectors)
+    return len(articles)
+
+
+def embed_missing(batch_size: int = 256) -> int:
+    """Embed every article without an embedding from the current embedder.
+
+    Args:
+        batch_size: Articles embedded per batch (and per transaction)
+
+    Returns:
+        int: Number of articles embedded
+
+    """
+    embedder = get_app_embedder()
+    total = 0
+    last_id = 0
+    while True:
+        batch = (
+            Article.query.outerjoin(ArticleEmbedding)
+            .filter(
+                Article.id > last_id,
+                (ArticleEmbedding.article_id.is_(None)) | (ArticleEmbedding.model != embedder.name),
+            )
+            .order_by(Article.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return total
+        total += embed_articles(batch)
+        last_id = batch[-1].id
+
+
+def _stored_batches(batch_size: int = 4096) -> Iterator[tuple[list[int], np.ndarray]]:
+    """Yield stored embeddings of the current embedder in primary-key batches."""
+    embedder = get_app_embedder()
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(ArticleEmbedding.article_id, ArticleEmbedding.vector)
+            .where(
+                ArticleEmbedding.article_id > last_id,
+                ArticleEmbedding.model == embedder.name,
+                ArticleEmbedding.dim == embedder.dim,
+            )
+            .order_by(ArticleEmbedding.article_id)
+            .limit(batch_size),
+        ).all()
+        if not rows:
+            return
+        vectors = np.frombuffer(b"".join(row.vector for row in rows), dtype="<f4")
+        yield [row.article_id for row in rows], vectors.reshape(len(rows), embedder.dim)
+        last_id = rows[-1].article_id
+
+
+def rebuild_index() -> int:
+    """Rebuild the on-disk index from the ``article_embeddings`` table.
+
+    For the IVF backend this also retrains the lists.
+
+    Returns:
+        int: Number of vectors indexed
+
+    """
+    index = _state().get("index")
+    if index is None:
+        index = _open_index()
+    return index.rebuild(_stored_batches())
+
+
+@replica_reads()
+def similar_articles(article_id: int, k: int = 10) -> list[tuple[Article, float]]:
+    """Find the articles most similar to the given one.
+
+    Args:
+        article_id: Article to find neighbours for
+        k: Maximum number of neighbours
+
+    Returns:
+        list: ``(article, cosine)`` pairs, best first; articles deleted since
+            they were indexed are skipped
+
+    """
+    neighbours = get_index().neighbours(article_id, k)
+    articles = {
+        article.id: article
+        for article in Article.query.filter(Article.id.in_([i for i, _ in neighbours]))
+    }
+    return [(articles[i], score) for i, score in neighbours if i in articles]
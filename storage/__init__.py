@@ -0,0 +1,5 @@
+"""Storage package for Constellate.
+
+Contains the content-addressed blob store holding uploaded PDF files and the
+helper serving them over HTTP.
+"""
@@ -0,0 +1,267 @@
+"""Content-addressed blob store.
+
+Files are stored once under the hex SHA-256 of their content, in a two-level
+fan-out (``ab/cd/abcd...``) below the store root, so uploading the same PDF
+twice costs no extra disk. Uploads are streamed to a temporary file in
+``tmp/`` while they are hashed, then renamed into place; stored files are
+never modified. Which blobs are still referenced is tracked in the database
+(see ``models.blob``).
+
+``send_blob`` serves a blob with ETag and Range support, streaming it from
+disk, or hands the transfer to the front-end server with ``X-Sendfile``
+(Apache, lighttpd) or ``X-Accel-Redirect`` (nginx).
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from collections.abc import Iterator
+from http import HTTPStatus
+from pathlib import Path
+from typing import BinaryIO
+
+from flask import Response, current_app, request
+from werkzeug.exceptions import NotFound
+from werkzeug.utils import send_file
+
+# Blob keys are lowercase hex SHA-256 digests
+_KEY = re.compile(r"^[0-9a-f]{64}$")
+
+# Offload modes of send_blob: response header naming the file for the front-end server
+OFFLOAD_HEADERS = {"sendfile": "X-Sendfile", "accel": "X-Accel-Redirect"}
+
+
+def is_blob_key(value: str) -> bool:
+    """Tell whether a string is a well-formed blob key."""
+    return bool(_KEY.match(value))
+
+
+class BlobStore:
+    """Directory of immutable files named by the SHA-256 of their content.
+
+    Attributes:
+        root: Store directory (created on first write)
+        chunk_size: Bytes read and hashed at a time when storing a stream
+
+    """
+
+    def __init__(self, root: str | Path, chunk_size: int = 1 << 20) -> None:
+        """Open a store.
+
+        Args:
+            root: Store directory
+            chunk_size: Bytes read per chunk when storing a stream
+
+        """
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+
+    def relative_path(self, key: str) -> str:
+        """Return the path of a blob relative to the store root.
+
+        Raises:
+            ValueError: If the key is not a SHA-256 hex digest
+
+        """
+        if not is_blob_key(key):
+            msg = f"Invalid blob key {key!r}"
+            raise ValueError(msg)
+        return f"{key[:2]}/{key[2:4]}/{key}"
+
+    def path(self, key: str) -> Path:
+        """Return the file path of a blob (which may not exist)."""
+        return self.root / self.relative_path(key)
+
+    def exists(self, key: str) -> bool:
+        """Tell whether a blob is stored."""
+        return self.path(key).is_file()
+
+    def writer(self) -> "BlobWriter":
+        """Start storing content written in pieces (see ``BlobWriter``)."""
+        return BlobWriter(self)
+
+    def put(self, stream: BinaryIO) -> tuple[str, int]:
+        """Store the content of a binary stream, reading it in chunks.
+
+        Args:
+            stream: Binary stream, read to the end
+
+        Returns:
+            tuple: Key (hex SHA-256) and size in bytes of the content
+
+        """
+        writer = self.writer()
+        try:
+            while chunk := stream.read(self.chunk_size):
+                writer.write(chunk)
+            return writer.commit()
+        finally:
+            writer.abort()
+
+    def delete(self, key: str, older_than: float | None = None) -> bool:
+        """Remove a blob's file.
+
+        Args:
+            key: Blob key
+            older_than: Keep the file if it was modified at or after this
+                time (seconds since the epoch), i.e. stored again meanwhile
+
+        Returns:
+            bool: Whether the file was removed
+
+        """
+        path = self.path(key)
+        try:
+            if older_than is not None and path.stat().st_mtime >= older_than:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def scan(self) -> Iterator[tuple[str, float]]:
+        """Yield the key and modification time of every stored blob."""
+        if not self.root.is_dir():
+            return
+        for path in self.root.glob("??/??/*"):
+            if is_blob_key(path.name):
+                yield path.name, path.stat().st_mtime
+
+    def remove_stale_parts(self, older_than: float) -> int:
+        """Remove temporary files left by interrupted uploads.
+
+        Args:
+            older_than: Remove files last modified before this time (seconds since the epoch)
+
+        Returns:
+            int: Number of files removed
+
+        """
+        removed = 0
+        for part in (self.root / "tmp").glob("*.part"):
+            if part.stat().st_mtime < older_than:
+                part.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class BlobWriter:
+    """Content being stored, written in pieces.
+
+    The content goes to a temporary file while it is hashed, so memory use
+    does not depend on its size. ``commit`` moves the file into place; if a
+    blob with the same content is already stored, the copy is discarded and
+    the stored file's modification time is refreshed (protecting it from a
+    concurrent garbage collection). Callers ``abort`` in a ``finally``
+    clause, which removes the temporary file unless it was committed.
+
+    Attributes:
+        size: Bytes written so far
+
+    """
+
+    def __init__(self, store: BlobStore) -> None:
+        """Create the temporary file.
+
+        Args:
+            store: Store receiving the content
+
+        """
+        self.store = store
+        staging = store.root / "tmp"
+        staging.mkdir(parents=True, exist_ok=True)
+        descriptor, name = tempfile.mkstemp(dir=staging, suffix=".part")
+        self._file = os.fdopen(descriptor, "wb")
+        self._part = Path(name)
+        self._digest = hashlib.sha256()
+        self._committed = False
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        """Hash and write a piece of the content."""
+        self._digest.update(data)
+        self._file.write(data)
+        self.size += len(data)
+
+    def commit(self) -> tuple[str, int]:
+        """Move the content into the store.
+
+        Returns:
+            tuple: Key (hex SHA-256) and size in bytes of the content
+
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        key = self._digest.hexdigest()
+        target = self.store.path(key)
+        if target.is_file():
+            self._part.unlink()
+            os.utime(target)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._part.chmod(0o644)
+            self._part.replace(target)
+        self._committed = True
+        return key, self.size
+
+    def abort(self) -> None:
+        """Remove the temporary file (no-op after ``commit``)."""
+        self._file.close()
+        if not self._committed:
+            self._part.unlink(missing_ok=True)
+
+
+def send_blob(key: str, download_name: str, mimetype: str = "application/pdf") -> Response:
+    """Serve a blob of the app's store for the current request.
+
+    The ETag is the blob key, so clients revalidate with a cheap 304. Without
+    offload the file is streamed from disk in blocks and ``Range`` requests
+    get 206 partial responses; with ``BLOB_OFFLOAD`` set, the response only
+    names the file and the front-end server sends it (handling ranges
+    itself), so no worker is tied up by large downloads.
+
+    Args:
+        key: Blob key
+        download_name: File name suggested to the browser
+        mimetype: Content type of the blob
+
+    Returns:
+        Response: File, partial content, 304 or offload response
+
+    Raises:
+        NotFound: If the blob's file is missing
+
+    """
+    store: BlobStore = current_app.extensions["blobs"]
+    path = store.path(key)
+    if not path.is_file():
+        raise NotFound
+    offload = current_app.config["BLOB_OFFLOAD"]
+    if offload is None:
+        response = send_file(
+            path,
+            request.environ,
+            mimetype=mimetype,
+            download_name=download_name,
+            etag=key,
+            response_class=current_app.response_class,
+        )
+    else:
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers[OFFLOAD_HEADERS[offload]] = (
+            str(path.resolve())
+            if offload == "sendfile"
+            else current_app.config["BLOB_ACCEL_PREFIX"] + store.relative_path(key)
+        )
+        response.headers.set("Content-Disposition", "inline", filename=download_name)
+        response.set_etag(key)
+        response = response.make_conditional(request.environ)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            response.headers.pop(OFFLOAD_HEADERS[offload], None)
+    # Articles can get a new PDF, so the URL is revalidated rather than cached
+    response.cache_control.no_cache = True
+    response.cache_control.private = True
+    return response
+
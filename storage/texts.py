@@ -0,0 +1,198 @@
+"""On-disk cache of the text extracted from PDFs.
+
+Extracting the text of a PDF is far more expensive than reading it back, and
+several stages (summarization, embedding) need it. ``TextCache`` keeps the
+text of every extracted file, keyed by the SHA-256 of the file (the blob
+store key), so each PDF is parsed once whichever stage asks first; a new
+summarizer or embedder reuses the cached text.
+
+An entry is a small header with the page offsets followed by the
+zlib-compressed UTF-8 text::
+
+    b"CTX1" | page count (uint32) | page start offsets (uint64 each) | zlib(text)
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+
+from storage.blobs import is_blob_key
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
+
+_MAGIC = b"CTX1"
+_COUNT = struct.Struct("<I")
+
+
+class ExtractedText:
+    """Text of a document with the offsets of its pages.
+
+    Attributes:
+        text: Text of all pages, separated by newlines
+        page_offsets: Offset in ``text`` at which each page starts
+
+    """
+
+    __slots__ = ("page_offsets", "text")
+
+    def __init__(self, text: str, page_offsets: list[int]) -> None:
+        """Wrap extracted text.
+
+        Args:
+            text: Text of all pages
+            page_offsets: Start offset of each page in ``text``
+
+        """
+        self.text = text
+        self.page_offsets = page_offsets
+
+    @classmethod
+    def from_pages(cls, pages: list[str]) -> "ExtractedText":
+        """Join page texts with newlines, recording where each page starts."""
+        offsets = []
+        position = 0
+        for page in pages:
+            offsets.append(position)
+            position += len(page) + 1
+        return cls("\n".join(pages), offsets)
+
+    @property
+    def pages(self) -> int:
+        """Number of pages."""
+        return len(self.page_offsets)
+
+    def page(self, number: int) -> str:
+        """Return the text of a page (0-based)."""
+        start = self.page_offsets[number]
+        end = self.page_offsets[number + 1] - 1 if number + 1 < self.pages else len(self.text)
+        return self.text[start:end]
+
+
+def extract_pdf(path: str | Path) -> ExtractedText:
+    """Extract the text of a PDF file, page by page.
+
+    Args:
+        path: Path to the PDF file
+
+    Returns:
+        ExtractedText: Text of all pages
+
+    Raises:
+        RuntimeError: If the optional ``pypdf`` dependency is not installed
+
+    """
+    if PdfReader is None:
+        msg = "PDF extraction requires the optional 'pypdf' package"
+        raise RuntimeError(msg)
+    return ExtractedText.from_pages(
+        [page.extract_text() or "" for page in PdfReader(str(path)).pages],
+    )
+
+
+def file_sha256(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """Hash a file in chunks; return its hex SHA-256 (its blob store key)."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as stream:
+        while chunk := stream.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """Directory of extracted texts named by the SHA-256 of their source file.
+
+    Attributes:
+        root: Cache directory (created on first write)
+        level: zlib compression level of new entries
+
+    """
+
+    def __init__(self, root: str | Path, level: int = 6) -> None:
+        """Open a cache.
+
+        Args:
+            root: Cache directory
+            level: zlib compression level (1 fastest, 9 smallest)
+
+        """
+        self.root = Path(root)
+        self.level = level
+
+    def path(self, key: str) -> Path:
+        """Return the file of a cache entry (which may not exist).
+
+        Raises:
+            ValueError: If the key is not a SHA-256 hex digest
+
+        """
+        if not is_blob_key(key):
+            msg = f"Invalid text cache key {key!r}"
+            raise ValueError(msg)
+        return self.root / key[:2] / f"{key}.ctx"
+
+    def get(self, key: str) -> ExtractedText | None:
+        """Read a cached text.
+
+        Args:
+            key: SHA-256 of the source file
+
+        Returns:
+            ExtractedText: Cached text, or None if it is missing or unreadable
+
+        """
+        try:
+            data = self.path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        if data[: len(_MAGIC)] != _MAGIC:
+            return None
+        position = len(_MAGIC)
+        (count,) = _COUNT.unpack_from(data, position)
+        position += _COUNT.size
+        offsets = list(struct.unpack_from(f"<{count}Q", data, position))
+        position += 8 * count
+        try:
+            text = zlib.decompress(data[position:]).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError):
+            return None
+        return ExtractedText(text, offsets)
+
+    def put(self, key: str, extracted: ExtractedText) -> None:
+        """Store a text, replacing any previous entry atomically.
+
+        Args:
+            key: SHA-256 of the source file
+            extracted: Text to cache
+
+        """
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        count = extracted.pages
+        data = b"".join((
+            _MAGIC,
+            _COUNT.pack(count),
+            struct.pack(f"<{count}Q", *extracted.page_offsets),
+            zlib.compress(extracted.text.encode("utf-8"), self.level),
+        ))
+        descriptor, name = tempfile.mkstemp(dir=target.parent, suffix=".part")
+        try:
+            with os.fdopen(descriptor, "wb") as out:
+                out.write(data)
+            Path(name).replace(target)
+        except BaseException:
+            Path(name).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> bool:
+        """Remove a cache entry; return whether it existed."""
+        try:
+            self.path(key).unlink()
+        except FileNotFoundError:
+            return False
+        return True
@@ -0,0 +1,143 @@
+"""Streaming multipart uploads.
+
+``receive_pdf_upload`` reads a ``multipart/form-data`` body in fixed-size
+chunks with Werkzeug's incremental decoder and writes the PDF part straight
+into the blob store while it is hashed, instead of letting the form parser
+spool the file and handing it over afterwards. Memory use per upload is
+bounded by the chunk size and the form field limit, whatever the file size.
+The first bytes of the file are checked for the PDF signature before any
+more of it is read. The file is only moved into the store once the whole body
+is read and the text fields have been checked, so a rejected submission
+leaves nothing behind.
+"""
+
+from collections.abc import Callable
+from typing import BinaryIO
+
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.sansio.multipart import (
+    Data,
+    Epilogue,
+    Field,
+    File,
+    MultipartDecoder,
+    NeedData,
+)
+
+from storage.blobs import BlobStore, BlobWriter
+
+# Every PDF file starts with this signature
+PDF_MAGIC = b"%PDF-"
+
+
+class _PdfPart:
+    """File part being written to the blob store, checked for the PDF signature."""
+
+    def __init__(self, writer: BlobWriter) -> None:
+        """Start a file part.
+
+        Args:
+            writer: Blob writer receiving the file
+
+        """
+        self.writer = writer
+        self.head: bytes | None = b""
+
+    def write(self, data: bytes, *, more_data: bool) -> None:
+        """Write file data once its first bytes are known to be a PDF signature.
+
+        Raises:
+            UnsupportedMediaType: If the file does not start with ``%PDF-``
+
+        """
+        if self.head is not None:
+            self.head += data
+            if len(self.head) < len(PDF_MAGIC) and more_data:
+                return
+            if not self.head:
+                return  # Empty file input: no file was chosen
+            if not self.head.startswith(PDF_MAGIC):
+                raise UnsupportedMediaType(description="The uploaded file is not a PDF.")
+            data, self.head = self.head, None
+        self.writer.write(data)
+
+
+def receive_pdf_upload(  # noqa: C901, PLR0912, PLR0913 - one branch per decoder event
+    stream: BinaryIO,
+    boundary: bytes,
+    store: BlobStore,
+    *,
+    check_fields: Callable[[dict[str, str]], None] | None = None,
+    file_field: str = "pdf",
+    chunk_size: int = 64 * 1024,
+    max_form_memory_size: int | None = 500_000,
+    max_form_parts: int | None = 1000,
+) -> tuple[dict[str, str], tuple[str, int] | None]:
+    """Parse a multipart body, storing its PDF part in the blob store.
+
+    Args:
+        stream: Request body (already limited to ``MAX_CONTENT_LENGTH``)
+        boundary: Multipart boundary from the Content-Type header
+        store: Blob store receiving the file
+        check_fields: Called with the text fields before the file is stored;
+            raises to reject the submission
+        file_field: Name of the file part
+        chunk_size: Bytes read from the body at a time
+        max_form_memory_size: Maximum size of a text field
+        max_form_parts: Maximum number of parts
+
+    Returns:
+        tuple: Text fields by name, and the stored file's key and size (None
+            without a non-empty file part)
+
+    Raises:
+        BadRequest: If the body is malformed or has unexpected file parts
+        UnsupportedMediaType: If the file does not start with the PDF signature
+        RequestEntityTooLarge: If a text field or the body is too large
+        Exception: Whatever ``check_fields`` raised
+
+    """
+    decoder = MultipartDecoder(
+        boundary, max_form_memory_size=max_form_memory_size, max_parts=max_form_parts,
+    )
+    fields: dict[str, str] = {}
+    values: list[bytes] = []
+    field: Field | None = None
+    part: _PdfPart | None = None
+    writer = store.writer()
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            try:
+                decoder.receive_data(chunk or None)
+                event = decoder.next_event()
+                while not isinstance(event, (NeedData, Epilogue)):
+                    if isinstance(event, Field):
+                        field, part, values = event, None, []
+                    elif isinstance(event, File):
+                        if event.name != file_field or writer.size:
+                            msg = f"Only one {file_field!r} file is accepted."
+                            raise BadRequest(description=msg)
+                        field, part = None, _PdfPart(writer)
+                    elif isinstance(event, Data):
+                        if part is not None:
+                            part.write(event.data, more_data=event.more_data)
+                        elif field is not None:
+                            values.append(event.data)
+                            if (
+                                max_form_memory_size is not None
+                                and sum(map(len, values)) > max_form_memory_size
+                            ):
+                                raise RequestEntityTooLarge
+                            if not event.more_data:
+                                fields[field.name] = b"".join(values).decode("utf-8", "replace")
+                    event = decoder.next_event()
+            except ValueError as exc:
+                raise BadRequest(description="Malformed multipart body.") from exc
+            if not chunk or isinstance(event, Epilogue):
+                break
+        if check_fields is not None:
+            check_fields(fields)
+        return fields, writer.commit() if writer.size else None
+    finally:
+        writer.abort()
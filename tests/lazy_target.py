@@ -0,0 +1,3 @@
+"""Module imported lazily by the startup tests."""
+
+VALUE = 42
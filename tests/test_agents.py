@@ -0,0 +1,306 @@
+"""Tests for the LLM agent layer.
+
+Tests the agent registry, the fake agent, the batching front-end, the
+persistent response cache and the agent-backed summarizer and embedder.
+"""
+
+import threading
+import time
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from agents.base import AGENTS, Agent, get_agent, register_agent
+from agents.batching import BatchingAgent
+from agents.cache import CachedAgent, ResponseCache
+from agents.fake import FakeAgent
+from agents.service import get_app_agent
+from app import main
+from database import db
+from jobs.summarizers import AgentSummarizer, get_summarizer
+from jobs.worker import work
+from models.article import Article
+from models.user import User
+from similarity.embedders import get_embedder
+from similarity.service import embedding_text
+
+TEXT = "Graph networks. They are great. Really. Truly."
+
+
+def call_concurrently(func, args: list) -> list:
+    """Call a function from one thread per argument at once; return the results in order."""
+    results = [None] * len(args)
+    barrier = threading.Barrier(len(args))
+
+    def target(index: int) -> None:
+        barrier.wait()
+        try:
+            results[index] = func(args[index])
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(len(args))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class FailingAgent(FakeAgent):
+    """Fake agent whose engine is down."""
+
+    def summarize(self, texts: list[str]) -> list[str]:
+        """Record the call, then fail."""
+        self._call("summarize", len(texts))
+        msg = "engine unavailable"
+        raise ConnectionError(msg)
+
+
+@pytest.fixture
+def agent_app(app: Flask, tmp_path: Path) -> Flask:
+    """Summarize and embed with the fake agent, caching responses in a temporary file."""
+    app.config.update(
+        SUMMARIZER="agent",
+        EMBEDDER="agent",
+        EMBEDDING_DIR=tmp_path / "embeddings",
+        AGENT_CACHE_PATH=tmp_path / "agent_cache.db",
+    )
+    return app
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Generator[ResponseCache, None, None]:
+    """Open a response cache in a temporary file."""
+    cache = ResponseCache(tmp_path / "responses.db", max_entries=3)
+    yield cache
+    cache.close()
+
+
+class TestRegistry:
+    """Test cases for selecting agents by name."""
+
+    def test_fake_agent_is_discovered(self) -> None:
+        """Test that the agent module of a name is imported on request."""
+        agent = get_agent("fake", dim=16)
+
+        assert isinstance(agent, FakeAgent)
+        assert agent.dim == 16
+
+    def test_registered_agent(self) -> None:
+        """Test that registered agents are instantiated by name."""
+
+        @register_agent
+        class EchoAgent(FakeAgent):
+            name = "echo"
+
+        try:
+            assert isinstance(get_agent("echo"), EchoAgent)
+        finally:
+            AGENTS.pop("echo")
+
+    @pytest.mark.parametrize("name", ["gpt-9", "missing", "base"])
+    def test_unknown_agent(self, name: str) -> None:
+        """Test that unknown names raise KeyError listing the available agents."""
+        with pytest.raises(KeyError, match="fake"):
+            get_agent(name)
+
+    def test_fake_agent_is_deterministic(self) -> None:
+        """Test that the fake agent answers the same input identically."""
+        agent = FakeAgent(dim=32)
+
+        assert agent.summarize([TEXT]) == ["Graph networks. They are great. Really."]
+        vectors = agent.embed([TEXT, TEXT, ""])
+        assert vectors.shape == (3, 32)
+        assert vectors.dtype == np.float32
+        np.testing.assert_array_equal(vectors[0], vectors[1])
+        assert agent.calls == [("summarize", 1), ("embed", 3)]
+
+
+class TestBatchingAgent:
+    """Test cases for coalescing concurrent calls."""
+
+    def test_concurrent_calls_share_batches(self) -> None:
+        """Test that concurrent callers are answered by a few engine calls."""
+        backend = FakeAgent(latency=0.05)
+        agent = BatchingAgent(backend, max_batch_size=64, max_wait=0.05)
+        texts = [f"Article {number}. More text." for number in range(16)]
+
+        summaries = call_concurrently(lambda text: agent.summarize([text])[0], texts)
+
+        assert summaries == [text.split(" More")[0] + " More text." for text in texts]
+        assert len(backend.calls) < len(texts)
+        assert sum(size for _kind, size in backend.calls) == len(texts)
+
+    def test_batch_size_and_duplicates(self) -> None:
+        """Test that large calls are split and repeated texts are sent once."""
+        backend = FakeAgent()
+        agent = BatchingAgent(backend, max_batch_size=4, max_wait=0)
+
+        vectors = agent.embed(["a", "b", "a", "c", "d", "e", "b"])
+
+        assert backend.calls == [("embed", 4), ("embed", 1)]
+        np.testing.assert_array_equal(vectors, backend.embed(["a", "b", "a", "c", "d", "e", "b"]))
+        assert agent.batches == 2
+        assert agent.embed([]).shape == (0, backend.dim)
+
+    def test_lone_call_does_not_wait(self) -> None:
+        """Test that a call is sent at once when no other call is in flight."""
+        backend = FakeAgent()
+        agent = BatchingAgent(backend, max_wait=5)
+
+        start = time.monotonic()
+        agent.summarize(["First. Second."])
+        agent.summarize(["Third. Fourth."])
+
+        assert time.monotonic() - start < 1
+        assert backend.calls == [("summarize", 1), ("summarize", 1)]
+
+    def test_errors_reach_every_caller(self) -> None:
+        """Test that a failing engine call fails every request of the batch."""
+        agent = BatchingAgent(FailingAgent(), max_wait=0.05)
+
+        results = call_concurrently(agent.summarize, [["one"], ["two"], ["three"]])
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+
+class TestResponseCache:
+    """Test cases for the persistent response cache."""
+
+    def test_round_trip_and_persistence(self, cache: ResponseCache) -> None:
+        """Test that responses survive reopening the file."""
+        key = ResponseCache.key("summarize", "fake", TEXT)
+        cache.put_many({key: b"summary"})
+
+        reopened = ResponseCache(cache.path)
+        assert reopened.get_many([key, "0" * 64]) == {key: b"summary"}
+        assert (reopened.hits, reopened.misses) == (1, 1)
+        reopened.close()
+
+    def test_evicts_least_recently_used(self, cache: ResponseCache) -> None:
+        """Test that entries beyond max_entries are evicted oldest use first."""
+        cache.put_many({"a": b"1"})
+        cache.put_many({"b": b"2"})
+        cache.put_many({"c": b"3"})
+        cache.get_many(["a"])
+
+        cache.put_many({"d": b"4"})
+
+        assert len(cache) == 3
+        assert set(cache.get_many(["a", "b", "c", "d"])) == {"a", "c", "d"}
+
+    def test_keys_depend_on_model_and_prompt(self) -> None:
+        """Test that a request is keyed by its kind, model and prompt."""
+        keys = {
+            ResponseCache.key("summarize", "fake", TEXT),
+            ResponseCache.key("summarize", "other", TEXT),
+            ResponseCache.key("embed", "fake", TEXT),
+            ResponseCache.key("summarize", "fake", TEXT + " "),
+        }
+        assert len(keys) == 4
+
+
+class TestCachedAgent:
+    """Test cases for answering from the response cache."""
+
+    def test_only_misses_reach_the_engine(self, tmp_path: Path) -> None:
+        """Test that texts seen before cost no engine call."""
+        backend = FakeAgent(dim=8)
+        agent = CachedAgent(backend, ResponseCache(tmp_path / "responses.db"))
+
+        first = agent.summarize(["One. Two.", "Three."])
+        again = agent.summarize(["Three.", "Four.", "One. Two."])
+        vectors = agent.embed(["x y", "x y"])
+        cached_vectors = agent.embed(["x y"])
+
+        assert again == ["Three.", "Four.", first[0]]
+        assert backend.calls == [("summarize", 2), ("summarize", 1), ("embed", 1)]
+        np.testing.assert_array_equal(cached_vectors[0], vectors[0])
+        np.testing.assert_array_equal(vectors[0], backend.embed(["x y"])[0])
+
+    def test_new_prompt_misses(self, tmp_path: Path) -> None:
+        """Test that changing the summary prompt sends the texts again."""
+        cache = ResponseCache(tmp_path / "responses.db")
+        backend = FakeAgent()
+        CachedAgent(backend, cache).summarize([TEXT])
+        backend.summary_prompt = "Summarize in one sentence."
+
+        CachedAgent(backend, cache).summarize([TEXT])
+
+        assert backend.calls == [("summarize", 1), ("summarize", 1)]
+
+
+class TestAppAgent:
+    """Test cases for the agent-backed summarizer and embedder."""
+
+    def backend(self) -> FakeAgent:
+        """Return the fake engine below the app's cache and batching layers."""
+        return get_app_agent().agent.agent
+
+    def test_app_agent_stack(self, agent_app: Flask) -> None:
+        """Test that the app agent is built once from the configuration."""
+        with agent_app.app_context():
+            agent = get_app_agent()
+
+            assert agent is get_app_agent()
+            assert isinstance(agent, CachedAgent)
+            assert isinstance(agent.agent, BatchingAgent)
+            assert isinstance(self.backend(), Agent)
+            assert isinstance(get_summarizer("agent"), AgentSummarizer)
+            embedder = get_embedder("agent")
+            assert (embedder.name, embedder.dim) == ("agent-fake", self.backend().dim)
+
+    def test_resummarizing_unchanged_articles_is_free(
+        self, agent_app: Flask, test_user: User,
+    ) -> None:
+        """Test that re-running summaries over unchanged articles calls no engine."""
+        with agent_app.app_context():
+            db.session.add(Article(title=TEXT, user_id=test_user.id))
+            db.session.commit()
+            assert work("test-worker", burst=True) == 1
+            article = db.session.execute(db.select(Article)).scalar_one()
+            assert article.summary == "Graph networks. They are great. Really."
+            assert article.embedding.model == "agent-fake"
+            assert article.summary_generated
+            calls = list(self.backend().calls)
+
+            with patch("app.create_app", return_value=agent_app):
+                result = CliRunner().invoke(main, ["summarize", "--all"])
+
+            assert result.exit_code == 0, result.output
+            assert "Summarized 1 articles (0 changed" in result.output
+            assert self.backend().calls == calls
+
+    def test_resummarizing_keeps_written_summaries(
+        self, agent_app: Flask, test_user: User,
+    ) -> None:
+        """Test that submitted summaries are kept and changed generated ones are re-embedded."""
+        with agent_app.app_context():
+            db.session.add_all([
+                Article(title=TEXT, summary="Written by hand.", user_id=test_user.id),
+                Article(title=TEXT, user_id=test_user.id),
+            ])
+            db.session.commit()
+            assert work("test-worker", burst=True) == 2
+            written, generated = db.session.execute(
+                db.select(Article).order_by(Article.id),
+            ).scalars().all()
+            generated.title = "Graph networks, revised. They are great. Really. Truly."
+            db.session.commit()
+
+            with patch("app.create_app", return_value=agent_app):
+                result = CliRunner().invoke(main, ["summarize", "--all"])
+
+            assert result.exit_code == 0, result.output
+            assert "Summarized 1 articles (1 changed" in result.output
+            db.session.expire_all()
+            assert (written.summary, written.summary_generated) == ("Written by hand.", False)
+            assert generated.summary == "Graph networks, revised. They are great. Really."
+            expected = self.backend().embed([embedding_text(generated)])[0]
+            np.testing.assert_array_equal(generated.embedding.array, expected)
@@ -9,10 +9,13 @@ import pytest
 from click.testing import CliRunner
 from flask import Flask
 from flask_login import current_user, login_user
+from sqlalchemy import event
 
-from app import main
+from app import create_app, main
+from database import db
 from models.article import Article  # noqa: F401 - needed for SQLAlchemy relationship
-from models.user import User
+from models.user import User, load_cached_user
+from tests.conftest import TestConfig
 
 
 class TestAppFactory:
@@ -57,6 +60,57 @@ class TestAppFactory:
             client.get("/graph")
 
 
+class TestUserCache:
+    """Test cases for the user_loader identity cache."""
+
+    @staticmethod
+    def _count_queries(app: Flask) -> list[str]:
+        """Record SQL statements executed on the app's engine."""
+        statements: list[str] = []
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        return statements
+
+    def test_cached_user_loaded_without_query(self, app: Flask, test_user: User) -> None:
+        """Test that a second lookup is served from the cache."""
+        cache = app.extensions["user_cache"]
+        with app.app_context():
+            assert load_cached_user(test_user.id).username == "testuser"
+        with app.app_context():
+            statements = self._count_queries(app)
+            user = load_cached_user(test_user.id)
+            assert user.username == "testuser"
+            assert user in db.session
+            assert statements == []
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_cache_invalidated_on_update(self, app: Flask, test_user: User) -> None:
+        """Test that updating a user drops its cache entry."""
+        with app.app_context():
+            user = load_cached_user(test_user.id)
+            user.email = "changed@example.com"
+            db.session.commit()
+        with app.app_context():
+            assert load_cached_user(test_user.id).email == "changed@example.com"
+            assert app.extensions["user_cache"].hits == 0
+
+    def test_cache_invalidated_on_delete(self, app: Flask, test_user: User) -> None:
+        """Test that a deleted user is no longer returned."""
+        with app.app_context():
+            db.session.delete(load_cached_user(test_user.id))
+            db.session.commit()
+        with app.app_context():
+            assert load_cached_user(test_user.id) is None
+
+    def test_cache_can_be_disabled(self) -> None:
+        """Test that USER_CACHE_ENABLED=False skips the cache."""
+
+        class NoCacheConfig(TestConfig):
+            USER_CACHE_ENABLED = False
+
+        assert "user_cache" not in create_app(NoCacheConfig).extensions
+
+
 class TestCLI:
     """Test cases for CLI entry point."""
 
@@ -88,3 +142,33 @@ class TestCLI:
                     debug=True, host="0.0.0.0", port=5000,  # noqa: S104
                 )
 
+    def test_bench_hash_command(self) -> None:
+        """Test that bench-hash reports latency for the requested method."""
+        result = CliRunner().invoke(
+            main, ["bench-hash", "--method", "pbkdf2:sha256:1000", "--rounds", "1"],
+        )
+        assert result.exit_code == 0
+        assert "pbkdf2:sha256:1000" in result.output
+        assert "ms/hash" in result.output
+
+    def test_serve_command(self) -> None:
+        """Test that serve runs the app factory under gunicorn with the given options."""
+        with patch("server.serve") as mock_serve:
+            result = CliRunner().invoke(
+                main, ["serve", "--bind", "127.0.0.1:9000", "--workers", "3", "--threads", "4"],
+            )
+
+        assert result.exit_code == 0
+        factory, options = mock_serve.call_args.args
+        assert factory is create_app
+        assert options["bind"] == "127.0.0.1:9000"
+        assert options["workers"] == 3
+        assert options["worker_class"] == "gthread"
+
+    def test_serve_command_without_gunicorn(self) -> None:
+        """Test that a missing server dependency is reported as a CLI error."""
+        with patch("server.serve", side_effect=RuntimeError("gunicorn missing")):
+            result = CliRunner().invoke(main, ["serve"])
+
+        assert result.exit_code == 1
+        assert "gunicorn missing" in result.output
@@ -5,7 +5,7 @@ Tests login, registration, logout, and authentication-related features.
 
 
 from database import db
-from models.user import User
+from models.user import User, resolved_hash_method
 
 
 class TestLogin:
@@ -253,3 +253,41 @@ class TestUserModel:
             db.session.commit()
 
             assert "reprtest" in repr(user)
+
+
+class TestPasswordRehash:
+    """Test cases for configurable hashing and rehash on login."""
+
+    def test_hash_uses_configured_method(self, app, test_user) -> None:
+        """Test that new hashes use PASSWORD_HASH_METHOD."""
+        assert test_user.password_hash.startswith("pbkdf2:sha256:1000$")
+        assert not test_user.needs_rehash()
+
+    def test_short_method_name_is_resolved(self) -> None:
+        """Test that short method names expand to werkzeug's stored parameters."""
+        assert resolved_hash_method("scrypt") == "scrypt:32768:8:1"
+        assert resolved_hash_method("pbkdf2:sha256:1000") == "pbkdf2:sha256:1000"
+
+    def test_salt_length_change_needs_rehash(self, app, test_user) -> None:
+        """Test that changing the salt length marks hashes as outdated."""
+        app.config["PASSWORD_SALT_LENGTH"] = 24
+        with app.app_context():
+            assert db.session.get(User, test_user.id).needs_rehash()
+
+    def test_login_upgrades_outdated_hash(self, app, client, test_user) -> None:
+        """Test that a successful login rehashes with the new parameters."""
+        app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"
+        client.post("/login", data={"username": "testuser", "password": "testpass123"})
+        with app.app_context():
+            user = db.session.get(User, test_user.id)
+            assert user.password_hash.startswith("pbkdf2:sha256:2000$")
+            assert user.check_password("testpass123")
+
+    def test_failed_login_keeps_hash(self, app, client, test_user) -> None:
+        """Test that a wrong password never triggers a rehash."""
+        app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:2000"
+        client.post("/login", data={"username": "testuser", "password": "wrong"})
+        with app.app_context():
+            assert db.session.get(User, test_user.id).password_hash.startswith(
+                "pbkdf2:sha256:1000$",
+            )
@@ -0,0 +1,260 @@
+"""Tests for the PDF blob store.
+
+Tests the content-addressed store, blob reference counting and garbage
+collection, and the PDF download route.
+"""
+
+import io
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app import main
+from database import db
+from models.article import Article
+from models.blob import Blob, collect_blobs, store_blob
+from models.job import utcnow
+from models.user import User
+from storage.blobs import BlobStore
+
+PDF = b"%PDF-1.7\n" + bytes(range(256)) * 8 + b"\n%%EOF\n"
+
+
+class BrokenStream(io.BytesIO):
+    """Stream failing after its first chunk, like an interrupted upload."""
+
+    def read(self, size: int | None = -1) -> bytes:
+        """Return the first chunk, then fail."""
+        if self.tell():
+            msg = "connection reset"
+            raise OSError(msg)
+        return super().read(size)
+
+
+@pytest.fixture
+def store(app: Flask, tmp_path: Path) -> BlobStore:
+    """Point the app's blob store at a temporary directory (small chunks)."""
+    app.extensions["blobs"] = BlobStore(tmp_path / "blobs", chunk_size=100)
+    return app.extensions["blobs"]
+
+
+def refcount(key: str) -> int:
+    """Read a blob's stored reference count."""
+    return db.session.execute(db.select(Blob.refcount).where(Blob.sha256 == key)).scalar()
+
+
+def age(store: BlobStore, key: str, seconds: float) -> None:
+    """Make a blob look like it was stored ``seconds`` ago."""
+    db.session.execute(
+        db.update(Blob)
+        .where(Blob.sha256 == key)
+        .values(stored_at=utcnow() - timedelta(seconds=seconds)),
+    )
+    db.session.commit()
+    past = time.time() - seconds
+    os.utime(store.path(key), (past, past))
+
+
+@pytest.fixture
+def pdf_article(app: Flask, test_user: User, store: BlobStore) -> int:
+    """Create an article with a stored PDF and return its id."""
+    with app.app_context():
+        article = Article(title="With PDF", user_id=test_user.id)
+        article.pdf_hash = store_blob(store, io.BytesIO(PDF))
+        db.session.add(article)
+        db.session.commit()
+        return article.id
+
+
+class TestBlobStore:
+    """Test cases for the content-addressed file store."""
+
+    def test_put_deduplicates(self, store: BlobStore) -> None:
+        """Test that the same content is stored once under its SHA-256."""
+        key, size = store.put(io.BytesIO(PDF))
+        again, _size = store.put(io.BytesIO(PDF))
+
+        assert key == again
+        assert size == len(PDF)
+        assert store.path(key) == store.root / key[:2] / key[2:4] / key
+        assert store.path(key).read_bytes() == PDF
+        assert [stored for stored, _mtime in store.scan()] == [key]
+        assert not list((store.root / "tmp").iterdir())
+
+    def test_failed_upload_leaves_nothing(self, store: BlobStore) -> None:
+        """Test that a stream failing midway leaves no partial file."""
+        with pytest.raises(OSError, match="connection reset"):
+            store.put(BrokenStream(PDF))
+        assert not list(store.scan())
+        assert not list((store.root / "tmp").iterdir())
+
+    def test_invalid_key(self, store: BlobStore) -> None:
+        """Test that keys which are not SHA-256 digests are rejected."""
+        with pytest.raises(ValueError, match="Invalid blob key"):
+            store.path("../../etc/passwd")
+
+    def test_delete_keeps_recent_files(self, store: BlobStore) -> None:
+        """Test that delete() spares a file stored again after the cutoff."""
+        key, _size = store.put(io.BytesIO(PDF))
+
+        assert not store.delete(key, older_than=time.time() - 60)
+        assert store.delete(key)
+        assert not store.exists(key)
+
+
+class TestReferenceCounting:
+    """Test cases for Blob.refcount and collect_blobs."""
+
+    def test_refcount_follows_articles(
+        self, app: Flask, test_user: User, store: BlobStore, pdf_article: int,
+    ) -> None:
+        """Test that sharing, replacing and deleting PDFs adjust the counts."""
+        with app.app_context():
+            key = db.session.get(Article, pdf_article).pdf_hash
+            other = Article(title="Same PDF", user_id=test_user.id, pdf_hash=key)
+            db.session.add(other)
+            db.session.commit()
+            assert refcount(key) == 2
+
+            other.pdf_hash = store_blob(store, io.BytesIO(b"%PDF-1.4 other"))
+            db.session.commit()
+            assert refcount(key) == 1
+            assert refcount(other.pdf_hash) == 1
+
+            db.session.delete(db.session.get(Article, pdf_article))
+            db.session.commit()
+            assert refcount(key) == 0
+
+    def test_collect_unreferenced_blobs(
+        self, app: Flask, store: BlobStore, pdf_article: int,
+    ) -> None:
+        """Test that only old blobs without references are deleted."""
+        with app.app_context():
+            used = db.session.get(Article, pdf_article).pdf_hash
+            old = store_blob(store, io.BytesIO(b"%PDF old"))
+            recent = store_blob(store, io.BytesIO(b"%PDF recent"))
+            db.session.commit()
+            age(store, used, 7200)
+            age(store, old, 7200)
+
+            assert collect_blobs(store, grace_seconds=3600) == 1
+            assert {key for key, _mtime in store.scan()} == {used, recent}
+            assert db.session.get(Blob, old) is None
+
+    def test_collect_repairs_counts(self, app: Flask, store: BlobStore, pdf_article: int) -> None:
+        """Test that drifted counts are recomputed before anything is deleted."""
+        with app.app_context():
+            key = db.session.get(Article, pdf_article).pdf_hash
+            db.session.execute(db.update(Blob).values(refcount=0))
+            db.session.commit()
+            age(store, key, 7200)
+
+            assert collect_blobs(store, grace_seconds=3600) == 0
+            assert refcount(key) == 1
+            assert store.exists(key)
+
+    def test_collect_orphan_files(self, app: Flask, store: BlobStore) -> None:
+        """Test that old files without a row and stale uploads are removed."""
+        with app.app_context():
+            key, _size = store.put(io.BytesIO(b"%PDF orphan"))
+            age(store, key, 7200)
+            part = store.root / "tmp" / "upload.part"
+            part.write_bytes(b"%PDF")
+            os.utime(part, (0, 0))
+
+            assert collect_blobs(store, grace_seconds=3600) == 2
+            assert not store.exists(key)
+            assert not part.exists()
+
+
+class TestPdfDownload:
+    """Test cases for GET /api/articles/<id>/pdf."""
+
+    def test_requires_login(self, client: FlaskClient, pdf_article: int) -> None:
+        """Test that anonymous clients are rejected."""
+        assert client.get(f"/api/articles/{pdf_article}/pdf").status_code == 401
+
+    def test_article_without_pdf(self, app: Flask, test_user: User, authenticated_client) -> None:
+        """Test that articles without a PDF answer 404."""
+        with app.app_context():
+            article = Article(title="No PDF", user_id=test_user.id)
+            db.session.add(article)
+            db.session.commit()
+            article_id = article.id
+
+        assert authenticated_client.get(f"/api/articles/{article_id}/pdf").status_code == 404
+
+    def test_download(self, app: Flask, authenticated_client, pdf_article: int) -> None:
+        """Test a full download and its revalidation by ETag."""
+        response = authenticated_client.get(f"/api/articles/{pdf_article}/pdf")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/pdf"
+        assert response.data == PDF
+        assert response.headers["Accept-Ranges"] == "bytes"
+        disposition = response.headers["Content-Disposition"]
+        assert disposition == f"inline; filename=article-{pdf_article}.pdf"
+        with app.app_context():
+            assert response.headers["ETag"] == f'"{db.session.get(Article, pdf_article).pdf_hash}"'
+
+        cached = authenticated_client.get(
+            f"/api/articles/{pdf_article}/pdf",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert cached.status_code == 304
+
+    def test_range(self, authenticated_client, pdf_article: int) -> None:
+        """Test that a byte range is answered with 206 and only that range."""
+        response = authenticated_client.get(
+            f"/api/articles/{pdf_article}/pdf", headers={"Range": "bytes=4-11"},
+        )
+
+        assert response.status_code == 206
+        assert response.data == PDF[4:12]
+        assert response.headers["Content-Range"] == f"bytes 4-11/{len(PDF)}"
+
+    @pytest.mark.parametrize("offload", ["accel", "sendfile"])
+    def test_offload(
+        self, app: Flask, store: BlobStore, authenticated_client, pdf_article: int, offload: str,
+    ) -> None:
+        """Test that offloaded downloads only name the file for the front-end server."""
+        app.config["BLOB_OFFLOAD"] = offload
+        response = authenticated_client.get(f"/api/articles/{pdf_article}/pdf")
+
+        with app.app_context():
+            key = db.session.get(Article, pdf_article).pdf_hash
+        assert response.data == b""
+        if offload == "accel":
+            assert response.headers["X-Accel-Redirect"] == f"/_blobs/{store.relative_path(key)}"
+        else:
+            assert response.headers["X-Sendfile"] == str(store.path(key).resolve())
+
+
+class TestAttachPdfCommand:
+    """Test cases for constellate attach-pdf."""
+
+    def test_attach_pdf(self, app: Flask, test_user: User, store: BlobStore, tmp_path) -> None:
+        """Test that the command stores the file and links it to the article."""
+        path = tmp_path / "paper.pdf"
+        path.write_bytes(PDF)
+        with app.app_context():
+            article = Article(title="Paper", user_id=test_user.id)
+            db.session.add(article)
+            db.session.commit()
+            article_id = article.id
+
+        with patch("app.create_app", return_value=app):
+            result = CliRunner().invoke(main, ["attach-pdf", str(article_id), str(path)])
+
+        assert result.exit_code == 0, result.output
+        with app.app_context():
+            key = db.session.get(Article, article_id).pdf_hash
+            assert store.path(key).read_bytes() == PDF
+            assert refcount(key) == 1
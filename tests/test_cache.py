@@ -0,0 +1,60 @@
+"""Tests for the in-process TTL/LRU cache."""
+
+from cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self) -> None:
+        """Start at time zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_hit_and_miss_counters(self) -> None:
+        """Test that lookups are counted."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "hit_ratio": 0.5}
+
+    def test_entries_expire(self) -> None:
+        """Test that entries older than the TTL are dropped."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+        cache.set("a", 1)
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_evicted(self) -> None:
+        """Test LRU eviction when the cache is full."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_invalidate_and_clear(self) -> None:
+        """Test explicit invalidation."""
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,178 @@
+"""Tests for the database engine profile.
+
+Tests backend-specific pool sizing, the SQLite pragmas applied on connect and
+read replica routing.
+"""
+
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from flask import Flask
+from sqlalchemy import select, text, update
+
+from app import create_app
+from database import REPLICA_BIND, db, engine_options, replica_reads
+from models.tag import Tag, tag_counts
+from tests.conftest import TestConfig
+
+
+class TestEngineOptions:
+    """Test cases for backend-specific engine options."""
+
+    def config(self, uri: str, **overrides: object) -> dict:
+        """Build a config mapping for ``uri``."""
+        return {
+            "SQLALCHEMY_DATABASE_URI": uri,
+            "DB_POOL_SIZE": 4,
+            "DB_MAX_OVERFLOW": 2,
+            "DB_POOL_RECYCLE": 600,
+            **overrides,
+        }
+
+    def test_sqlite_file_uses_queue_pool_sizing(self) -> None:
+        """Test that file databases get a bounded pool without server-only options."""
+        options = engine_options(self.config("sqlite:////tmp/site.db"))
+
+        assert options == {"pool_size": 4, "max_overflow": 2}
+
+    def test_sqlite_memory_keeps_default_pool(self) -> None:
+        """Test that in-memory databases are left to the static pool."""
+        assert engine_options(self.config("sqlite:///:memory:")) == {}
+        assert engine_options(self.config("sqlite://")) == {}
+
+    def test_server_backend_pool(self) -> None:
+        """Test that server backends recycle and pre-ping pooled connections."""
+        options = engine_options(self.config("postgresql://db/constellate"))
+
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] == 600
+        assert options["pool_size"] == 4
+
+    def test_explicit_engine_options_take_precedence(self) -> None:
+        """Test that SQLALCHEMY_ENGINE_OPTIONS overrides the computed sizing."""
+        config = self.config(
+            "sqlite:////tmp/site.db", SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 16},
+        )
+
+        assert engine_options(config)["pool_size"] == 16
+
+
+class TestSQLitePragmas:
+    """Test cases for the SQLite connection profile."""
+
+    def test_pragmas_applied_on_connect(self, tmp_path: Path) -> None:
+        """Test that new connections use WAL mode and wait for locks."""
+
+        class FileConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'site.db'}"
+
+        app = create_app(FileConfig)
+        with app.app_context():
+            pragma = {
+                name: db.session.execute(text(f"PRAGMA {name}")).scalar()
+                for name in ("journal_mode", "busy_timeout", "synchronous")
+            }
+            db.session.remove()
+            db.engine.dispose()
+
+        assert pragma == {"journal_mode": "wal", "busy_timeout": 5000, "synchronous": 1}
+
+    def test_pragmas_can_be_disabled(self, tmp_path: Path) -> None:
+        """Test that an empty profile keeps SQLite's defaults."""
+
+        class DefaultConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'site.db'}"
+            SQLITE_PRAGMAS = {}  # noqa: RUF012
+
+        app = create_app(DefaultConfig)
+        with app.app_context():
+            mode = db.session.execute(text("PRAGMA journal_mode")).scalar()
+            db.session.remove()
+            db.engine.dispose()
+
+        assert mode == "delete"
+
+
+class TestReadReplicaRouting:
+    """Test cases for routing reads to the read replica."""
+
+    @pytest.fixture
+    def replica_app(self, tmp_path: Path) -> Generator[Flask, None, None]:
+        """App whose primary and replica are separate files holding different tags."""
+
+        class ReplicaConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+            SQLALCHEMY_READ_REPLICA_URI = f"sqlite:///{tmp_path / 'replica.db'}"
+
+        app = create_app(ReplicaConfig)
+        with app.app_context():
+            replica = db.engines[REPLICA_BIND]
+            db.metadata.create_all(replica)
+            with replica.begin() as conn:
+                conn.execute(Tag.__table__.insert(), {"name": "on-replica"})
+            db.session.add(Tag(name="on-primary"))
+            db.session.commit()
+            db.session.remove()
+            yield app
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+    def tag_names(self) -> list[str]:
+        """Return the tag names visible to the current session."""
+        return list(db.session.scalars(select(Tag.name)))
+
+    def test_get_request_reads_replica(self, replica_app: Flask) -> None:
+        """Test that queries in GET requests use the replica."""
+        with replica_app.test_request_context(method="GET"):
+            assert self.tag_names() == ["on-replica"]
+
+    def test_post_request_reads_primary(self, replica_app: Flask) -> None:
+        """Test that queries in write requests use the primary."""
+        with replica_app.test_request_context(method="POST"):
+            assert self.tag_names() == ["on-primary"]
+
+    def test_reads_after_flush_stay_on_primary(self, replica_app: Flask) -> None:
+        """Test that a request reads its own writes once it has flushed."""
+        with replica_app.test_request_context(method="GET"):
+            db.session.add(Tag(name="new"))
+            db.session.flush()
+            assert self.tag_names() == ["on-primary", "new"]
+            db.session.rollback()
+            assert self.tag_names() == ["on-primary"]
+
+    def test_reads_after_bulk_update_stay_on_primary(self, replica_app: Flask) -> None:
+        """Test that Core DML also pins the session to the primary."""
+        with replica_app.test_request_context(method="GET"):
+            db.session.execute(update(Tag).values(name="renamed"))
+            assert self.tag_names() == ["renamed"]
+            db.session.rollback()
+
+    def test_replica_reads_outside_requests(self, replica_app: Flask) -> None:
+        """Test that query helpers opt in to the replica outside of requests."""
+        assert self.tag_names() == ["on-primary"]
+        with replica_reads():
+            assert self.tag_names() == ["on-replica"]
+        assert tag_counts() == []  # decorated helper: the replica has no article tags
+        assert self.tag_names() == ["on-primary"]
+
+    def test_read_only_sqlite_replica(self, tmp_path: Path) -> None:
+        """Test that a read-only URI of a non-WAL file can serve reads."""
+        path = tmp_path / "site.db"
+
+        class ReadOnlyConfig(TestConfig):
+            SQLITE_PRAGMAS = {"journal_mode": "delete", "busy_timeout": 1000}  # noqa: RUF012
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+            SQLALCHEMY_READ_REPLICA_URI = f"sqlite:///file:{path}?mode=ro&uri=true"
+
+        app = create_app(ReadOnlyConfig)
+        with app.app_context(), app.test_request_context(method="GET"):
+            db.session.add(Tag(name="shared"))
+            db.session.commit()
+            db.session.remove()
+            assert self.tag_names() == ["shared"]
+            assert db.session.get_bind(clause=select(Tag)) is db.engines[REPLICA_BIND]
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
@@ -0,0 +1,120 @@
+"""Tests for the materialized shared-tag edge table.
+
+Tests incremental edge maintenance on insert, update and delete, its
+suspension, and full rebuilds.
+"""
+
+from flask import Flask
+from sqlalchemy import event
+
+from database import db
+from models.article import Article, edge_sync_suspended
+from models.edge import ArticleEdge, rebuild_edges
+from models.user import User
+
+
+def _edges() -> set[tuple[int, int, int]]:
+    """Return all stored edges as (source, target, shared_tags) tuples."""
+    return {(e.source_id, e.target_id, e.shared_tags) for e in ArticleEdge.query.all()}
+
+
+def _add(user: User, tags: str | None) -> Article:
+    """Create and commit one article with the given tags."""
+    article = Article(title="Edge Article", tags=tags, user_id=user.id)
+    db.session.add(article)
+    db.session.commit()
+    return article
+
+
+class TestEdgeMaintenance:
+    """Test cases for incremental edge updates."""
+
+    def test_edges_on_insert(self, app: Flask, test_user: User) -> None:
+        """Test that inserting articles creates weighted edges."""
+        with app.app_context():
+            a = _add(test_user, "x,y")
+            b = _add(test_user, "y,x,z")
+            c = _add(test_user, "z")
+            _add(test_user, None)
+            assert _edges() == {(a.id, b.id, 2), (b.id, c.id, 1)}
+
+    def test_edges_inserted_in_same_flush(self, app: Flask, test_user: User) -> None:
+        """Test that pairs of articles created together are stored once."""
+        with app.app_context():
+            articles = [Article(title=str(i), tags="t", user_id=test_user.id) for i in range(3)]
+            db.session.add_all(articles)
+            db.session.commit()
+            a, b, c = (article.id for article in articles)
+            assert _edges() == {(a, b, 1), (a, c, 1), (b, c, 1)}
+
+    def test_edges_on_update(self, app: Flask, test_user: User) -> None:
+        """Test that retagging an article rewrites only its edges."""
+        with app.app_context():
+            a = _add(test_user, "x")
+            b = _add(test_user, "x")
+            c = _add(test_user, "y")
+            b.tags = "y"
+            db.session.commit()
+            assert _edges() == {(b.id, c.id, 1)}
+            assert a.id not in {e.source_id for e in ArticleEdge.query}
+
+    def test_edges_on_delete(self, app: Flask, test_user: User) -> None:
+        """Test that deleting an article removes its edges."""
+        with app.app_context():
+            a = _add(test_user, "x")
+            b = _add(test_user, "x")
+            c = _add(test_user, "x")
+            db.session.delete(b)
+            db.session.commit()
+            assert _edges() == {(a.id, c.id, 1)}
+
+    def test_untagged_change_skips_tags(self, app: Flask, test_user: User) -> None:
+        """Test that changing other columns neither loads the tags nor touches edges."""
+        with app.app_context():
+            a = _add(test_user, "x")
+            b = _add(test_user, "x")
+            a.summary = "New summary"
+            statements = []
+            engine = db.engine
+
+            def record(_conn, _cursor, statement, *_args) -> None:
+                statements.append(statement)
+
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                db.session.commit()
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+            assert not [sql for sql in statements if "article_tags" in sql or "edges" in sql]
+            assert _edges() == {(a.id, b.id, 1)}
+
+    def test_rebuild_matches_incremental(self, app: Flask, test_user: User) -> None:
+        """Test that a full rebuild reproduces the incrementally kept table."""
+        with app.app_context():
+            for tags in ("a,b", "b,c", "a,b,c", "d", "c,d"):
+                _add(test_user, tags)
+            expected = _edges()
+            assert rebuild_edges() == len(expected)
+            assert _edges() == expected
+
+    def test_suspended_sync_and_batched_rebuild(self, app: Flask, test_user: User) -> None:
+        """Test that suspended tag changes leave the edges to a rebuild in batches."""
+        with app.app_context():
+            articles = [_add(test_user, tags) for tags in ("a,b", "b,c", "a,b,c", "d", "c,d")]
+            ids = [article.id for article in articles]
+            before = _edges()
+            with edge_sync_suspended():
+                articles[3].tags = "a"
+                db.session.commit()
+            assert _edges() == before
+
+            assert rebuild_edges(batch_size=1) == 7
+            assert _edges() == {
+                (ids[0], ids[1], 1), (ids[0], ids[2], 2), (ids[0], ids[3], 1),
+                (ids[1], ids[2], 2), (ids[1], ids[4], 1), (ids[2], ids[3], 1),
+                (ids[2], ids[4], 1),
+            }
+
+            articles[4].tags = "e"
+            db.session.commit()
+            assert not [edge for edge in _edges() if ids[4] in edge[:2]]
@@ -0,0 +1,203 @@
+"""Tests for the live graph updates.
+
+Tests the event bus, the brokers and the /api/graph/events SSE stream.
+"""
+
+import threading
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from database import db
+from events.brokers import DatabaseBroker, MemoryBroker, get_broker
+from events.bus import Event, EventBus, SubscriberLimitError
+from events.service import EventChannel, publish
+from models.event import GraphEvent
+
+
+@pytest.fixture
+def events_app(app: Flask) -> Flask:
+    """Keep event streams short so responses can be read to the end."""
+    app.config["EVENTS_HEARTBEAT_SECONDS"] = 0.05
+    app.config["EVENTS_MAX_STREAM_SECONDS"] = 0.2
+    return app
+
+
+def event_ids(body: str) -> list[int]:
+    """Extract the ids of the events in an SSE body."""
+    return [int(line[4:]) for line in body.splitlines() if line.startswith("id: ")]
+
+
+class TestEventBus:
+    """Test cases for the in-process bus."""
+
+    def test_since_returns_newer_events(self) -> None:
+        """Test that subscribers get the events after their cursor, oldest first."""
+        bus = EventBus(buffer_size=10)
+        for event_id in (1, 2, 3):
+            bus.deliver(Event(event_id, "score", "{}"))
+        bus.deliver(Event(2, "score", "{}"))  # duplicate delivery is ignored
+
+        assert [event.id for event in bus.since(1)] == [2, 3]
+        assert bus.since(3) == []
+        assert bus.last_id == 3
+
+    def test_evicted_events_require_reset(self) -> None:
+        """Test that a cursor older than the ring buffer cannot be replayed."""
+        bus = EventBus(buffer_size=2)
+        for event_id in (1, 2, 3):
+            bus.deliver(Event(event_id, "score", "{}"))
+
+        assert bus.since(0) is None
+        assert [event.id for event in bus.since(1)] == [2, 3]
+
+    def test_mark_missing(self) -> None:
+        """Test that events a broker could not load are not silently skipped."""
+        bus = EventBus()
+        bus.mark_missing(10)
+        bus.deliver(Event(11, "score", "{}"))
+
+        assert bus.since(5) is None
+        assert [event.id for event in bus.since(10)] == [11]
+
+    def test_wait_wakes_on_delivery(self) -> None:
+        """Test that a waiting subscriber is woken by a new event."""
+        bus = EventBus()
+        timer = threading.Timer(0.05, bus.deliver, [Event(1, "score", "{}")])
+        timer.start()
+        events = bus.wait(0, timeout=5)
+        timer.join()
+
+        assert [event.id for event in events] == [1]
+        assert bus.wait(1, timeout=0.01) == []
+
+    def test_subscriber_cap(self) -> None:
+        """Test that subscriptions beyond the cap are refused until one closes."""
+        bus = EventBus(max_subscribers=1)
+        subscription = bus.subscribe()
+        with pytest.raises(SubscriberLimitError):
+            bus.subscribe()
+
+        subscription.close()
+        subscription.close()
+        assert bus.subscribers == 0
+        bus.subscribe().close()
+
+    def test_frame(self) -> None:
+        """Test the SSE encoding of an event."""
+        assert Event(7, "score", '{"id":1}').frame == 'id: 7\nevent: score\ndata: {"id":1}\n\n'
+
+
+class TestBrokers:
+    """Test cases for the event brokers."""
+
+    def test_memory_broker_ids_increase(self, app: Flask) -> None:
+        """Test that the memory broker delivers events with increasing ids."""
+        bus = EventBus()
+        broker = get_broker("memory", app, bus)
+        first, second = broker.publish("score", "{}"), broker.publish("score", "{}")
+
+        assert isinstance(broker, MemoryBroker)
+        assert second == first + 1
+        assert bus.last_id == second
+
+    def test_database_broker_shares_events(self, app: Flask) -> None:
+        """Test that events published by one process reach another's bus with the same id."""
+        with app.app_context():
+            publisher = DatabaseBroker(app, EventBus())
+            subscriber_bus = EventBus()
+            subscriber = DatabaseBroker(app, subscriber_bus)
+            event_id = publisher.publish("score", '{"id":1}')
+
+            assert subscriber.poll() == 1
+            (event,) = subscriber_bus.since(0)
+            assert (event.id, event.kind, event.data) == (event_id, "score", '{"id":1}')
+            assert subscriber.poll() == 0
+
+    def test_database_broker_prunes_old_events(self, app: Flask) -> None:
+        """Test that the table keeps roughly one replay buffer of events."""
+        with app.app_context():
+            broker = DatabaseBroker(app, EventBus(buffer_size=10))
+            for _ in range(DatabaseBroker.PRUNE_EVERY):
+                broker.publish("score", "{}")
+
+            assert db.session.query(GraphEvent).count() == 10
+
+    def test_database_broker_replay_window(self, app: Flask) -> None:
+        """Test that a new process loads recent events and marks older ones missing."""
+        with app.app_context():
+            publisher = DatabaseBroker(app, EventBus())
+            ids = [publisher.publish("score", "{}") for _ in range(5)]
+            bus = EventBus(buffer_size=3)
+            DatabaseBroker(app, bus).poll()
+
+            assert [event.id for event in bus.since(ids[1])] == ids[2:]
+            assert bus.since(ids[0]) is None
+
+    def test_unknown_broker(self, app: Flask) -> None:
+        """Test that an unknown broker name is reported."""
+        with pytest.raises(KeyError, match="Unknown event broker"):
+            get_broker("nope", app, EventBus())
+
+
+class TestEventStream:
+    """Test cases for GET /api/graph/events."""
+
+    def test_requires_login(self, client: FlaskClient) -> None:
+        """Test that anonymous clients are rejected."""
+        assert client.get("/api/graph/events").status_code == 401
+
+    def test_heartbeat_and_retry(self, events_app: Flask, authenticated_client) -> None:
+        """Test that an idle stream sends the retry hint and heartbeats."""
+        response = authenticated_client.get("/api/graph/events")
+
+        assert response.mimetype == "text/event-stream"
+        body = response.get_data(as_text=True)
+        assert body.startswith("retry: 3000\n\n")
+        assert ": heartbeat\n\n" in body
+        assert events_app.extensions["events"].bus.subscribers == 0
+
+    def test_replay_after_last_event_id(self, events_app: Flask, authenticated_client) -> None:
+        """Test that a reconnecting client receives the events it missed."""
+        with events_app.app_context():
+            ids = [publish("score", {"type": "score", "id": i, "score": i}) for i in range(3)]
+
+        response = authenticated_client.get(
+            "/api/graph/events", headers={"Last-Event-ID": str(ids[0])},
+        )
+        assert event_ids(response.get_data(as_text=True)) == ids[1:]
+
+    def test_reset_when_replay_is_gone(self, events_app: Flask, authenticated_client) -> None:
+        """Test that a client behind the ring buffer is told to reload."""
+        channel: EventChannel = events_app.extensions["events"]
+        channel.bus.mark_missing(channel.bus.last_id + 100)
+
+        response = authenticated_client.get("/api/graph/events?last_event_id=1")
+        assert "event: reset\n" in response.get_data(as_text=True)
+
+    def test_invalid_last_event_id(self, events_app: Flask, authenticated_client) -> None:
+        """Test that a malformed Last-Event-ID is rejected."""
+        response = authenticated_client.get("/api/graph/events", headers={"Last-Event-ID": "x"})
+        assert response.status_code == 400
+
+    def test_subscriber_cap(self, events_app: Flask, authenticated_client) -> None:
+        """Test that streams beyond the cap get 503 with Retry-After."""
+        events_app.extensions["events"].bus.max_subscribers = 0
+
+        response = authenticated_client.get("/api/graph/events")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "10"
+
+    def test_writes_publish_deltas(self, events_app: Flask, authenticated_client) -> None:
+        """Test that new articles and votes are published as node and score events."""
+        channel: EventChannel = events_app.extensions["events"]
+        start = channel.bus.last_id
+        response = authenticated_client.post("/api/articles", json={"title": "T"})
+        article_id = response.get_json()["id"]
+        authenticated_client.put(f"/api/articles/{article_id}/vote", json={"value": 1})
+
+        kinds = [(event.kind, event.data) for event in channel.bus.since(start)]
+        assert kinds[0][0] == "node"
+        assert f'"id":{article_id}' in kinds[0][1]
+        assert kinds[-1] == ("score", f'{{"type":"score","id":{article_id},"score":1}}')
@@ -0,0 +1,89 @@
+"""Tests for the streaming graph API.
+
+Tests NDJSON output, keyset pagination and filters of /api/graph.
+"""
+
+import json
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from database import db
+from models.article import Article
+from models.user import User
+
+
+def _records(response) -> list[dict]:
+    """Parse an NDJSON response body."""
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+@pytest.fixture
+def graph_articles(app: Flask, test_user: User) -> list[int]:
+    """Create five tagged articles and return their ids."""
+    app.config["GRAPH_BATCH_SIZE"] = 2
+    with app.app_context():
+        articles = [
+            Article(title=f"Paper {i}", tags=tags, user_id=test_user.id)
+            for i, tags in enumerate(["llm", "llm,cv", "cv", "rl", "llm,rl"])
+        ]
+        db.session.add_all(articles)
+        db.session.commit()
+        return [article.id for article in articles]
+
+
+class TestGraphApi:
+    """Test cases for /api/graph."""
+
+    def test_requires_authentication(self, client: FlaskClient) -> None:
+        """Test that anonymous requests are rejected."""
+        assert client.get("/api/graph").status_code == 401
+
+    def test_streams_full_graph(self, authenticated_client, graph_articles) -> None:
+        """Test that all nodes and edges are streamed, nodes before their edges."""
+        response = authenticated_client.get("/api/graph")
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        records = _records(response)
+
+        seen = set()
+        for record in records:
+            if record["type"] == "node":
+                seen.add(record["id"])
+            elif record["type"] == "edge":
+                assert {record["source"], record["target"]} <= seen
+        nodes = [r for r in records if r["type"] == "node"]
+        edges = [r for r in records if r["type"] == "edge"]
+        assert [n["id"] for n in nodes] == graph_articles
+        assert nodes[1]["tags"] == ["cv", "llm"]
+        assert nodes[1]["author"] == "testuser"
+        assert len(edges) == 5
+        assert records[-1] == {"type": "cursor", "next": None}
+
+    def test_keyset_pagination(self, authenticated_client, graph_articles) -> None:
+        """Test that pages follow the cursor until it is exhausted."""
+        ids = []
+        cursor = 0
+        while cursor is not None:
+            records = _records(authenticated_client.get(f"/api/graph?limit=3&cursor={cursor}"))
+            ids += [r["id"] for r in records if r["type"] == "node"]
+            cursor = records[-1]["next"]
+        assert ids == graph_articles
+
+    def test_tag_filter(self, authenticated_client, graph_articles) -> None:
+        """Test that the tag filter restricts nodes and edges to tagged articles."""
+        records = _records(authenticated_client.get("/api/graph?tag=LLM"))
+        node_ids = {r["id"] for r in records if r["type"] == "node"}
+        assert node_ids == {graph_articles[0], graph_articles[1], graph_articles[4]}
+        for edge in (r for r in records if r["type"] == "edge"):
+            assert {edge["source"], edge["target"]} <= node_ids
+
+    def test_author_filter(self, authenticated_client, graph_articles) -> None:
+        """Test that filtering by an unknown author yields an empty graph."""
+        records = _records(authenticated_client.get("/api/graph?author=nobody"))
+        assert records == [{"type": "cursor", "next": None}]
+
+    def test_invalid_limit(self, authenticated_client) -> None:
+        """Test that a non-positive page size is rejected."""
+        assert authenticated_client.get("/api/graph?limit=0").status_code == 400
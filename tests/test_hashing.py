@@ -0,0 +1,124 @@
+"""Tests for executor-backed password hashing.
+
+Tests the bounded hashing pool, fast rejection and its use by the auth views.
+"""
+
+import threading
+from collections.abc import Generator
+
+import pytest
+from flask import Flask
+from werkzeug.security import check_password_hash
+
+from hashing import HashingBusyError, PasswordHasher
+
+
+@pytest.fixture
+def hasher() -> Generator[PasswordHasher, None, None]:
+    """Thread-pool hasher with one worker and one queue slot."""
+    hasher = PasswordHasher("thread", workers=1, queue_size=1, timeout=5)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    """Test cases for PasswordHasher."""
+
+    def test_generate_and_check(self, hasher: PasswordHasher) -> None:
+        """Test hashing and verification through the pool."""
+        pwhash = hasher.generate("secret", "pbkdf2:sha256:1000", 16)
+        assert check_password_hash(pwhash, "secret")
+        assert hasher.check(pwhash, "secret")
+        assert not hasher.check(pwhash, "wrong")
+
+    def test_process_pool(self) -> None:
+        """Test that the process pool hashes with picklable werkzeug functions."""
+        hasher = PasswordHasher("process", workers=1)
+        try:
+            assert hasher.check(hasher.generate("secret", "pbkdf2:sha256:1000", 8), "secret")
+        finally:
+            hasher.shutdown()
+
+    def test_full_pool_rejects_fast(self, hasher: PasswordHasher) -> None:
+        """Test that requests beyond workers + queue are rejected immediately."""
+        release = threading.Event()
+        running = hasher.submit(release.wait)
+        queued = hasher.submit(release.wait)
+        with pytest.raises(HashingBusyError):
+            hasher.submit(release.wait)
+        assert hasher.rejected == 1
+
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        assert hasher.check(hasher.generate("x", "pbkdf2:sha256:1000", 8), "x")
+
+    def test_timeout_is_busy(self) -> None:
+        """Test that a hash not done within the timeout raises HashingBusyError."""
+        hasher = PasswordHasher("thread", workers=1, queue_size=1, timeout=0.05)
+        release = threading.Event()
+        running = hasher.submit(release.wait)
+        try:
+            with pytest.raises(HashingBusyError, match="timed out"):
+                hasher.check("pbkdf2:sha256:1000$salt$hash", "secret")
+            assert hasher.timed_out == 1
+        finally:
+            release.set()
+            running.result(timeout=5)
+            hasher.shutdown()
+
+    def test_unknown_mode(self) -> None:
+        """Test that unsupported executor modes are rejected."""
+        with pytest.raises(ValueError, match="Unknown hashing executor"):
+            PasswordHasher("fiber", workers=1)
+
+
+class TestPooledAuth:
+    """Test cases for authentication with the hashing pool enabled."""
+
+    @pytest.fixture
+    def pooled_app(self, app: Flask) -> Generator[Flask, None, None]:
+        """Install a thread-pool hasher on the app."""
+        hasher = PasswordHasher("thread", workers=1, queue_size=0, timeout=5)
+        app.extensions["password_hasher"] = hasher
+        yield app
+        hasher.shutdown()
+
+    def test_login_through_pool(self, pooled_app, client, test_user) -> None:
+        """Test that login works when hashes are checked in the pool."""
+        response = client.post(
+            "/login", data={"username": "testuser", "password": "testpass123"},
+            follow_redirects=True,
+        )
+        assert b"Login successful" in response.data
+
+    def test_login_rejected_when_pool_full(self, pooled_app, client, test_user) -> None:
+        """Test that a saturated pool answers 503 with Retry-After."""
+        release = threading.Event()
+        blocker = pooled_app.extensions["password_hasher"].submit(release.wait)
+        try:
+            response = client.post(
+                "/login", data={"username": "testuser", "password": "testpass123"},
+            )
+        finally:
+            release.set()
+            blocker.result(timeout=5)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_login_rejected_on_timeout(self, pooled_app, client, test_user) -> None:
+        """Test that a hash timing out in the pool answers 503 instead of failing."""
+        hasher = PasswordHasher("thread", workers=1, queue_size=1, timeout=0.05)
+        pooled_app.extensions["password_hasher"] = hasher
+        release = threading.Event()
+        blocker = hasher.submit(release.wait)
+        try:
+            response = client.post(
+                "/login", data={"username": "testuser", "password": "testpass123"},
+            )
+        finally:
+            release.set()
+            blocker.result(timeout=5)
+            hasher.shutdown()
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
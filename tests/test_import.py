@@ -0,0 +1,235 @@
+"""Tests for the bulk article import.
+
+Tests the bibliography parsers, URL normalization, the import pipeline and
+the import command.
+"""
+
+import io
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from app import main
+from database import db
+from importers.parsers import (
+    detect_format,
+    normalize_url,
+    parse_arxiv,
+    parse_bibtex,
+    parse_csv,
+    read_bibtex,
+    read_csv,
+)
+from importers.pipeline import import_articles
+from models.article import Article, articles_by_tag
+from models.edge import ArticleEdge
+from models.job import Job
+from models.tag import Tag
+from models.user import User
+
+BIBTEX = """% Reading list
+@string{nips = "NeurIPS"}
+
+@article{vaswani2017,
+  title = {Attention Is {All} You
+           Need},
+  author = "Vaswani, Ashish and Shazeer, Noam",
+  year = 2017,
+  eprint = {1706.03762},
+  archivePrefix = {arXiv},
+  keywords = {nlp; Transformers},
+}
+
+@inproceedings{bert,
+  title = "{BERT}: Pre-training of Deep Bidirectional Transformers",
+  doi = {10.18653/V1/N19-1423},
+  keywords = {nlp},
+  abstract = {We introduce a new language representation model.}
+}
+
+@misc{untitled, author = {Nobody}}
+"""
+
+CSV = """Title,URL,Tags,Summary
+Deep residual learning,http://www.arxiv.org/pdf/1512.03385v1.pdf,"cv, resnet",Residual nets.
+"Playing Atari, again",https://example.com/atari/?utm_source=feed,rl,
+,https://example.com/no-title,,
+"""
+
+
+def arxiv_lines(*records: dict) -> str:
+    """Encode records as an arXiv metadata snapshot."""
+    return "".join(json.dumps(record) + "\n" for record in records)
+
+
+@pytest.fixture
+def inputs(tmp_path: Path) -> dict[str, Path]:
+    """Write one input file per format; return their paths by format."""
+    paths = {
+        "bibtex": tmp_path / "list.bib",
+        "csv": tmp_path / "list.csv",
+        "arxiv": tmp_path / "snapshot.jsonl",
+    }
+    paths["bibtex"].write_text(BIBTEX, encoding="utf-8")
+    paths["csv"].write_text(CSV, encoding="utf-8")
+    paths["arxiv"].write_text(
+        arxiv_lines(
+            {"id": "1706.03762", "title": "Attention is all you need", "categories": "cs.CL"},
+            {
+                "id": "2005.14165",
+                "title": "Language Models are\n Few-Shot Learners",
+                "abstract": "  GPT-3.  ",
+                "categories": "cs.CL nlp",
+            },
+        )
+        + "not json\n",
+        encoding="utf-8",
+    )
+    return paths
+
+
+class TestParsers:
+    """Test cases for the format parsers."""
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("http://www.Example.com/p/?utm_source=x&id=3#top", "https://example.com/p?id=3"),
+            ("arxiv.org/pdf/1706.03762v5.pdf", "https://arxiv.org/abs/1706.03762"),
+            ("https://arxiv.org/abs/1706.03762", "https://arxiv.org/abs/1706.03762"),
+            ("doi:10.1000/ABC", "https://doi.org/10.1000/abc"),
+            ("10.1000/abc", "https://doi.org/10.1000/abc"),
+            ("https://dx.doi.org/10.1000/abc", "https://doi.org/10.1000/abc"),
+            ("  ", None),
+        ],
+    )
+    def test_normalize_url(self, url: str, expected: str | None) -> None:
+        """Test that equivalent URLs normalize to the same string."""
+        assert normalize_url(url) == expected
+
+    def test_bibtex(self) -> None:
+        """Test that BibTeX entries are split and parsed, skipping @string and untitled ones."""
+        entries = list(read_bibtex(io.StringIO(BIBTEX)))
+        string, attention, bert, untitled = parse_bibtex(entries)
+
+        assert attention == {
+            "title": "Attention Is All You Need",
+            "url": "https://arxiv.org/abs/1706.03762",
+            "summary": None,
+            "tags": "nlp,transformers",
+        }
+        assert bert["title"] == "BERT: Pre-training of Deep Bidirectional Transformers"
+        assert bert["url"] == "https://doi.org/10.18653/v1/n19-1423"
+        assert bert["summary"] == "We introduce a new language representation model."
+        assert string is None
+        assert untitled is None
+
+    def test_csv(self) -> None:
+        """Test that CSV columns are matched case-insensitively."""
+        resnet, atari, untitled = parse_csv(list(read_csv(io.StringIO(CSV))))
+
+        assert resnet["url"] == "https://arxiv.org/abs/1512.03385"
+        assert resnet["tags"] == "cv,resnet"
+        assert atari["url"] == "https://example.com/atari"
+        assert atari["summary"] is None
+        assert untitled is None
+
+    def test_arxiv(self) -> None:
+        """Test that arXiv records become articles and malformed lines are invalid."""
+        lines = [
+            arxiv_lines({"id": "1", "title": "A\n  B", "abstract": " x ", "categories": "a b"}),
+            "{",
+        ]
+        assert parse_arxiv(lines) == [
+            {"title": "A B", "url": "https://arxiv.org/abs/1", "summary": "x", "tags": "a,b"},
+            None,
+        ]
+
+    def test_detect_format(self) -> None:
+        """Test format detection by extension."""
+        assert detect_format("refs.BIB") == "bibtex"
+        with pytest.raises(ValueError, match="Cannot tell the format"):
+            detect_format("refs.txt")
+
+
+class TestImportPipeline:
+    """Test cases for import_articles."""
+
+    def test_import_deduplicates_and_links_tags(
+        self, app: Flask, test_user: User, inputs: dict[str, Path],
+    ) -> None:
+        """Test a mixed import: duplicates across files, invalid records, tags and edges."""
+        with app.app_context():
+            existing = Article(
+                title="Existing", url="http://arxiv.org/abs/1512.03385", user_id=test_user.id,
+            )
+            db.session.add(existing)
+            db.session.commit()
+            reports = []
+
+            stats = import_articles(
+                inputs.values(), test_user.id, chunk_size=2, progress=reports.append,
+            )
+
+            assert (stats.read, stats.inserted, stats.duplicates, stats.invalid) == (10, 4, 2, 4)
+            assert reports[-1] is stats
+            titles = {article.title for article in articles_by_tag("nlp")}
+            assert titles == {
+                "Attention Is All You Need",
+                "BERT: Pre-training of Deep Bidirectional Transformers",
+                "Language Models are Few-Shot Learners",
+            }
+            assert db.session.query(Tag).filter_by(name="cs.cl").count() == 1
+            assert stats.edges == db.session.query(ArticleEdge).count() == 3
+            assert db.session.query(Job).count() == 1  # only for the article added above
+
+    def test_reimport_inserts_nothing(self, app, test_user, inputs: dict[str, Path]) -> None:
+        """Test that importing the same file twice only inserts it once."""
+        with app.app_context():
+            import_articles([inputs["bibtex"]], test_user.id)
+            stats = import_articles([inputs["bibtex"]], test_user.id)
+
+            assert (stats.inserted, stats.duplicates) == (0, 2)
+
+    def test_enqueue(self, app: Flask, test_user: User, inputs: dict[str, Path]) -> None:
+        """Test that --enqueue queues one processing job per imported article."""
+        with app.app_context():
+            stats = import_articles([inputs["csv"]], test_user.id, enqueue=True)
+            assert db.session.query(Job).count() == stats.inserted == 2
+
+    def test_process_pool(self, app: Flask, test_user: User, inputs: dict[str, Path]) -> None:
+        """Test that parsing in worker processes gives the same result."""
+        with app.app_context():
+            stats = import_articles([inputs["arxiv"]], test_user.id, chunk_size=1, processes=2)
+            assert (stats.inserted, stats.invalid) == (2, 1)
+
+    def test_unknown_format(self, app: Flask, test_user: User, inputs) -> None:
+        """Test that an unknown format is rejected before anything is read."""
+        with app.app_context(), pytest.raises(ValueError, match="Unknown import format"):
+            import_articles([inputs["csv"]], test_user.id, fmt="ris")
+
+
+class TestImportCommand:
+    """Test cases for constellate import."""
+
+    def test_import_command(self, app: Flask, test_user: User, inputs) -> None:
+        """Test that the command imports files and reports the counters."""
+        with patch("app.create_app", return_value=app):
+            result = CliRunner().invoke(
+                main, ["import", str(inputs["bibtex"]), "--user", "testuser", "--processes", "0"],
+            )
+
+        assert result.exit_code == 0, result.output
+        assert "Imported 2 articles (0 duplicates, 2 invalid)" in result.output
+
+    def test_unknown_user(self, app: Flask, inputs: dict[str, Path]) -> None:
+        """Test that the submitting user must exist."""
+        with patch("app.create_app", return_value=app):
+            result = CliRunner().invoke(main, ["import", str(inputs["csv"]), "--user", "nobody"])
+
+        assert result.exit_code != 0
+        assert "No user named 'nobody'" in result.output
@@ -0,0 +1,212 @@
+"""Tests for the background job queue.
+
+Tests enqueueing on submission, claiming, retries with backoff and handlers.
+"""
+
+from collections.abc import Generator
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from app import main
+from database import db
+from jobs.handlers import HANDLERS, handler
+from jobs.queue import claim, enqueue, fail, requeue_stale, schedule_periodic
+from jobs.summarizers import FakeSummarizer, get_summarizer
+from jobs.worker import work, work_once
+from models.article import Article
+from models.job import (
+    DONE,
+    FAILED,
+    PROCESS_ARTICLE,
+    QUEUED,
+    RECONCILE_VOTES,
+    RUNNING,
+    Job,
+    utcnow,
+)
+from models.user import User
+
+
+@pytest.fixture
+def jobs_app(app: Flask, tmp_path: Path) -> Flask:
+    """Keep similarity files of processed articles in a temporary directory."""
+    app.config["EMBEDDING_DIR"] = tmp_path
+    return app
+
+
+@pytest.fixture
+def flaky_handler() -> Generator[None, None, None]:
+    """Register a handler that always fails."""
+
+    @handler("flaky")
+    def flaky(_job: Job) -> None:
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    yield
+    HANDLERS.pop("flaky")
+
+
+class TestEnqueue:
+    """Test cases for queueing jobs."""
+
+    def test_new_article_enqueues_processing(self, jobs_app: Flask, test_user: User) -> None:
+        """Test that inserting an article queues a process_article job."""
+        with jobs_app.app_context():
+            article = Article(title="Queued", user_id=test_user.id)
+            db.session.add(article)
+            db.session.commit()
+            (job,) = article.jobs.all()
+            assert job.kind == PROCESS_ARTICLE
+            assert job.status == QUEUED
+
+    def test_enqueue_can_be_disabled(self, jobs_app: Flask, test_user: User) -> None:
+        """Test that JOBS_ENQUEUE_ON_INSERT turns the hook off."""
+        jobs_app.config["JOBS_ENQUEUE_ON_INSERT"] = False
+        with jobs_app.app_context():
+            db.session.add(Article(title="Not queued", user_id=test_user.id))
+            db.session.commit()
+            assert Job.query.count() == 0
+
+    def test_submit_endpoint_returns_immediately(self, jobs_app, authenticated_client) -> None:
+        """Test that submission responds 202 with a queued job and no summary."""
+        response = authenticated_client.post(
+            "/api/articles", json={"title": "Fresh paper", "tags": "llm"},
+        )
+        assert response.status_code == 202
+        body = response.get_json()
+        assert [job["status"] for job in body["jobs"]] == [QUEUED]
+        with jobs_app.app_context():
+            assert db.session.get(Article, body["id"]).summary is None
+
+    def test_submit_requires_title(self, authenticated_client) -> None:
+        """Test that a submission without title is rejected."""
+        assert authenticated_client.post("/api/articles", json={}).status_code == 400
+
+    def test_submit_requires_authentication(self, client) -> None:
+        """Test that anonymous submissions are rejected."""
+        assert client.post("/api/articles", json={"title": "x"}).status_code == 401
+
+
+class TestQueue:
+    """Test cases for claiming and retrying jobs."""
+
+    def test_claim_order_and_exclusivity(self, jobs_app: Flask) -> None:
+        """Test that due jobs are claimed once, oldest first."""
+        with jobs_app.app_context():
+            first = enqueue("noop")
+            second = enqueue("noop")
+            assert claim("w1").id == first.id
+            claimed = claim("w2")
+            assert claimed.id == second.id
+            assert claimed.status == RUNNING
+            assert claimed.attempts == 1
+            assert claimed.locked_by == "w2"
+            assert claim("w3") is None
+
+    def test_fail_backs_off_then_gives_up(self, jobs_app: Flask) -> None:
+        """Test exponential backoff and the final failed state."""
+        jobs_app.config["JOB_BACKOFF_SECONDS"] = 10
+        with jobs_app.app_context():
+            job = enqueue("noop")
+            job.max_attempts = 2
+            db.session.commit()
+
+            job = claim("w")
+            before = utcnow()
+            fail(job, "first")
+            assert job.status == QUEUED
+            assert job.run_after >= before + timedelta(seconds=10)
+            assert claim("w") is None  # not due yet
+
+            job.run_after = utcnow()
+            db.session.commit()
+            fail(claim("w"), "second")
+            assert job.status == FAILED
+            assert job.last_error == "second"
+
+    def test_requeue_stale(self, jobs_app: Flask) -> None:
+        """Test that jobs abandoned by a crashed worker are requeued."""
+        with jobs_app.app_context():
+            enqueue("noop")
+            job = claim("w")
+            job.locked_at = utcnow() - timedelta(hours=1)
+            db.session.commit()
+            assert requeue_stale(60) == 1
+            assert job.status == QUEUED
+
+    def test_schedule_periodic_keeps_one_pending_job(self, jobs_app: Flask) -> None:
+        """Test that a periodic kind is queued once, due after its interval."""
+        with jobs_app.app_context():
+            assert schedule_periodic({RECONCILE_VOTES: 60, "disabled": 0}) == 1
+            assert schedule_periodic({RECONCILE_VOTES: 60}) == 0
+            job = db.session.execute(db.select(Job)).scalar_one()
+            assert job.kind == RECONCILE_VOTES
+            assert job.run_after > utcnow() + timedelta(seconds=50)
+            assert claim("w") is None  # not due yet
+
+            job.run_after = utcnow()
+            db.session.commit()
+            assert work_once("w")
+            assert job.status == DONE
+            assert schedule_periodic({RECONCILE_VOTES: 60}) == 1
+
+
+class TestWorker:
+    """Test cases for running jobs."""
+
+    def test_process_article_summarizes_and_embeds(self, jobs_app, test_user) -> None:
+        """Test that the worker fills in the summary and the embedding."""
+        with jobs_app.app_context():
+            article = Article(title="Graph networks. They are great. Really.", user_id=test_user.id)
+            db.session.add(article)
+            db.session.commit()
+
+            assert work("test-worker", burst=True) == 1
+            assert article.jobs.one().status == DONE
+            assert article.summary == "Graph networks. They are great. Really."
+            assert article.embedding is not None
+
+    def test_failed_handler_records_error(self, jobs_app: Flask, flaky_handler) -> None:
+        """Test that a raising handler schedules a retry with the error recorded."""
+        with jobs_app.app_context():
+            job = enqueue("flaky")
+            assert work_once("w")
+            db.session.refresh(job)
+            assert job.status == QUEUED
+            assert job.last_error == "RuntimeError: boom"
+            assert not work_once("w")
+
+    def test_jobs_endpoint(self, jobs_app, authenticated_client) -> None:
+        """Test that job status is visible per article."""
+        response = authenticated_client.post("/api/articles", json={"title": "T"})
+        article_id = response.get_json()["id"]
+        with jobs_app.app_context():
+            work("w", burst=True)
+        response = authenticated_client.get(f"/api/articles/{article_id}/jobs")
+        assert [job["status"] for job in response.get_json()] == [DONE]
+        assert authenticated_client.get("/api/articles/9999/jobs").status_code == 404
+
+    def test_worker_cli(self) -> None:
+        """Test that the worker command is registered."""
+        result = CliRunner().invoke(main, ["worker", "--help"])
+        assert result.exit_code == 0
+        assert "--processes" in result.output
+
+
+class TestSummarizers:
+    """Test cases for summarizers."""
+
+    def test_fake_summarizer(self) -> None:
+        """Test that the fake summarizer keeps the leading sentences."""
+        summary = FakeSummarizer(sentences=2).summarize("One.  Two!\nThree? Four.")
+        assert summary == "One. Two!"
+
+    def test_unknown_summarizer(self) -> None:
+        """Test that unknown summarizer names are rejected."""
+        with pytest.raises(KeyError, match="Unknown summarizer"):
+            get_summarizer("missing")
@@ -0,0 +1,236 @@
+"""Tests for schema migrations.
+
+Tests upgrading a database created by the original schema, the startup
+schema check, the upgrade command and the batched migration helpers.
+"""
+
+import sqlite3
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+from sqlalchemy import inspect, text
+
+from app import create_app, main
+from database import db
+from migrations.base import add_column, backfill_in_batches
+from migrations.runner import (
+    SchemaMismatchError,
+    cached_version,
+    current_version,
+    ensure_schema,
+    head,
+    pending,
+    upgrade,
+)
+from models.article import Article
+from models.search import search_articles
+from tests.conftest import TestConfig
+
+# Schema of databases created before migrations existed
+LEGACY_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL, email VARCHAR(120) UNIQUE,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, summary TEXT, url VARCHAR(500),
+    tags VARCHAR(500), user_id INTEGER NOT NULL REFERENCES users (id),
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, pdf_path VARCHAR(500)
+);
+INSERT INTO users (id, username, password_hash) VALUES (1, 'legacy', '-');
+INSERT INTO articles (title, summary, tags, user_id) VALUES
+    ('Attention is all you need', 'Transformers', 'nlp,ml', 1),
+    ('Deep residual learning', 'ResNets', 'cv,ml', 1);
+"""
+
+
+def dispose() -> None:
+    """Close the session and pooled connections of the current app."""
+    db.session.remove()
+    for engine in db.engines.values():
+        engine.dispose()
+
+
+@pytest.fixture
+def legacy_config(tmp_path: Path) -> type[TestConfig]:
+    """Config of a file database holding the original schema and two articles."""
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+
+    class LegacyConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        JOBS_ENQUEUE_ON_INSERT = False
+        MIGRATION_BATCH_SIZE = 1
+
+    return LegacyConfig
+
+
+@pytest.fixture
+def legacy_app(legacy_config: type[TestConfig]) -> Generator[Flask, None, None]:
+    """App on the legacy database, created without the schema check."""
+    app = create_app(legacy_config, check_schema=False)
+    with app.app_context():
+        yield app
+        dispose()
+
+
+class TestUpgrade:
+    """Test cases for upgrading an existing database."""
+
+    def test_startup_refuses_outdated_schema(self, legacy_config: type[TestConfig]) -> None:
+        """Test that the app does not boot on a database that needs an upgrade."""
+        with pytest.raises(SchemaMismatchError, match="constellate upgrade"):
+            create_app(legacy_config)
+
+    def test_upgrade_migrates_legacy_database(self, legacy_app: Flask) -> None:
+        """Test that all migrations run and bring data and indexes up to date."""
+        assert current_version() == 0
+
+        applied = upgrade()
+
+        assert [m.version for m in applied] == sorted(range(1, head() + 1))
+        assert current_version() == head()
+        article = db.session.execute(
+            db.select(Article).where(Article.title.startswith("Attention")),
+        ).scalar_one()
+        assert sorted(tag.name for tag in article.tag_objects) == ["ml", "nlp"]
+        indexes = {index["name"] for index in inspect(db.engine).get_indexes("articles")}
+        assert "ix_articles_user_id_created_at" in indexes
+        assert [r["id"] for r in search_articles("residual")] == [2]
+        edges = db.session.execute(text("SELECT count(*) FROM article_edges")).scalar()
+        assert edges == 1
+
+    def test_upgrade_is_resumable(self, legacy_app: Flask) -> None:
+        """Test that upgrading in steps applies each migration once."""
+        assert [m.version for m in upgrade(target=2)] == [1, 2]
+        assert [m.version for m in pending()] == list(range(3, head() + 1))
+        upgrade()
+        assert upgrade() == []
+
+    def test_upgraded_database_boots(self, legacy_config: type[TestConfig]) -> None:
+        """Test that the startup check passes after upgrading."""
+        app = create_app(legacy_config, check_schema=False)
+        with app.app_context():
+            upgrade()
+            dispose()
+
+        app = create_app(legacy_config)
+        with app.app_context():
+            assert current_version() == head()
+            dispose()
+
+
+class TestSchemaCheck:
+    """Test cases for the startup schema check."""
+
+    def test_new_database_is_created_at_head(self, app: Flask) -> None:
+        """Test that an empty database gets the schema and every migration stamped."""
+        assert current_version() == head()
+        assert pending() == []
+
+    def test_cached_version_skips_inspection(self, app: Flask) -> None:
+        """Test that an up-to-date database is accepted from the header version alone."""
+        assert cached_version() == head()
+        with patch("migrations.runner.inspect", side_effect=AssertionError("inspected")):
+            ensure_schema()
+
+    def test_startup_check_can_be_disabled(self, legacy_config: type[TestConfig]) -> None:
+        """Test that SCHEMA_CHECK_ON_STARTUP leaves the check to the CLI."""
+
+        class UncheckedConfig(legacy_config):
+            SCHEMA_CHECK_ON_STARTUP = False
+
+        app = create_app(UncheckedConfig)
+        with app.app_context():
+            assert current_version() == 0
+            dispose()
+
+    def test_newer_database_is_refused(self, app: Flask) -> None:
+        """Test that code older than the database refuses to start."""
+        # What a newer release's upgrade leaves behind: the row and the cached version
+        db.session.execute(
+            text("INSERT INTO schema_migrations (version, description) VALUES (:v, 'future')"),
+            {"v": head() + 1},
+        )
+        db.session.execute(text(f"PRAGMA user_version = {head() + 1}"))
+        db.session.commit()
+
+        with pytest.raises(SchemaMismatchError, match="newer"):
+            ensure_schema()
+
+
+class TestMigrationHelpers:
+    """Test cases for the batched migration helpers."""
+
+    def test_backfill_in_batches(self, app: Flask, test_user) -> None:
+        """Test that a backfill updates matching rows one key range at a time."""
+        db.session.add_all(
+            Article(title=f"Paper {i}", user_id=test_user.id) for i in range(5)
+        )
+        db.session.commit()
+        commits = []
+        original_commit = db.session.commit
+
+        def counting_commit() -> None:
+            commits.append(1)
+            original_commit()
+
+        with patch.object(db.session, "commit", counting_commit):
+            updated = backfill_in_batches(
+                Article.__table__,
+                {"summary": "backfilled"},
+                where=(Article.id > 1,),
+                batch_size=2,
+            )
+
+        assert updated == 4
+        assert len(commits) == 3
+        summaries = db.session.execute(db.select(Article.summary).order_by(Article.id)).scalars()
+        assert list(summaries) == [None] + ["backfilled"] * 4
+
+    def test_add_column(self, legacy_app: Flask) -> None:
+        """Test that a column declared on the model is added once."""
+        db.session.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY)"))
+        db.session.commit()
+
+        assert add_column(db.metadata.tables["jobs"], "attempts") is True
+        assert add_column(db.metadata.tables["jobs"], "attempts") is False
+        columns = {column["name"] for column in inspect(db.engine).get_columns("jobs")}
+        assert columns == {"id", "attempts"}
+
+
+class TestUpgradeCommand:
+    """Test cases for the upgrade CLI command."""
+
+    def test_upgrade_command(self, legacy_config: type[TestConfig]) -> None:
+        """Test that the command applies and reports the pending migrations."""
+        with patch("app.create_app", lambda **kwargs: create_app(legacy_config, **kwargs)):
+            dry = CliRunner().invoke(main, ["upgrade", "--dry-run"])
+            result = CliRunner().invoke(main, ["upgrade"])
+
+        assert dry.exit_code == 0
+        assert "Pending 1:" in dry.output
+        assert "schema version 0" in dry.output
+        assert result.exit_code == 0
+        assert "Applying 1:" in result.output
+        assert f"schema version {head()} (latest {head()})" in result.output
+
+    def test_check_schema_command(self, legacy_config: type[TestConfig]) -> None:
+        """Test that the check command fails until the database is upgraded."""
+        with patch("app.create_app", lambda **kwargs: create_app(legacy_config, **kwargs)):
+            before = CliRunner().invoke(main, ["check-schema"])
+            CliRunner().invoke(main, ["upgrade"])
+            after = CliRunner().invoke(main, ["check-schema"])
+
+        assert before.exit_code == 1
+        assert "constellate upgrade" in before.output
+        assert after.exit_code == 0
+        assert f"version {head()}" in after.output
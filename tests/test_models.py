@@ -1,16 +1,24 @@
 """Tests for database models.
 
-Tests User and Article models, their relationships, and methods.
+Tests User and Article models, their relationships, methods and indexes.
 """
 
 from datetime import datetime
 
 import pytest
 from flask import Flask
+from flask_sqlalchemy.query import Query
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
-from database import db
-from models.article import Article
+from database import create_missing_indexes, db
+from models.article import (
+    Article,
+    articles_by_user,
+    recent_articles,
+    recently_updated_articles,
+    trending_articles,
+)
 from models.user import User
 
 
@@ -182,3 +190,45 @@ class TestArticleModel:
             db.session.commit()
 
             assert "Repr Article" in repr(article)
+
+
+def query_plan(query: Query) -> str:
+    """Return SQLite's EXPLAIN QUERY PLAN output for a query, one step per line."""
+    sql = query.statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return "\n".join(row[3] for row in rows)
+
+
+class TestArticleIndexes:
+    """Test cases for the indexes serving the article listings."""
+
+    @pytest.mark.parametrize(
+        ("build", "index"),
+        [
+            (lambda: articles_by_user(1), "ix_articles_user_id_created_at"),
+            (lambda: db.session.get(User, 1).articles, "ix_articles_user_id_created_at"),
+            (recent_articles, "ix_articles_created_at"),
+            (recently_updated_articles, "ix_articles_updated_at"),
+            (trending_articles, "ix_articles_trending"),
+        ],
+    )
+    def test_listing_uses_index(self, app: Flask, test_user: User, build, index: str) -> None:
+        """Test that listings read an index instead of scanning and sorting the table."""
+        with app.app_context():
+            plan = query_plan(build().limit(20))
+
+        assert f"USING INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
+        assert "SCAN articles\n" not in f"{plan}\n"
+
+    def test_create_missing_indexes(self, app: Flask) -> None:
+        """Test that indexes missing from an existing table are added once."""
+        with app.app_context():
+            db.session.execute(text("DROP INDEX ix_articles_user_id_created_at"))
+            db.session.execute(text("DROP INDEX ix_articles_updated_at"))
+            db.session.commit()
+
+            assert create_missing_indexes() == [
+                "ix_articles_updated_at", "ix_articles_user_id_created_at",
+            ]
+            assert create_missing_indexes() == []
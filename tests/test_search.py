@@ -0,0 +1,151 @@
+"""Tests for full-text article search.
+
+Tests FTS5 index maintenance, ranking, highlighting and /api/search.
+"""
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy import text
+
+from database import db
+from models.article import Article
+from models.search import match_expression, rebuild_search_index, search_articles
+from models.user import User
+
+
+@pytest.fixture
+def search_articles_data(app: Flask, test_user: User) -> dict[str, int]:
+    """Create articles with distinct titles and summaries; return ids by key."""
+    with app.app_context():
+        articles = {
+            "transformer": Article(
+                title="Attention is all you need",
+                summary="The Transformer relies entirely on attention mechanisms.",
+                tags="nlp,architecture",
+                user_id=test_user.id,
+            ),
+            "vision": Article(
+                title="Vision transformers at scale",
+                summary="Image patches are processed like tokens.",
+                tags="cv",
+                user_id=test_user.id,
+            ),
+            "rl": Article(
+                title="Playing Atari with deep reinforcement learning",
+                summary="A convolutional network trained with Q-learning <b>variants</b>.",
+                tags="rl",
+                user_id=test_user.id,
+            ),
+        }
+        db.session.add_all(articles.values())
+        db.session.commit()
+        return {key: article.id for key, article in articles.items()}
+
+
+class TestMatchExpression:
+    """Test cases for turning user input into FTS5 queries."""
+
+    def test_terms_are_quoted_and_last_is_prefix(self) -> None:
+        """Test that words are quoted and the last one prefix-matches."""
+        assert match_expression("deep reinf") == '"deep" "reinf"*'
+
+    def test_operators_are_searched_literally(self) -> None:
+        """Test that FTS5 syntax in the input cannot break the query."""
+        assert match_expression('NEAR("x" OR y*) -') == '"NEAR" "x" "OR" "y"*'
+
+    def test_empty_input(self) -> None:
+        """Test that input without words yields no query."""
+        assert match_expression(" ?! ") is None
+
+
+class TestSearchIndex:
+    """Test cases for the FTS5 index and ranking."""
+
+    def test_title_matches_rank_first(self, app: Flask, search_articles_data) -> None:
+        """Test that a title match outranks a summary-only match."""
+        with app.app_context():
+            results = search_articles("transformer")
+
+        assert [r["id"] for r in results] == [
+            search_articles_data["vision"], search_articles_data["transformer"],
+        ]
+
+    def test_stemming_and_prefix(self, app: Flask, search_articles_data) -> None:
+        """Test that stemmed words and a trailing prefix match."""
+        with app.app_context():
+            assert [r["id"] for r in search_articles("playing reinfor")] == [
+                search_articles_data["rl"],
+            ]
+            assert [r["id"] for r in search_articles("plays")] == [search_articles_data["rl"]]
+
+    def test_snippet_is_escaped_and_highlighted(self, app: Flask, search_articles_data) -> None:
+        """Test that snippets escape HTML and mark the matches."""
+        with app.app_context():
+            (result,) = search_articles("variants")
+
+        assert "<mark>variants</mark>" in result["snippet"]
+        assert "&lt;b&gt;" in result["snippet"]
+
+    def test_tag_filter(self, app: Flask, search_articles_data) -> None:
+        """Test that results can be restricted to a tag."""
+        with app.app_context():
+            results = search_articles("transformer", tag="CV")
+
+        assert [r["id"] for r in results] == [search_articles_data["vision"]]
+
+    def test_index_follows_updates_and_deletes(self, app: Flask, search_articles_data) -> None:
+        """Test that the triggers keep the index in sync with the articles table."""
+        with app.app_context():
+            article = db.session.get(Article, search_articles_data["rl"])
+            article.title = "Mastering Go without human knowledge"
+            db.session.commit()
+            assert search_articles("atari") == []
+            assert [r["id"] for r in search_articles("mastering")] == [article.id]
+
+            db.session.delete(article)
+            db.session.commit()
+            assert search_articles("mastering") == []
+
+    def test_rebuild_indexes_existing_rows(self, app: Flask, search_articles_data) -> None:
+        """Test that rebuilding recreates a dropped index from the articles table."""
+        with app.app_context():
+            db.session.execute(text("DROP TABLE articles_fts"))
+            db.session.commit()
+
+            assert rebuild_search_index() == len(search_articles_data)
+            assert len(search_articles("attention")) == 1
+
+
+class TestSearchApi:
+    """Test cases for /api/search."""
+
+    def test_requires_authentication(self, client: FlaskClient) -> None:
+        """Test that anonymous requests are rejected."""
+        assert client.get("/api/search?q=attention").status_code == 401
+
+    def test_search(self, authenticated_client, search_articles_data) -> None:
+        """Test that results come back as JSON, best first."""
+        response = authenticated_client.get("/api/search?q=attention")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["query"] == "attention"
+        assert data["results"][0]["id"] == search_articles_data["transformer"]
+        assert data["results"][0]["title"] == "Attention is all you need"
+
+    def test_paging(self, authenticated_client, search_articles_data) -> None:
+        """Test that limit and offset page through the results."""
+        first = authenticated_client.get("/api/search?q=transformer&limit=1").get_json()
+        second = authenticated_client.get(
+            "/api/search?q=transformer&limit=1&offset=1",
+        ).get_json()
+
+        assert [r["id"] for r in first["results"] + second["results"]] == [
+            search_articles_data["vision"], search_articles_data["transformer"],
+        ]
+
+    def test_invalid_limit(self, authenticated_client) -> None:
+        """Test that out-of-range page sizes are rejected."""
+        assert authenticated_client.get("/api/search?q=x&limit=0").status_code == 400
+        assert authenticated_client.get("/api/search?q=x&limit=1000").status_code == 400
@@ -0,0 +1,99 @@
+"""Tests for the production server configuration.
+
+Tests gunicorn option building, the event stream limits of a worker,
+reloading and the post-fork engine disposal hook.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from flask import Flask
+
+from database import db
+from server import GunicornApplication, build_options, fit_event_streams, post_fork
+
+
+class TestBuildOptions:
+    """Test cases for gunicorn settings."""
+
+    def test_workers_are_threaded(self) -> None:
+        """Test that workers are threaded, so event streams do not take a whole worker."""
+        options = build_options("0.0.0.0:8000", workers=4, threads=1)
+
+        assert options["worker_class"] == "gthread"
+        assert options["workers"] == 4
+        assert options["preload_app"] is True
+        assert options["post_fork"] is post_fork
+
+    def test_threads_and_preload(self) -> None:
+        """Test that the thread count and preloading are passed on."""
+        options = build_options("127.0.0.1:8000", workers=2, threads=8, preload=False)
+
+        assert options["worker_class"] == "gthread"
+        assert options["threads"] == 8
+        assert options["preload_app"] is False
+
+    def test_max_requests_jitter(self) -> None:
+        """Test that worker recycling is jittered so workers do not restart together."""
+        options = build_options("127.0.0.1:8000", 2, 1, max_requests=1000)
+
+        assert options["max_requests"] == 1000
+        assert options["max_requests_jitter"] == 100
+
+
+class TestEventStreams:
+    """Test cases for fitting event streams into a worker."""
+
+    def test_streams_leave_threads_for_requests(self, app: Flask) -> None:
+        """Test that streams get the threads beyond the reserved ones."""
+        fit_event_streams(app, threads=16, timeout=30)
+
+        assert app.config["EVENTS_MAX_SUBSCRIBERS"] == 12
+        assert app.extensions["events"].bus.max_subscribers == 12
+        assert app.config["EVENTS_HEARTBEAT_SECONDS"] == 15.0
+
+    def test_few_threads_and_short_timeout(self, app: Flask) -> None:
+        """Test that streams need spare threads and heartbeats follow the timeout."""
+        fit_event_streams(app, threads=2, timeout=10)
+
+        assert app.extensions["events"].bus.max_subscribers == 0
+        assert app.config["EVENTS_HEARTBEAT_SECONDS"] == 5.0
+
+    def test_stream_refused_without_spare_threads(self, app: Flask, authenticated_client) -> None:
+        """Test that streams beyond the fitted cap get 503."""
+        fit_event_streams(app, threads=4, timeout=30)
+
+        assert authenticated_client.get("/api/graph/events").status_code == 503
+
+
+class TestReload:
+    """Test cases for reloading the app on SIGHUP."""
+
+    def test_reload_builds_the_app_again(self) -> None:
+        """Test that a reload drops the preloaded app so new workers get a fresh one."""
+        factory = MagicMock(side_effect=[MagicMock(name="old"), MagicMock(name="new")])
+        application = GunicornApplication(factory, build_options("127.0.0.1:8000", 2, 1))
+        with patch("server.fit_event_streams") as fit:
+            old = application.wsgi()
+            assert application.wsgi() is old
+
+            application.reload()
+
+            assert application.wsgi() is not old
+        fit.assert_called_with(application.wsgi(), 1, 30)
+        assert factory.call_count == 2
+        assert application.cfg.preload_app is True
+
+
+class TestPostFork:
+    """Test cases for the post-fork hook."""
+
+    def test_post_fork_disposes_inherited_connections(self, app: Flask) -> None:
+        """Test that a forked worker drops the pool it inherited from the master."""
+        worker = MagicMock()
+        worker.app.wsgi.return_value = app
+        engine = db.engine
+
+        with patch.object(engine, "dispose") as mock_dispose:
+            post_fork(None, worker)
+
+        mock_dispose.assert_called_once_with(close=False)
@@ -0,0 +1,204 @@
+"""Tests for article embeddings and the similarity index.
+
+Tests the hashing embedder, the memory-mapped index and the similarity API.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from app import main
+from database import db
+from models.article import Article
+from models.embedding import ArticleEmbedding
+from models.user import User
+from similarity.ann import IVFIndex
+from similarity.embedders import HashingEmbedder, get_embedder
+from similarity.index import SimilarityIndex
+from similarity.service import embed_missing, get_index, rebuild_index, similar_articles
+
+
+@pytest.fixture
+def similarity_app(app: Flask, tmp_path: Path) -> Flask:
+    """Point the similarity index at a temporary directory."""
+    app.config["EMBEDDING_DIR"] = tmp_path
+    return app
+
+
+@pytest.fixture
+def papers(similarity_app: Flask, test_user: User) -> list[int]:
+    """Create articles with overlapping titles and return their ids."""
+    titles = [
+        "Attention is all you need transformers",
+        "Transformers for language modeling attention",
+        "Convolutional networks for image classification",
+    ]
+    with similarity_app.app_context():
+        articles = [Article(title=title, user_id=test_user.id) for title in titles]
+        db.session.add_all(articles)
+        db.session.commit()
+        return [article.id for article in articles]
+
+
+class TestHashingEmbedder:
+    """Test cases for the local hashing embedder."""
+
+    def test_embed_is_deterministic_and_normalized(self) -> None:
+        """Test that vectors are reproducible unit vectors."""
+        embedder = HashingEmbedder(dim=32)
+        first = embedder.embed(["graph neural networks", ""])
+        second = embedder.embed(["graph neural networks", ""])
+        assert first.shape == (2, 32)
+        assert first.dtype == np.float32
+        np.testing.assert_array_equal(first, second)
+        assert np.isclose(np.linalg.norm(first[0]), 1.0)
+        assert not first[1].any()
+
+    def test_unknown_embedder(self) -> None:
+        """Test that unknown embedder names are rejected."""
+        with pytest.raises(KeyError, match="Unknown embedder"):
+            get_embedder("missing")
+
+
+class TestSimilarityIndex:
+    """Test cases for the memory-mapped exact index."""
+
+    def test_search_matches_brute_force(self, tmp_path: Path) -> None:
+        """Test that chunked top-k equals a direct computation."""
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(50, 16)).astype(np.float32)
+        index = SimilarityIndex(tmp_path, 16, chunk_rows=7)
+        index.add(range(1, 51), vectors)
+
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = np.argsort(-(unit @ unit[0]))[:5] + 1
+        (results,) = index.search(vectors[0], 5)
+        assert [article_id for article_id, _ in results] == expected.tolist()
+        assert results[0][1] == pytest.approx(1.0)
+
+    def test_update_and_remove(self, tmp_path: Path) -> None:
+        """Test that the last record of an id wins and tombstones hide it."""
+        index = SimilarityIndex(tmp_path, 2)
+        index.add([1, 2, 3], np.array([[1, 0], [0, 1], [1, 1]]))
+        index.add([2], np.array([[1, 0.1]]))
+        assert index.neighbours(1, 1)[0][0] == 2
+        index.remove([2])
+        assert len(index) == 2
+        assert 2 not in index
+        assert index.neighbours(1, 5)[0][0] == 3
+
+    def test_other_process_appends_are_visible(self, tmp_path: Path) -> None:
+        """Test that a second handle sees vectors appended through the first."""
+        writer = SimilarityIndex(tmp_path, 2)
+        reader = SimilarityIndex(tmp_path, 2)
+        assert len(reader) == 0
+        writer.add([7], np.array([[1, 0]]))
+        assert 7 in reader
+
+    def test_dimension_change_resets(self, tmp_path: Path) -> None:
+        """Test that reopening with another dimension discards old vectors."""
+        SimilarityIndex(tmp_path, 2).add([1], np.array([[1, 0]]))
+        assert len(SimilarityIndex(tmp_path, 3)) == 0
+
+
+class TestIVFIndex:
+    """Test cases for the approximate IVF index."""
+
+    @pytest.fixture
+    def vectors(self) -> np.ndarray:
+        """Random vectors for indexing."""
+        return np.random.default_rng(1).normal(size=(200, 8)).astype(np.float32)
+
+    def test_untrained_falls_back_to_exact(self, tmp_path: Path, vectors) -> None:
+        """Test that an untrained index answers like the exact index."""
+        exact = SimilarityIndex(tmp_path / "exact", 8)
+        exact.add(range(1, 201), vectors)
+        ivf = IVFIndex(tmp_path / "ivf", 8, nlist=10)
+        ivf.add(range(1, 201), vectors)
+        assert not ivf.trained
+        assert ivf.search(vectors[:3], 5) == exact.search(vectors[:3], 5)
+
+    def test_probing_all_lists_is_exact(self, tmp_path: Path, vectors) -> None:
+        """Test that nprobe == nlist returns the exact neighbours."""
+        exact = SimilarityIndex(tmp_path / "exact", 8)
+        exact.add(range(1, 201), vectors)
+        ivf = IVFIndex(tmp_path / "ivf", 8, nlist=10, nprobe=10)
+        ivf.add(range(1, 201), vectors)
+        ivf.train()
+        assert ivf.trained
+        for got, want in zip(ivf.search(vectors[:5], 5), exact.search(vectors[:5], 5), strict=True):
+            assert [i for i, _ in got] == [i for i, _ in want]
+
+    def test_persisted_and_incremental(self, tmp_path: Path, vectors) -> None:
+        """Test that a reopened index keeps its lists and sees new inserts."""
+        ivf = IVFIndex(tmp_path, 8, nlist=10, nprobe=10)
+        ivf.add(range(1, 201), vectors)
+        ivf.train()
+
+        reopened = IVFIndex(tmp_path, 8, nlist=10, nprobe=10)
+        assert reopened.trained
+        assert reopened.neighbours(1, 3) == ivf.neighbours(1, 3)
+
+        ivf.add([500], vectors[:1] * 2)
+        reopened.remove([2])
+        assert reopened.neighbours(1, 1)[0][0] == 500
+        assert 2 not in ivf
+
+    def test_service_backend(self, similarity_app: Flask, papers: list[int]) -> None:
+        """Test that the configured backend is used by the service."""
+        similarity_app.config["SIMILARITY_BACKEND"] = "ivf"
+        with similarity_app.app_context():
+            embed_missing()
+            assert isinstance(get_index(), IVFIndex)
+            assert rebuild_index() == 3
+            assert [a.id for a, _ in similar_articles(papers[0], k=1)] == [papers[1]]
+
+
+class TestSimilarityService:
+    """Test cases for storing embeddings and querying neighbours."""
+
+    def test_embed_missing_and_query(self, similarity_app: Flask, papers: list[int]) -> None:
+        """Test that embedding articles makes them searchable."""
+        with similarity_app.app_context():
+            assert embed_missing(batch_size=2) == 3
+            assert embed_missing() == 0
+            assert ArticleEmbedding.query.count() == 3
+
+            results = similar_articles(papers[0], k=2)
+            assert [article.id for article, _ in results] == [papers[1], papers[2]]
+            assert results[0][1] > results[1][1]
+
+    def test_index_rebuilt_from_database(self, similarity_app: Flask, papers: list[int]) -> None:
+        """Test that a lost index file is rebuilt from the stored vectors."""
+        with similarity_app.app_context():
+            embed_missing()
+            get_index().path.unlink()
+            assert rebuild_index() == 3
+            assert len(get_index()) == 3
+
+    def test_deleted_articles_skipped(self, similarity_app: Flask, papers: list[int]) -> None:
+        """Test that neighbours deleted after indexing are not returned."""
+        with similarity_app.app_context():
+            embed_missing()
+            db.session.delete(db.session.get(Article, papers[1]))
+            db.session.commit()
+            assert ArticleEmbedding.query.count() == 2
+            assert [a.id for a, _ in similar_articles(papers[0])] == [papers[2]]
+
+    def test_similar_endpoint(self, similarity_app, papers, authenticated_client) -> None:
+        """Test the JSON similarity endpoint."""
+        with similarity_app.app_context():
+            embed_missing()
+        response = authenticated_client.get(f"/api/articles/{papers[0]}/similar?k=1")
+        assert response.status_code == 200
+        assert [item["id"] for item in response.get_json()] == [papers[1]]
+        assert authenticated_client.get(f"/api/articles/{papers[0]}/similar?k=0").status_code == 400
+
+    def test_embed_cli(self) -> None:
+        """Test that the embed command is registered."""
+        result = CliRunner().invoke(main, ["embed", "--help"])
+        assert result.exit_code == 0
+        assert "--rebuild" in result.output
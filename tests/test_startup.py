@@ -0,0 +1,123 @@
+"""Tests for application startup cost.
+
+Tests that optional subsystems are imported lazily, that create_app stays
+within its cold-start budget, and the startup profiling helpers.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from types import ModuleType
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from app import main
+from lazy import lazy_import
+from profiling import by_package, parse_import_times, profile_startup
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Generous bound for a cold interpreter running imports + create_app (about
+# 0.6 s locally); it catches heavy imports creeping back in, not noise
+COLD_START_BUDGET_SECONDS = 3.0
+
+# Modules that must not be executed by a plain create_app
+LAZY_MODULES = (
+    "numpy", "gunicorn", "server", "jobs.worker", "similarity.service", "importers.pipeline",
+)
+
+CHILD_CODE = f"""
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+from config import Config
+
+class ColdConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+create_app(ColdConfig)
+elapsed = time.perf_counter() - start
+loaded = [m for m in {LAZY_MODULES!r} if type(sys.modules.get(m)) is type(sys)]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+@pytest.fixture(scope="module")
+def cold_start() -> dict:
+    """Run create_app in a fresh interpreter and return its timing and loaded modules."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", CHILD_CODE], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout)
+
+
+class TestColdStart:
+    """Test cases for the cold start of the app factory."""
+
+    def test_optional_subsystems_are_not_imported(self, cold_start: dict) -> None:
+        """Test that NumPy, gunicorn and the worker pool load only on first use."""
+        assert cold_start["loaded"] == []
+
+    def test_cold_start_within_budget(self, cold_start: dict) -> None:
+        """Test that imports plus create_app stay within the startup budget."""
+        assert cold_start["seconds"] < COLD_START_BUDGET_SECONDS
+
+
+class TestLazyImport:
+    """Test cases for deferred module imports."""
+
+    def test_module_executes_on_first_attribute_access(self) -> None:
+        """Test that the module body runs only when an attribute is used."""
+        sys.modules.pop("tests.lazy_target", None)
+        module = lazy_import("tests.lazy_target")
+        assert type(module) is not ModuleType
+
+        assert module.VALUE == 42
+        assert type(module) is ModuleType
+
+    def test_loaded_module_is_returned_as_is(self) -> None:
+        """Test that already imported modules are not wrapped."""
+        assert lazy_import("json") is json
+
+    def test_missing_module_fails_immediately(self) -> None:
+        """Test that a typo is reported at import time, not at first use."""
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("tests.no_such_module")
+
+
+class TestProfileStartup:
+    """Test cases for startup profiling."""
+
+    def test_parse_import_times(self) -> None:
+        """Test that -X importtime lines are parsed and grouped per package."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   sqlalchemy.sql\n"
+            "import time:        50 |        150 | sqlalchemy\n"
+            "import time:        70 |         70 | flask\n"
+        )
+        rows = parse_import_times(stderr)
+
+        assert rows[0] == ("sqlalchemy.sql", 100, 100)
+        assert by_package(rows) == [("sqlalchemy", 150), ("flask", 70)]
+
+    def test_profile_startup(self) -> None:
+        """Test that a child interpreter reports its duration and imports."""
+        seconds, rows = profile_startup("import json; print(0.5)")
+
+        assert seconds == 0.5
+        assert any(name == "json" for name, _, _ in rows)
+
+    def test_profile_startup_command(self) -> None:
+        """Test that the CLI command prints the cold start and slowest packages."""
+        rows = [("sqlalchemy.sql", 3000, 3000), ("sqlalchemy", 1000, 4000), ("flask", 2000, 2000)]
+        with patch("app.profile_startup", return_value=(0.25, rows)):
+            result = CliRunner().invoke(main, ["profile-startup", "--limit", "1"])
+
+        assert result.exit_code == 0, result.output
+        assert "Cold start (imports + create_app): 250.0 ms" in result.output
+        assert "4.0 ms  sqlalchemy" in result.output
+        assert "flask" not in result.output
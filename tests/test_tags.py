@@ -0,0 +1,103 @@
+"""Tests for the normalized tag index.
+
+Tests tag parsing, synchronization from Article.tags, and tag query helpers.
+"""
+
+from click.testing import CliRunner
+from flask import Flask
+
+from app import main
+from database import db
+from models.article import Article, articles_by_tag, backfill_tags
+from models.tag import Tag, article_tags, parse_tags, tag_cooccurrence, tag_counts
+from models.user import User
+
+
+def _add_articles(user: User, *tag_strings: str | None) -> list[Article]:
+    """Create one committed article per tag string."""
+    articles = [
+        Article(title=f"Article {i}", tags=tags, user_id=user.id)
+        for i, tags in enumerate(tag_strings)
+    ]
+    db.session.add_all(articles)
+    db.session.commit()
+    return articles
+
+
+class TestParseTags:
+    """Test cases for tag string parsing."""
+
+    def test_parse_tags_normalizes(self) -> None:
+        """Test that tags are stripped, lowercased and deduplicated."""
+        assert parse_tags(" LLMs, transformers ,llms,, ") == ["llms", "transformers"]
+
+    def test_parse_tags_empty(self) -> None:
+        """Test that empty input yields no tags."""
+        assert parse_tags(None) == []
+        assert parse_tags("") == []
+
+
+class TestTagIndex:
+    """Test cases for synchronizing Article.tags into the tag tables."""
+
+    def test_tags_created_on_insert(self, app: Flask, test_user: User) -> None:
+        """Test that inserting an article creates its Tag rows."""
+        with app.app_context():
+            (article,) = _add_articles(test_user, "ML, Vision")
+            assert sorted(tag.name for tag in article.tag_objects) == ["ml", "vision"]
+            assert Tag.query.count() == 2
+
+    def test_shared_new_tag_in_one_flush(self, app: Flask, test_user: User) -> None:
+        """Test that two new articles with the same new tag share one Tag row."""
+        with app.app_context():
+            _add_articles(test_user, "graphs", "graphs")
+            assert Tag.query.filter_by(name="graphs").count() == 1
+            assert db.session.query(article_tags).count() == 2
+
+    def test_tags_resynced_on_update(self, app: Flask, test_user: User) -> None:
+        """Test that changing Article.tags replaces the tag links."""
+        with app.app_context():
+            (article,) = _add_articles(test_user, "a,b")
+            article.tags = "b,c"
+            db.session.commit()
+            assert sorted(tag.name for tag in article.tag_objects) == ["b", "c"]
+
+    def test_backfill_from_legacy_column(self, app: Flask, test_user: User) -> None:
+        """Test that backfill rebuilds links missing from a legacy database."""
+        with app.app_context():
+            _add_articles(test_user, "x,y", "y", None)
+            db.session.execute(article_tags.delete())
+            db.session.commit()
+
+            assert backfill_tags(batch_size=1) == 2
+            assert tag_counts() == [("y", 2), ("x", 1)]
+
+    def test_backfill_cli(self, app: Flask) -> None:
+        """Test that the backfill-tags command is registered."""
+        result = CliRunner().invoke(main, ["backfill-tags", "--help"])
+        assert result.exit_code == 0
+        assert "--batch-size" in result.output
+
+
+class TestTagQueries:
+    """Test cases for tag query helpers."""
+
+    def test_articles_by_tag(self, app: Flask, test_user: User) -> None:
+        """Test filtering articles by tag name."""
+        with app.app_context():
+            first, second, _ = _add_articles(test_user, "llm", "LLM, cv", "cv")
+            assert articles_by_tag(" Llm ").all() == [first, second]
+            assert articles_by_tag("missing").all() == []
+
+    def test_tag_counts_limit(self, app: Flask, test_user: User) -> None:
+        """Test counting articles per tag with a limit."""
+        with app.app_context():
+            _add_articles(test_user, "a,b", "a", "c")
+            assert tag_counts(limit=1) == [("a", 2)]
+
+    def test_tag_cooccurrence(self, app: Flask, test_user: User) -> None:
+        """Test counting tag pairs appearing on the same article."""
+        with app.app_context():
+            _add_articles(test_user, "a,b", "a,b,c", "c")
+            assert tag_cooccurrence(min_count=2) == [("a", "b", 2)]
+            assert len(tag_cooccurrence()) == 3
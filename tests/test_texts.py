@@ -0,0 +1,247 @@
+"""Tests for the PDF text extraction cache.
+
+Tests the on-disk text cache, its use by the summarization and embedding
+stages, and the per-stage statistics.
+"""
+
+import io
+import os
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from flask import Flask
+
+from app import create_app, main
+from database import db
+from jobs.worker import work
+from models.article import Article
+from models.blob import collect_blobs, store_blob
+from models.extraction import ExtractionStat, article_pdf_text, extraction_stats
+from models.user import User
+from similarity.service import embed_articles, embedding_text
+from storage.blobs import BlobStore
+from storage.texts import ExtractedText, TextCache, extract_pdf, file_sha256
+from tests.conftest import TestConfig
+
+PAGES = ["Graph networks. They are great.", "Second page ü", ""]
+KEY = "ab" * 32
+
+
+@pytest.fixture
+def texts_app(app: Flask, tmp_path: Path) -> Flask:
+    """Keep blobs, cached texts and similarity files in a temporary directory."""
+    app.config["EMBEDDING_DIR"] = tmp_path / "embeddings"
+    app.extensions["blobs"] = BlobStore(tmp_path / "blobs")
+    app.extensions["texts"] = TextCache(tmp_path / "texts")
+    return app
+
+
+@pytest.fixture
+def extractions() -> list[Path]:
+    """Replace PDF parsing with a fake recording the extracted paths."""
+    paths = []
+
+    def fake_extract(path: Path) -> ExtractedText:
+        paths.append(Path(path))
+        return ExtractedText.from_pages(PAGES)
+
+    with patch("models.extraction.extract_pdf", fake_extract):
+        yield paths
+
+
+def add_pdf_article(app: Flask, user: User, content: bytes = b"%PDF-1.7 paper") -> int:
+    """Create an article with a stored PDF (and a processing job); return its id."""
+    article = Article(title="Paper", user_id=user.id)
+    article.pdf_hash = store_blob(app.extensions["blobs"], io.BytesIO(content))
+    db.session.add(article)
+    db.session.commit()
+    return article.id
+
+
+def stats() -> dict[str, tuple[int, int]]:
+    """Return the hits and misses recorded per stage."""
+    return {stat.stage: (stat.hits, stat.misses) for stat in extraction_stats()}
+
+
+class TestTextCache:
+    """Test cases for the on-disk text cache."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test that text and page boundaries survive storage."""
+        cache = TextCache(tmp_path)
+        cache.put(KEY, ExtractedText.from_pages(PAGES))
+
+        cached = cache.get(KEY)
+        assert cached.text == "\n".join(PAGES)
+        assert [cached.page(number) for number in range(cached.pages)] == PAGES
+        assert cache.path(KEY) == tmp_path / "ab" / f"{KEY}.ctx"
+        assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == [f"{KEY}.ctx"]
+
+    def test_compressed(self, tmp_path: Path) -> None:
+        """Test that entries are stored compressed."""
+        cache = TextCache(tmp_path)
+        text = "The same sentence again. " * 1000
+        cache.put(KEY, ExtractedText.from_pages([text]))
+
+        assert cache.path(KEY).stat().st_size < len(text) / 10
+
+    def test_missing_and_corrupt(self, tmp_path: Path) -> None:
+        """Test that missing and unreadable entries are misses."""
+        cache = TextCache(tmp_path)
+        assert cache.get(KEY) is None
+
+        cache.put(KEY, ExtractedText.from_pages(PAGES))
+        path = cache.path(KEY)
+        path.write_bytes(path.read_bytes()[:-4])
+        assert cache.get(KEY) is None
+
+        assert cache.delete(KEY)
+        assert not cache.delete(KEY)
+
+    def test_invalid_key(self, tmp_path: Path) -> None:
+        """Test that keys which are not SHA-256 digests are rejected."""
+        with pytest.raises(ValueError, match="Invalid text cache key"):
+            TextCache(tmp_path).path("../secret")
+
+    def test_extraction_requires_pypdf(self, tmp_path: Path) -> None:
+        """Test that a missing optional dependency is reported."""
+        with (
+            patch("storage.texts.PdfReader", None),
+            pytest.raises(RuntimeError, match="pypdf"),
+        ):
+            extract_pdf(tmp_path / "paper.pdf")
+
+
+class TestSharedExtraction:
+    """Test cases for the text shared by the processing stages."""
+
+    def test_stages_share_one_extraction(
+        self, texts_app: Flask, test_user: User, extractions: list[Path],
+    ) -> None:
+        """Test that summarizing, embedding and re-embedding parse the PDF once."""
+        with texts_app.app_context():
+            article_id = add_pdf_article(texts_app, test_user)
+            assert work("test-worker", burst=True) == 1
+
+            article = db.session.get(Article, article_id)
+            assert article.summary == "Graph networks. They are great. Second page ü"
+            assert stats() == {"summarize": (0, 1), "embed": (1, 0)}
+
+            embed_articles([article])
+            assert len(extractions) == 1
+            assert extractions[0] == texts_app.extensions["blobs"].path(article.pdf_hash)
+            assert stats() == {"summarize": (0, 1), "embed": (2, 0)}
+            stat = db.session.get(ExtractionStat, "embed")
+            assert stat.hit_ratio == 1.0
+
+    def test_legacy_path_keyed_by_content(
+        self, texts_app: Flask, test_user: User, extractions: list[Path], tmp_path: Path,
+    ) -> None:
+        """Test that copies of a pdf_path file share the cached text of their content."""
+        first, second = tmp_path / "a.pdf", tmp_path / "b.pdf"
+        first.write_bytes(b"%PDF-1.4 legacy")
+        second.write_bytes(b"%PDF-1.4 legacy")
+        with texts_app.app_context():
+            articles = [
+                Article(title="Legacy", user_id=test_user.id, pdf_path=str(path))
+                for path in (first, second)
+            ]
+
+            texts = [article_pdf_text(article, "summarize") for article in articles]
+
+            assert texts[0].text == texts[1].text == "\n".join(PAGES)
+            assert extractions == [first]
+            assert texts_app.extensions["texts"].get(file_sha256(second)) is not None
+
+    def test_embedding_text_is_capped(
+        self, texts_app: Flask, test_user: User, extractions: list[Path],
+    ) -> None:
+        """Test that only EMBEDDING_PDF_CHARS characters of the PDF are embedded."""
+        texts_app.config["EMBEDDING_PDF_CHARS"] = 5
+        with texts_app.app_context():
+            article = db.session.get(Article, add_pdf_article(texts_app, test_user))
+            assert embedding_text(article) == "Paper\nGraph"
+
+            texts_app.config["EMBEDDING_PDF_CHARS"] = 0
+            assert embedding_text(article) == "Paper"
+
+    def test_article_without_pdf(self, texts_app: Flask, test_user: User) -> None:
+        """Test that articles without a PDF are not counted."""
+        with texts_app.app_context():
+            article = Article(title="No PDF", user_id=test_user.id)
+
+            assert article_pdf_text(article, "embed") is None
+            assert stats() == {}
+
+    def test_collect_blobs_drops_cached_text(
+        self, texts_app: Flask, test_user: User, extractions: list[Path],
+    ) -> None:
+        """Test that the text of a collected blob is removed from the cache."""
+        with texts_app.app_context():
+            article = db.session.get(Article, add_pdf_article(texts_app, test_user))
+            key = article.pdf_hash
+            article_pdf_text(article, "summarize")
+            db.session.delete(article)
+            db.session.commit()
+            past = time.time() - 7200
+            os.utime(texts_app.extensions["blobs"].path(key), (past, past))
+
+            removed = collect_blobs(
+                texts_app.extensions["blobs"], grace_seconds=0, texts=texts_app.extensions["texts"],
+            )
+
+            assert removed == 1
+            assert texts_app.extensions["texts"].get(key) is None
+
+    def test_stats_leave_the_database_writable(
+        self, extractions: list[Path], tmp_path: Path,
+    ) -> None:
+        """Test that counting a lookup does not hold the write lock until the stage commits."""
+        path = tmp_path / "site.db"
+
+        class FileConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(FileConfig)
+        app.extensions["blobs"] = BlobStore(tmp_path / "blobs")
+        app.extensions["texts"] = TextCache(tmp_path / "texts")
+        with app.app_context():
+            user = User(username="writer", email="writer@example.com")
+            user.set_password("password")
+            db.session.add(user)
+            db.session.commit()
+            article_id = add_pdf_article(app, user)
+            article = db.session.get(Article, article_id)
+
+            assert article_pdf_text(article, "summarize") is not None
+
+            other = sqlite3.connect(path, timeout=0)
+            try:
+                with other:
+                    other.execute("UPDATE articles SET title = 'Renamed'")
+            finally:
+                other.close()
+            assert stats() == {"summarize": (0, 1)}
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+    def test_stats_command(
+        self, texts_app: Flask, test_user: User, extractions: list[Path],
+    ) -> None:
+        """Test that the command reports the hit ratio of each stage."""
+        with texts_app.app_context():
+            article = db.session.get(Article, add_pdf_article(texts_app, test_user))
+            article_pdf_text(article, "embed")
+            article_pdf_text(article, "embed")
+            db.session.commit()
+
+        with patch("app.create_app", return_value=texts_app):
+            result = CliRunner().invoke(main, ["text-cache-stats"])
+
+        assert result.exit_code == 0, result.output
+        assert "embed: 1 hits, 1 misses (50.0% hit ratio)" in result.output
@@ -0,0 +1,225 @@
+"""Tests for streaming PDF uploads.
+
+Tests the incremental multipart reader and PDF submission through
+POST /api/articles, including its CSRF check.
+"""
+
+import io
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from flask import Flask, session
+from flask.testing import FlaskClient
+from flask_wtf.csrf import generate_csrf
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+
+from database import db
+from models.article import Article
+from models.blob import Blob
+from storage.blobs import BlobStore
+from storage.uploads import receive_pdf_upload
+
+PDF = b"%PDF-1.7\n" + b"x" * 5000 + b"\n%%EOF\n"
+BOUNDARY = b"test-boundary"
+
+
+def multipart(*parts: tuple[str, bytes, str | None]) -> bytes:
+    """Encode (name, content, filename) parts as a multipart/form-data body."""
+    body = b""
+    for name, content, filename in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += b"--" + BOUNDARY + f"\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+        body += content + b"\r\n"
+    return body + b"--" + BOUNDARY + b"--\r\n"
+
+
+class GeneratedBody(io.RawIOBase):
+    """Request body produced on demand: a title field and a large PDF of zeros."""
+
+    def __init__(self, pdf_size: int) -> None:
+        """Prepare the body pieces without materializing the file."""
+        head, tail = multipart(("title", b"Big", None), ("pdf", b"\0", "big.pdf")).split(b"\0")
+        self.pieces = self._pieces(head + b"%PDF-", pdf_size - 5, tail)
+        self.buffer = b""
+
+    @staticmethod
+    def _pieces(head: bytes, zeros: int, tail: bytes) -> Iterator[bytes]:
+        yield head
+        block = bytes(1 << 16)
+        while zeros > 0:
+            yield block[:zeros]
+            zeros -= len(block)
+        yield tail
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to ``size`` bytes of the body."""
+        while len(self.buffer) < size and (piece := next(self.pieces, None)) is not None:
+            self.buffer += piece
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+@pytest.fixture
+def store(app: Flask, tmp_path: Path) -> BlobStore:
+    """Point the app's blob store at a temporary directory."""
+    app.extensions["blobs"] = BlobStore(tmp_path / "blobs")
+    return app.extensions["blobs"]
+
+
+def stored_files(store: BlobStore) -> list[Path]:
+    """List every file below the store root, including temporary ones."""
+    return [path for path in store.root.rglob("*") if path.is_file()]
+
+
+class TestReceivePdfUpload:
+    """Test cases for the incremental multipart reader."""
+
+    def test_fields_and_file(self, store: BlobStore) -> None:
+        """Test that text fields are returned and the file is stored."""
+        body = multipart(("title", "Ünïcode".encode(), None), ("pdf", PDF, "paper.pdf"))
+
+        fields, stored = receive_pdf_upload(io.BytesIO(body), BOUNDARY, store, chunk_size=100)
+
+        assert fields == {"title": "Ünïcode"}
+        key, size = stored
+        assert (size, store.path(key).read_bytes()) == (len(PDF), PDF)
+        assert stored_files(store) == [store.path(key)]
+
+    def test_rejects_non_pdf_after_first_chunk(self, store: BlobStore) -> None:
+        """Test that a file without the PDF signature is refused before the rest is read."""
+        body = io.BytesIO(multipart(("pdf", b"GIF89a" + bytes(1 << 20), "x.pdf")))
+
+        with pytest.raises(UnsupportedMediaType):
+            receive_pdf_upload(body, BOUNDARY, store, chunk_size=4096)
+        assert body.tell() == 4096
+        assert stored_files(store) == []
+
+    def test_empty_file_input(self, store: BlobStore) -> None:
+        """Test that an empty file part (no file chosen) is ignored."""
+        body = multipart(("title", b"T", None), ("pdf", b"", ""))
+
+        assert receive_pdf_upload(io.BytesIO(body), BOUNDARY, store) == ({"title": "T"}, None)
+
+    def test_rejected_fields_store_nothing(self, store: BlobStore) -> None:
+        """Test that fields refused after the file was read leave no file behind."""
+        body = multipart(("pdf", PDF, "p.pdf"), ("title", b"", None))
+
+        def check_fields(fields: dict[str, str]) -> None:
+            assert fields == {"title": ""}
+            raise BadRequest
+
+        with pytest.raises(BadRequest):
+            receive_pdf_upload(io.BytesIO(body), BOUNDARY, store, check_fields=check_fields)
+        assert stored_files(store) == []
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            multipart(("pdf", PDF, "a.pdf"), ("pdf", PDF, "b.pdf")),
+            multipart(("attachment", PDF, "a.pdf")),
+            multipart(("pdf", PDF, "a.pdf"))[:-100],
+        ],
+        ids=["two files", "wrong field", "truncated"],
+    )
+    def test_bad_requests(self, store: BlobStore, body: bytes) -> None:
+        """Test that unexpected file parts and truncated bodies are rejected."""
+        with pytest.raises(BadRequest):
+            receive_pdf_upload(io.BytesIO(body), BOUNDARY, store)
+        assert not list((store.root / "tmp").iterdir())
+
+    def test_memory_is_bounded(self, store: BlobStore) -> None:
+        """Test that storing a 32 MiB upload only holds a few chunks in memory."""
+        chunk_size = 64 * 1024
+        tracemalloc.start()
+        try:
+            _fields, (key, size) = receive_pdf_upload(
+                GeneratedBody(32 << 20), BOUNDARY, store, chunk_size=chunk_size,
+            )
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert size == 32 << 20
+        assert store.path(key).stat().st_size == size
+        assert peak < 16 * chunk_size
+
+
+class TestPdfSubmission:
+    """Test cases for multipart POST /api/articles."""
+
+    def post(self, client: FlaskClient, body: bytes, **headers: str):
+        """Submit a multipart body."""
+        return client.post(
+            "/api/articles",
+            data=body,
+            content_type=f"multipart/form-data; boundary={BOUNDARY.decode()}",
+            headers=headers,
+        )
+
+    def test_submit_with_pdf(self, app: Flask, store: BlobStore, authenticated_client) -> None:
+        """Test that two submissions of the same PDF share one stored file."""
+        body = multipart(("title", b"Paper", None), ("tags", b"nlp", None), ("pdf", PDF, "p.pdf"))
+        first = self.post(authenticated_client, body)
+        second = self.post(authenticated_client, body)
+
+        assert first.status_code == second.status_code == 202
+        key = first.get_json()["pdf"]
+        assert second.get_json()["pdf"] == key
+        with app.app_context():
+            article = db.session.get(Article, first.get_json()["id"])
+            assert (article.title, article.tags, article.pdf_hash) == ("Paper", "nlp", key)
+            assert db.session.get(Blob, key).refcount == 2
+        assert stored_files(store) == [store.path(key)]
+        download = authenticated_client.get(f"/api/articles/{article.id}/pdf")
+        assert download.data == PDF
+
+    def test_non_pdf_is_rejected(self, app: Flask, store: BlobStore, authenticated_client) -> None:
+        """Test that a non-PDF upload creates neither an article nor a blob."""
+        body = multipart(("title", b"Image", None), ("pdf", b"\x89PNG\r\n\x1a\n", "x.pdf"))
+
+        assert self.post(authenticated_client, body).status_code == 415
+        with app.app_context():
+            assert db.session.query(Article).count() == 0
+        assert stored_files(store) == []
+
+    def test_too_large(self, app: Flask, store: BlobStore, authenticated_client) -> None:
+        """Test that bodies over MAX_CONTENT_LENGTH are refused."""
+        app.config["MAX_CONTENT_LENGTH"] = 1000
+
+        response = self.post(authenticated_client, multipart(("pdf", PDF, "p.pdf")))
+        assert response.status_code == 413
+        assert not store.root.exists()
+
+    def test_missing_title(self, store: BlobStore, authenticated_client) -> None:
+        """Test that the title is still required, and checked before the PDF is stored."""
+        assert self.post(authenticated_client, multipart(("pdf", PDF, "p.pdf"))).status_code == 400
+        assert stored_files(store) == []
+
+    def test_csrf_token_required(self, app: Flask, store: BlobStore, authenticated_client) -> None:
+        """Test that multipart submissions need the session's CSRF token."""
+        app.config["WTF_CSRF_ENABLED"] = True
+        with app.test_request_context():
+            token = generate_csrf()
+            raw_token = session["csrf_token"]
+        with authenticated_client.session_transaction() as client_session:
+            client_session["csrf_token"] = raw_token
+        body = multipart(("title", b"Paper", None), ("pdf", PDF, "p.pdf"))
+
+        assert self.post(authenticated_client, body).status_code == 400
+        assert self.post(authenticated_client, body, **{"X-CSRFToken": "forged"}).status_code == 400
+        assert stored_files(store) == []
+        with app.app_context():
+            assert db.session.query(Article).count() == 0
+
+        assert self.post(authenticated_client, body, **{"X-CSRFToken": token}).status_code == 202
+        signed = multipart(("csrf_token", token.encode(), None), ("title", b"Paper", None))
+        assert self.post(authenticated_client, signed).status_code == 202
+
+    def test_requires_login(self, client: FlaskClient, store: BlobStore) -> None:
+        """Test that anonymous uploads are rejected before the body is read."""
+        assert self.post(client, multipart(("pdf", PDF, "p.pdf"))).status_code == 401
+        assert not store.root.exists()
@@ -0,0 +1,259 @@
+"""Tests for article voting.
+
+Tests the vote endpoint, the denormalized score and its reconciliation, and
+the trending score.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy.dialects import postgresql
+
+from database import db
+from models.article import Article
+from models.user import User
+from models.vote import Vote, _days_since, cast_vote, reconcile_scores, refresh_trending
+
+
+@pytest.fixture
+def article_id(app: Flask, test_user: User) -> int:
+    """Create an article to vote on and return its id."""
+    with app.app_context():
+        article = Article(title="Votable", user_id=test_user.id)
+        db.session.add(article)
+        db.session.commit()
+        return article.id
+
+
+@pytest.fixture
+def voters(app: Flask) -> list[int]:
+    """Create three more users and return their ids."""
+    with app.app_context():
+        users = [User(username=f"voter{i}", email=f"voter{i}@example.com") for i in range(3)]
+        for user in users:
+            user.set_password("password")
+        db.session.add_all(users)
+        db.session.commit()
+        return [user.id for user in users]
+
+
+def score_of(article_id: int) -> int:
+    """Read an article's stored score."""
+    return db.session.execute(db.select(Article.score).where(Article.id == article_id)).scalar()
+
+
+def backdate_article(article_id: int) -> datetime:
+    """Set an article's ``updated_at`` a day back and return it."""
+    updated_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
+    db.session.execute(
+        db.update(Article).where(Article.id == article_id).values(updated_at=updated_at),
+    )
+    db.session.commit()
+    return updated_at
+
+
+def updated_at_of(article_id: int) -> datetime:
+    """Read an article's stored ``updated_at``."""
+    return db.session.execute(
+        db.select(Article.updated_at).where(Article.id == article_id),
+    ).scalar()
+
+
+class TestCastVote:
+    """Test cases for updating votes and the denormalized score."""
+
+    def test_votes_add_up(self, app: Flask, article_id: int, voters: list[int]) -> None:
+        """Test that the score is the sum of the users' votes."""
+        with app.app_context():
+            assert cast_vote(voters[0], article_id, 1) == 1
+            assert cast_vote(voters[1], article_id, 1) == 2
+            assert cast_vote(voters[2], article_id, -1) == 1
+            assert db.session.query(Vote).count() == 3
+
+    def test_repeated_vote_is_idempotent(self, app: Flask, article_id: int, voters) -> None:
+        """Test that casting the same vote again changes nothing."""
+        with app.app_context():
+            cast_vote(voters[0], article_id, 1)
+            assert cast_vote(voters[0], article_id, 1) == 1
+            assert db.session.query(Vote).count() == 1
+
+    def test_changed_and_withdrawn_vote(self, app: Flask, article_id: int, voters) -> None:
+        """Test that switching a vote applies the difference and 0 removes it."""
+        with app.app_context():
+            cast_vote(voters[0], article_id, 1)
+            assert cast_vote(voters[0], article_id, -1) == -1
+            assert cast_vote(voters[0], article_id, 0) == 0
+            assert cast_vote(voters[0], article_id, 0) == 0
+            assert db.session.query(Vote).count() == 0
+
+    def test_vote_keeps_updated_at(self, app: Flask, article_id: int, voters) -> None:
+        """Test that voting does not count as an edit of the article."""
+        with app.app_context():
+            updated_at = backdate_article(article_id)
+            cast_vote(voters[0], article_id, 1)
+            cast_vote(voters[0], article_id, 0)
+
+            assert updated_at_of(article_id) == updated_at
+
+    def test_missing_article(self, app: Flask, voters: list[int]) -> None:
+        """Test that voting on a missing article returns None."""
+        with app.app_context():
+            assert cast_vote(voters[0], 9999, 1) is None
+            assert db.session.query(Vote).count() == 0
+
+    def test_invalid_value(self, app: Flask, article_id: int, voters: list[int]) -> None:
+        """Test that values other than -1, 0, 1 are rejected."""
+        with app.app_context(), pytest.raises(ValueError, match="Vote value"):
+            cast_vote(voters[0], article_id, 2)
+
+
+class TestReconcile:
+    """Test cases for repairing score drift."""
+
+    def test_reconcile_repairs_drift(self, app: Flask, article_id: int, voters) -> None:
+        """Test that drifted scores are recomputed from the votes."""
+        with app.app_context():
+            cast_vote(voters[0], article_id, 1)
+            cast_vote(voters[1], article_id, 1)
+            db.session.execute(
+                db.update(Article).where(Article.id == article_id).values(score=7),
+            )
+            db.session.commit()
+
+            assert reconcile_scores(batch_size=1) == 1
+            assert score_of(article_id) == 2
+            assert reconcile_scores() == 0
+
+    def test_reconcile_resets_articles_without_votes(self, app, article_id) -> None:
+        """Test that an article with no votes gets a score of 0."""
+        with app.app_context():
+            db.session.execute(
+                db.update(Article).where(Article.id == article_id).values(score=-3),
+            )
+            db.session.commit()
+            assert reconcile_scores() == 1
+            assert score_of(article_id) == 0
+
+    def test_reconcile_keeps_updated_at(self, app: Flask, article_id: int) -> None:
+        """Test that repairing a score does not count as an edit of the article."""
+        with app.app_context():
+            db.session.execute(
+                db.update(Article).where(Article.id == article_id).values(score=5),
+            )
+            updated_at = backdate_article(article_id)
+
+            assert reconcile_scores() == 1
+            assert updated_at_of(article_id) == updated_at
+
+
+def age_votes(user_id: int, hours: float) -> None:
+    """Backdate a user's votes by the given number of hours."""
+    voted_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+    db.session.execute(db.update(Vote).where(Vote.user_id == user_id).values(updated_at=voted_at))
+    db.session.commit()
+
+
+class TestTrending:
+    """Test cases for the time-decayed trending score."""
+
+    def test_votes_decay_with_age(self, app: Flask, article_id: int, voters) -> None:
+        """Test that a vote counts half after one half-life."""
+        with app.app_context():
+            cast_vote(voters[0], article_id, 1)
+            cast_vote(voters[1], article_id, 1)
+            age_votes(voters[1], 24)
+
+            assert refresh_trending(half_life_hours=24) == 1
+            trending = db.session.get(Article, article_id).trending
+            assert trending == pytest.approx(1.5, abs=1e-3)
+
+    def test_old_votes_drop_out(self, app: Flask, article_id: int, voters) -> None:
+        """Test that articles whose votes are past the horizon fall back to 0."""
+        with app.app_context():
+            cast_vote(voters[0], article_id, 1)
+            refresh_trending(half_life_hours=1)
+            age_votes(voters[0], 11)
+
+            assert refresh_trending(half_life_hours=1) == 0
+            assert db.session.get(Article, article_id).trending == 0
+
+    def test_refresh_keeps_updated_at(self, app: Flask, article_id: int, voters) -> None:
+        """Test that refreshing trending scores does not count as an edit of the article."""
+        with app.app_context():
+            cast_vote(voters[0], article_id, 1)
+            updated_at = backdate_article(article_id)
+            refresh_trending(half_life_hours=1)
+            assert updated_at_of(article_id) == updated_at
+
+            age_votes(voters[0], 11)
+            refresh_trending(half_life_hours=1)
+            assert db.session.get(Article, article_id).trending == 0
+            assert updated_at_of(article_id) == updated_at
+
+    def test_vote_age_on_postgresql(self) -> None:
+        """Test that vote ages avoid SQLite-only date functions on PostgreSQL."""
+        now = datetime(2024, 1, 2)  # noqa: DTZ001 - naive UTC, like the columns
+        age = _days_since(now, Vote.updated_at, "postgresql")
+
+        sql = str(age.compile(dialect=postgresql.dialect()))
+
+        assert "julianday" not in sql
+        assert "EXTRACT(epoch FROM" in sql
+
+    def test_endpoint_orders_by_trending(self, app, authenticated_client, voters) -> None:
+        """Test that /api/articles/trending lists recent votes first."""
+        with app.app_context():
+            articles = [Article(title=f"A{i}", user_id=voters[0]) for i in range(3)]
+            db.session.add_all(articles)
+            db.session.commit()
+            ids = [article.id for article in articles]
+            cast_vote(voters[0], ids[0], 1)
+            cast_vote(voters[1], ids[1], 1)
+            cast_vote(voters[2], ids[1], 1)
+            age_votes(voters[1], 48)
+            age_votes(voters[2], 48)
+            refresh_trending(half_life_hours=24)
+
+        response = authenticated_client.get("/api/articles/trending?limit=2")
+        assert [item["id"] for item in response.get_json()] == [ids[0], ids[1]]
+        assert authenticated_client.get("/api/articles/trending?limit=0").status_code == 400
+
+
+class TestVoteEndpoint:
+    """Test cases for PUT /api/articles/<id>/vote."""
+
+    def test_vote(self, authenticated_client: FlaskClient, article_id: int) -> None:
+        """Test that voting returns the new score and repeats are no-ops."""
+        url = f"/api/articles/{article_id}/vote"
+        for _ in range(2):
+            response = authenticated_client.put(url, json={"value": 1})
+            assert response.status_code == 200
+            assert response.get_json() == {"id": article_id, "score": 1, "vote": 1}
+        response = authenticated_client.put(url, json={"value": 0})
+        assert response.get_json()["score"] == 0
+
+    def test_requires_login(self, client: FlaskClient, article_id: int) -> None:
+        """Test that anonymous votes are rejected."""
+        response = client.put(f"/api/articles/{article_id}/vote", json={"value": 1})
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize("body", [{}, {"value": 2}, {"value": "1"}, {"value": True}])
+    def test_invalid_value(self, authenticated_client, article_id: int, body: dict) -> None:
+        """Test that malformed votes are rejected."""
+        response = authenticated_client.put(f"/api/articles/{article_id}/vote", json=body)
+        assert response.status_code == 400
+
+    def test_missing_article(self, authenticated_client: FlaskClient) -> None:
+        """Test that voting on a missing article returns 404."""
+        response = authenticated_client.put("/api/articles/9999/vote", json={"value": 1})
+        assert response.status_code == 404
+
+    def test_score_in_graph(self, authenticated_client: FlaskClient, article_id: int) -> None:
+        """Test that graph nodes carry the article score."""
+        authenticated_client.put(f"/api/articles/{article_id}/vote", json={"value": -1})
+        lines = authenticated_client.get("/api/graph").get_data(as_text=True).splitlines()
+        (node,) = [json.loads(line) for line in lines if json.loads(line)["type"] == "node"]
+        assert node["score"] == -1